@@ -0,0 +1,54 @@
+"""Flags regressions between two bench_suite.py result files.
+
+Usage: python benchmarks/bench_compare.py BASELINE.json CURRENT.json [--threshold 0.10] [--min-seconds 0.001]
+Exits 1 when any stage's best time grew by more than the threshold.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def compare(baseline: dict, current: dict, *, threshold: float, min_seconds: float) -> list[dict]:
+    rows = []
+    for stage, base in baseline["results"].items():
+        cur = current["results"].get(stage)
+        if cur is None:
+            continue
+        ratio = cur["best"] / base["best"] if base["best"] else float("inf")
+        # stages this fast are dominated by timer noise
+        regressed = ratio > 1 + threshold and cur["best"] - base["best"] > min_seconds
+        rows.append(
+            {
+                "stage": stage,
+                "baseline": base["best"],
+                "current": cur["best"],
+                "change": round(ratio - 1, 4),
+                "regressed": regressed,
+            }
+        )
+    return rows
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("baseline", type=Path)
+    ap.add_argument("current", type=Path)
+    ap.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown, 0.10 = 10%%")
+    ap.add_argument("--min-seconds", type=float, default=0.001, help="Ignore absolute changes below this")
+    args = ap.parse_args()
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    current = json.loads(args.current.read_text(encoding="utf-8"))
+    if baseline["meta"]["shape"] != current["meta"]["shape"]:
+        print("warning: results were measured on different repository shapes", file=sys.stderr)
+    rows = compare(baseline, current, threshold=args.threshold, min_seconds=args.min_seconds)
+    for row in rows:
+        print(json.dumps(row))
+    if any(r["regressed"] for r in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
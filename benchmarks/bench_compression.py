@@ -0,0 +1,68 @@
+"""Adaptive vs legacy zip compression on an asset-heavy tree.
+
+Usage: python benchmarks/bench_compression.py [--files N]
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from arm.services.packager import CompressionPolicy, PackageSpec, build_zip
+
+
+def make_asset_tree(root: Path, *, files: int, seed: int = 0) -> int:
+    rng = random.Random(seed)
+    total = 0
+    for i in range(files):
+        d = root / f"dir{i % 16}"
+        d.mkdir(parents=True, exist_ok=True)
+        kind = i % 4
+        if kind == 0:  # source text
+            name, data = f"m{i}.py", (f"def f{i}(x):\n    return x * {i}\n" * rng.randint(10, 400)).encode()
+        elif kind == 1:  # image-like, already compressed
+            name, data = f"img{i}.png", rng.randbytes(rng.randint(20_000, 200_000))
+        elif kind == 2:  # archive
+            name, data = f"pkg{i}.gz", gzip.compress(rng.randbytes(50_000), mtime=0)
+        else:  # unknown extension, incompressible
+            name, data = f"blob{i}.dat", rng.randbytes(rng.randint(10_000, 100_000))
+        (d / name).write_bytes(data)
+        total += len(data)
+    return total
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--files", type=int, default=800)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / "src"
+        total = make_asset_tree(src, files=args.files)
+        for label, policy in (("legacy", CompressionPolicy.legacy()), ("adaptive", CompressionPolicy())):
+            best = float("inf")
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                out = build_zip(
+                    PackageSpec(project_name=label, version="0", repo_dir=src, dist_dir=Path(tmp) / "dist", compression=policy)
+                )
+                best = min(best, time.perf_counter() - t0)
+            print(
+                json.dumps(
+                    {
+                        "policy": label,
+                        "seconds": round(best, 4),
+                        "mb_per_s": round(total / best / 1e6, 1),
+                        "ratio": round(out.stat().st_size / total, 4),
+                    }
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
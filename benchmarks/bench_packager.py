@@ -0,0 +1,69 @@
+"""Packager throughput by compression worker count.
+
+Usage: python benchmarks/bench_packager.py [--files N] [--size BYTES] [--workers 1,2,4,8]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from arm.services.packager import PackageSpec, build_zip
+
+
+def make_tree(root: Path, *, files: int, size: int, seed: int = 0) -> int:
+    rng = random.Random(seed)
+    words = [bytes(rng.choices(b"abcdefghijklmnopqrstuvwxyz", k=rng.randint(2, 10))) for _ in range(2000)]
+    total = 0
+    for i in range(files):
+        d = root / f"pkg{i % 64:02d}" / f"mod{i % 7}"
+        d.mkdir(parents=True, exist_ok=True)
+        chunks: list[bytes] = []
+        n = 0
+        while n < size:
+            w = rng.choice(words)
+            chunks.append(w)
+            n += len(w) + 1
+        data = b" ".join(chunks)[:size]
+        (d / f"f{i}.txt").write_bytes(data)
+        total += len(data)
+    return total
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--files", type=int, default=2000)
+    ap.add_argument("--size", type=int, default=64 * 1024)
+    ap.add_argument("--workers", default=",".join(str(n) for n in (1, 2, 4, 8) if n <= (os.cpu_count() or 1)))
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / "src"
+        total = make_tree(src, files=args.files, size=args.size)
+        baseline = None
+        for workers in (int(w) for w in args.workers.split(",")):
+            best = float("inf")
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                build_zip(PackageSpec(project_name="bench", version="0", repo_dir=src, dist_dir=Path(tmp) / "dist", workers=workers))
+                best = min(best, time.perf_counter() - t0)
+            baseline = baseline or best
+            print(
+                json.dumps(
+                    {
+                        "workers": workers,
+                        "seconds": round(best, 4),
+                        "mb_per_s": round(total / best / 1e6, 1),
+                        "speedup": round(baseline / best, 2),
+                    }
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Times every release hot path on a synthetic repository and stores the results as JSON.
+
+Usage: python benchmarks/bench_suite.py [--out results.json] [--repeat N] [--commits N] [--tags N]
+       [--body-lines N] [--files N] [--file-size BYTES] [--changelog-sections N] [--seed N]
+Compare two result files with benchmarks/bench_compare.py.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import asdict
+from pathlib import Path
+
+from synthetic_repo import RepoShape, generate
+
+from arm.adapters import git as git_adapter
+from arm.config import ReleasePolicy
+from arm.domain.models import SemVer
+from arm.services.changelog import prepend_changelog, render_release_section
+from arm.services.conventional_commits import validate_commits
+from arm.services.packager import PackageSpec, build_zip
+from arm.services.semver import compute_next_version
+
+
+def _time(fn: Callable[[], object], repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return {"best": round(min(samples), 6), "median": round(statistics.median(samples), 6), "runs": repeat}
+
+
+def _cli(repo: Path, *args: str) -> None:
+    src = Path(__file__).resolve().parents[1] / "src"
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(src), os.environ.get("PYTHONPATH")]))}
+    subprocess.run([sys.executable, "-m", "arm.cli", "--repo", str(repo), *args], env=env, check=True, capture_output=True)
+
+
+def run_suite(repo: Path, *, dist: Path, repeat: int) -> dict[str, dict]:
+    last = git_adapter.last_tag(repo_dir=repo, tag_prefix="v")
+    current = SemVer.parse(last.lstrip("v")) if last else SemVer.parse("0.1.0")
+    policy = ReleasePolicy()
+    commits = git_adapter.commit_log(repo_dir=repo, from_ref=None, to_ref="HEAD")
+    parsed, _ = validate_commits(commits)
+    next_v, _ = compute_next_version(current, parsed, policy=policy, forced=None)
+    section = render_release_section(next_v, parsed)
+    existing = (repo / "CHANGELOG.md").read_text(encoding="utf-8")
+    spec = PackageSpec(project_name="bench", version="0", repo_dir=repo, dist_dir=dist)
+
+    # full history, so each stage sees every synthetic commit
+    return {
+        "commit_log": _time(lambda: git_adapter.commit_log(repo_dir=repo, from_ref=None, to_ref="HEAD"), repeat),
+        "validate_commits": _time(lambda: validate_commits(commits), repeat),
+        "compute_next_version": _time(lambda: compute_next_version(current, parsed, policy=policy, forced=None), repeat),
+        "render_release_section": _time(lambda: render_release_section(next_v, parsed), repeat),
+        "prepend_changelog": _time(lambda: prepend_changelog(existing, section), repeat),
+        "build_zip": _time(lambda: build_zip(spec), repeat),
+        "cli_plan": _time(lambda: _cli(repo, "plan", "--json"), repeat),
+        "cli_release_dry_run": _time(lambda: _cli(repo, "release", "--dry-run"), repeat),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--out", type=Path, default=None, help="Write results here as well as to stdout")
+    ap.add_argument("--repeat", type=int, default=5)
+    defaults = RepoShape()
+    for name, value in asdict(defaults).items():
+        ap.add_argument(f"--{name.replace('_', '-')}", type=int, default=value)
+    args = ap.parse_args()
+    shape = RepoShape(**{k: getattr(args, k) for k in asdict(defaults)})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = generate(Path(tmp) / "repo", shape)
+        results = run_suite(repo, dist=Path(tmp) / "dist", repeat=args.repeat)
+    git_version = subprocess.run(["git", "--version"], capture_output=True, text=True).stdout.strip()
+    report = {
+        "meta": {
+            "shape": asdict(shape),
+            "python": platform.python_version(),
+            "git": git_version,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        args.out.write_text(text + "\n", encoding="utf-8")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
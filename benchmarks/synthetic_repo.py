@@ -0,0 +1,105 @@
+"""Deterministic synthetic git repository for benchmarks.
+
+Usage: python benchmarks/synthetic_repo.py DEST [--commits N] [--tags N] [--body-lines N]
+       [--files N] [--file-size BYTES] [--changelog-sections N] [--seed N]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import subprocess
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+_TYPES = ("feat", "fix", "perf", "refactor", "docs", "chore", "test", "build", "ci")
+_SCOPES = ("core", "cli", "git", "packager", "changelog", "")
+_WORDS = "alpha beta gamma delta epsilon zeta eta theta iota kappa lambda mu nu xi omicron pi rho sigma".split()
+_EPOCH = 1_600_000_000
+
+
+@dataclass(frozen=True, slots=True)
+class RepoShape:
+    commits: int = 2000
+    tags: int = 20
+    body_lines: int = 3
+    files: int = 500
+    file_size: int = 4096
+    changelog_sections: int = 50
+    seed: int = 0
+
+
+def _text(rng: random.Random, n_words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(n_words))
+
+
+def _data(payload: bytes) -> bytes:
+    return b"data %d\n" % len(payload) + payload + b"\n"
+
+
+def _changelog(shape: RepoShape, rng: random.Random) -> str:
+    out = ["# Changelog\n\n"]
+    for i in range(shape.changelog_sections, 0, -1):
+        out.append(f"## 0.{i}.0 - 2020-01-01\n\n### Features\n\n")
+        out.extend(f"- {_text(rng, 8)} (0000000)\n" for _ in range(10))
+        out.append("\n")
+    return "".join(out)
+
+
+def generate(dest: Path, shape: RepoShape) -> Path:
+    # One `git fast-import` stream: identical shape and seed give identical commit SHAs.
+    rng = random.Random(shape.seed)
+    dest.mkdir(parents=True, exist_ok=True)
+    subprocess.run(["git", "init", "-q", "-b", "main", str(dest)], check=True)
+    stream: list[bytes] = []
+    ident = "Bench <bench@example.com>"
+
+    files = [f"src/pkg{i % 32:02d}/mod{i}.py" for i in range(shape.files)]
+    commit_lines = [b"commit refs/heads/main\n", b"mark :1\n", f"committer {ident} {_EPOCH} +0000\n".encode()]
+    commit_lines.append(_data(b"chore: initial import"))
+    for path in files:
+        content = (_text(rng, shape.file_size // 6) + "\n").encode()[: shape.file_size]
+        commit_lines.append(f"M 100644 inline {path}\n".encode() + _data(content))
+    commit_lines.append(b"M 100644 inline CHANGELOG.md\n" + _data(_changelog(shape, rng).encode()))
+    commit_lines.append(b"M 100644 inline .gitignore\n" + _data(b"dist/\n.arm/\n"))
+    stream += commit_lines
+
+    # tags spread evenly, never on the last commit so there is something to release
+    step = max(1, shape.commits // (shape.tags + 1))
+    tag_at = {step * (k + 1): k for k in range(shape.tags) if step * (k + 1) < shape.commits}
+    for n in range(1, shape.commits + 1):
+        kind = _TYPES[rng.randrange(len(_TYPES))]
+        scope = rng.choice(_SCOPES)
+        subject = f"{kind}({scope}): {_text(rng, 6)}" if scope else f"{kind}: {_text(rng, 6)}"
+        body = "\n".join(_text(rng, 10) for _ in range(shape.body_lines))
+        message = subject + ("\n\n" + body if body else "")
+        path = files[rng.randrange(len(files))] if files else "README"
+        stream += [
+            b"commit refs/heads/main\n",
+            f"mark :{n + 1}\n".encode(),
+            f"committer {ident} {_EPOCH + n * 60} +0000\n".encode(),
+            _data(message.encode()),
+            f"from :{n}\n".encode(),
+            f"M 100644 inline {path}\n".encode() + _data((_text(rng, 40) + "\n").encode()),
+        ]
+        if n in tag_at:
+            stream.append(f"reset refs/tags/v0.{tag_at[n] + 1}.0\nfrom :{n + 1}\n\n".encode())
+    subprocess.run(["git", "fast-import", "--quiet"], cwd=dest, input=b"".join(stream), check=True)
+    subprocess.run(["git", "reset", "-q", "--hard", "main"], cwd=dest, check=True)
+    return dest
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("dest", type=Path)
+    defaults = RepoShape()
+    for name, value in asdict(defaults).items():
+        ap.add_argument(f"--{name.replace('_', '-')}", type=int, default=value)
+    args = ap.parse_args()
+    shape = RepoShape(**{k: getattr(args, k) for k in asdict(defaults)})
+    generate(args.dest, shape)
+    print(json.dumps({"repo": str(args.dest), **asdict(shape)}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import ctypes
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+# Waits for ref changes in a git repo: HEAD, packed-refs and everything under refs/.
+# On Linux the directories are watched with inotify (through ctypes, no dependency), so an
+# idle watcher sleeps in poll(2); elsewhere, or when inotify is unavailable, a stat
+# fingerprint of the same files is compared every poll interval.
+
+_IN_MODIFY = 0x002
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_DELETE_SELF = 0x400
+_IN_Q_OVERFLOW = 0x4000
+_IN_ISDIR = 0x40000000
+_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, name length
+
+
+def git_dirs(repo_dir: Path) -> tuple[Path, Path] | None:
+    # (per-worktree git dir holding HEAD, common dir holding refs/ and packed-refs)
+    dot_git = repo_dir / ".git"
+    if dot_git.is_file():
+        # worktrees and submodules: "gitdir: <path>"
+        target = dot_git.read_text(encoding="utf-8").partition("gitdir:")[2].strip()
+        if not target:
+            return None
+        git_dir = (repo_dir / target).resolve()
+    elif dot_git.is_dir():
+        git_dir = dot_git
+    else:
+        return None
+    common = git_dir
+    if (git_dir / "commondir").is_file():
+        common = (git_dir / (git_dir / "commondir").read_text(encoding="utf-8").strip()).resolve()
+    return git_dir, common
+
+
+def refs_fingerprint(repo_dir: Path) -> tuple | None:
+    # git writes refs by renaming a lock file into place, which bumps the directory mtime
+    dirs = git_dirs(repo_dir)
+    if dirs is None:
+        return None
+    git_dir, common = dirs
+    stamps = []
+    for path in (git_dir / "HEAD", common / "packed-refs"):
+        try:
+            st = path.stat()
+            stamps.append((str(path), st.st_mtime_ns, st.st_ino, st.st_size))
+        except FileNotFoundError:
+            stamps.append((str(path), None))
+    for root, _, files in os.walk(common / "refs"):
+        stamps.append((root, os.stat(root).st_mtime_ns, len(files)))
+    return tuple(stamps)
+
+
+def _load_inotify():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class RefWatcher:
+    def __init__(self, repo_dir: Path, *, poll_interval: float = 0.05, force_poll: bool = False) -> None:
+        dirs = git_dirs(repo_dir)
+        if dirs is None:
+            raise FileNotFoundError(f"{repo_dir} is not a git repository")
+        self.repo_dir = repo_dir
+        self.git_dir, self.common_dir = dirs
+        self.poll_interval = poll_interval
+        self._fd = -1
+        self._wds: dict[int, Path] = {}
+        libc = None if force_poll else _load_inotify()
+        if libc is not None:
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd >= 0:
+                self._libc, self._fd = libc, fd
+                try:
+                    self._add(self.git_dir)
+                    if self.common_dir != self.git_dir:
+                        self._add(self.common_dir)
+                    for root, _, _ in os.walk(self.common_dir / "refs"):
+                        self._add(Path(root))
+                except OSError:
+                    self.close()
+        self.backend = "inotify" if self._fd >= 0 else "poll"
+        self._fingerprint = refs_fingerprint(repo_dir) if self._fd < 0 else None
+
+    def _add(self, path: Path) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), _MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), str(path))
+        self._wds[wd] = path
+
+    def _relevant(self, wd: int, mask: int, name: str) -> bool:
+        if mask & _IN_Q_OVERFLOW:
+            return True
+        directory = self._wds.get(wd)
+        if directory is None or name.endswith(".lock"):
+            return False
+        if mask & _IN_ISDIR and mask & (_IN_CREATE | _IN_MOVED_TO):
+            # new refs/ namespace, e.g. the first refs/tags/release/* tag
+            try:
+                self._add(directory / name)
+            except OSError:
+                pass
+            return True
+        if directory in (self.git_dir, self.common_dir):
+            return name in ("HEAD", "packed-refs")
+        return True
+
+    def _drain(self) -> bool:
+        changed = False
+        while True:
+            try:
+                buf = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            pos = 0
+            while pos + _EVENT.size <= len(buf):
+                wd, mask, _, length = _EVENT.unpack_from(buf, pos)
+                name = buf[pos + _EVENT.size : pos + _EVENT.size + length].rstrip(b"\0").decode(errors="replace")
+                pos += _EVENT.size + length
+                changed = self._relevant(wd, mask, name) or changed
+
+    def wait(self, timeout: float | None = None, *, settle: float = 0.01) -> bool:
+        # True once a ref may have changed; False after `timeout` seconds without a change.
+        # Events are collected for `settle` seconds more, since one commit touches several files.
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if self._fd >= 0:
+            poller = select.poll()
+            poller.register(self._fd, select.POLLIN)
+            while True:
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                if not poller.poll(None if remaining is None else remaining * 1000):
+                    return False
+                if self._drain():
+                    while poller.poll(settle * 1000):
+                        self._drain()
+                    return True
+        while deadline is None or time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            fp = refs_fingerprint(self.repo_dir)
+            if fp != self._fingerprint:
+                time.sleep(settle)
+                self._fingerprint = refs_fingerprint(self.repo_dir)
+                return True
+        return False
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def __enter__(self) -> RefWatcher:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
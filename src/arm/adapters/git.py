@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+import os
 import subprocess
+import threading
+import time
+from collections.abc import Iterator
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -18,19 +22,184 @@ class GitResult:
     returncode: int
 
 
-def run_git(args: list[str], *, cwd: Path) -> GitResult:
+_stats_lock = threading.Lock()
+_stats = [0, 0]  # git processes started, bytes read from their stdout
+
+
+def _count(calls: int, nbytes: int) -> None:
+    with _stats_lock:
+        _stats[0] += calls
+        _stats[1] += nbytes
+
+
+def git_stats() -> tuple[int, int]:
+    # cumulative (calls, bytes) for this process; callers diff two snapshots
+    with _stats_lock:
+        return _stats[0], _stats[1]
+
+
+@dataclass(frozen=True, slots=True)
+class GitCall:
+    argv: tuple[str, ...]
+    started: float  # time.monotonic()
+    duration: float
+    returncode: int
+    stdout_bytes: int
+    stderr_bytes: int
+
+    @property
+    def subcommand(self) -> str:
+        # first non-option word after "git"
+        return next((a for a in self.argv[1:] if not a.startswith("-")), "?")
+
+
+_sinks: list[list[GitCall]] = []
+
+
+def record_git_calls(calls: list[GitCall]) -> None:
+    # every later run_git call is appended to `calls` until stop_git_calls(calls)
+    with _stats_lock:
+        _sinks.append(calls)
+
+
+def stop_git_calls(calls: list[GitCall]) -> None:
+    with _stats_lock:
+        _sinks[:] = [s for s in _sinks if s is not calls]
+
+
+def run_git(args: list[str], *, cwd: Path, input: str | None = None) -> GitResult:
+    started = time.monotonic()
     p = subprocess.run(
         ["git", *args],
         cwd=str(cwd),
         text=True,
         capture_output=True,
+        input=input,
     )
+    nbytes = len(p.stdout.encode())
+    _count(1, nbytes)
+    if _sinks:
+        call = GitCall(
+            argv=("git", *args),
+            started=started,
+            duration=time.monotonic() - started,
+            returncode=p.returncode,
+            stdout_bytes=nbytes,
+            stderr_bytes=len(p.stderr.encode()),
+        )
+        with _stats_lock:
+            for sink in _sinks:
+                sink.append(call)
     res = GitResult(stdout=p.stdout, stderr=p.stderr, returncode=p.returncode)
     if p.returncode != 0:
         raise GitError(f"git {' '.join(args)} failed: {p.stderr.strip()}")
     return res
 
 
+def iter_git_z(args: list[str], *, cwd: Path) -> Iterator[str]:
+    # Streams NUL-terminated records as git produces them instead of buffering stdout.
+    p = subprocess.Popen(["git", *args], cwd=str(cwd), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    assert p.stdout is not None and p.stderr is not None
+    _count(1, 0)
+    tail = b""
+    try:
+        while chunk := p.stdout.read(64 * 1024):
+            _count(0, len(chunk))
+            *records, tail = (tail + chunk).split(b"\0")
+            for r in records:
+                yield os.fsdecode(r)
+    finally:
+        p.stdout.close()
+        stderr = p.stderr.read().decode(errors="replace")
+        p.stderr.close()
+        returncode = p.wait()
+    if returncode != 0:
+        raise GitError(f"git {' '.join(args)} failed: {stderr.strip()}")
+
+
+def ls_files(*, repo_dir: Path, include_untracked: bool = False) -> Iterator[str]:
+    args = ["ls-files", "-z", "--cached"]
+    if include_untracked:
+        args += ["--others", "--exclude-standard"]
+    return iter_git_z(args, cwd=repo_dir)
+
+
+@dataclass(frozen=True, slots=True)
+class TreeEntry:
+    mode: int
+    sha: str
+    path: str
+
+
+def resolve_commit(*, repo_dir: Path, ref: str) -> str:
+    return run_git(["rev-parse", "--verify", f"{ref}^{{commit}}"], cwd=repo_dir).stdout.strip()
+
+
+def is_ancestor(*, repo_dir: Path, ancestor: str, ref: str) -> bool:
+    try:
+        run_git(["merge-base", "--is-ancestor", ancestor, ref], cwd=repo_dir)
+    except GitError:
+        return False
+    return True
+
+
+def commit_time(*, repo_dir: Path, ref: str) -> int:
+    return int(run_git(["log", "-1", "--format=%ct", ref], cwd=repo_dir).stdout.strip())
+
+
+def ls_tree(*, repo_dir: Path, ref: str) -> Iterator[TreeEntry]:
+    for rec in iter_git_z(["ls-tree", "-r", "-z", "--full-tree", ref], cwd=repo_dir):
+        meta, path = rec.split("\t", 1)
+        mode, typ, sha = meta.split()
+        # submodules show up as "commit" entries
+        if typ == "blob":
+            yield TreeEntry(mode=int(mode, 8), sha=sha, path=path)
+
+
+def iter_blobs(*, repo_dir: Path, shas: list[str]) -> Iterator[bytes]:
+    # One `git cat-file --batch` process; requests are fed from a thread so reading the
+    # responses never waits on a round trip and the pipes cannot deadlock.
+    p = subprocess.Popen(
+        ["git", "cat-file", "--batch"],
+        cwd=str(repo_dir),
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    assert p.stdin is not None and p.stdout is not None and p.stderr is not None
+    _count(1, 0)
+
+    def feed() -> None:
+        try:
+            for sha in shas:
+                p.stdin.write(f"{sha}\n".encode())
+            p.stdin.close()
+        except (BrokenPipeError, ValueError):
+            pass
+
+    feeder = threading.Thread(target=feed, daemon=True)
+    feeder.start()
+    try:
+        for _ in shas:
+            header = p.stdout.readline().split()
+            if len(header) != 3:
+                raise GitError(f"git cat-file --batch failed: {b' '.join(header).decode(errors='replace')}")
+            data = p.stdout.read(int(header[2]))
+            p.stdout.read(1)  # trailing newline
+            _count(0, len(data))
+            yield data
+    finally:
+        # closing stdout first makes git exit, which unblocks a feeder stuck on a full pipe
+        p.stdout.close()
+        feeder.join()
+        try:
+            p.stdin.close()
+        except BrokenPipeError:
+            pass
+        p.stderr.close()
+        p.wait()
+
+
 def is_dirty(*, repo_dir: Path) -> bool:
     res = run_git(["status", "--porcelain"], cwd=repo_dir)
     return res.stdout.strip() != ""
@@ -51,14 +220,22 @@ def last_tag(*, repo_dir: Path, tag_prefix: str) -> str | None:
     return tag or None
 
 
-def commit_log(*, repo_dir: Path, from_ref: str | None, to_ref: str) -> list[Commit]:
+HISTORY_MODES = {
+    "all": [],
+    # the mainline only: a merge stands for everything it brought in
+    "first-parent": ["--first-parent"],
+    "merges-only": ["--first-parent", "--merges"],
+}
+
+
+def commit_log(*, repo_dir: Path, from_ref: str | None, to_ref: str, history_mode: str = "all") -> list[Commit]:
     if from_ref:
         rev = f"{from_ref}..{to_ref}"
     else:
         rev = to_ref
     # delimiter separates commits reliably
-    fmt = "%H%n%s%n%b%n==END=="
-    res = run_git(["log", "--no-color", f"--pretty=format:{fmt}", rev], cwd=repo_dir)
+    fmt = "%H %P%n%s%n%b%n==END=="
+    res = run_git(["log", "--no-color", *HISTORY_MODES[history_mode], f"--pretty=format:{fmt}", rev], cwd=repo_dir)
     chunks = res.stdout.split("==END==")
     commits: list[Commit] = []
     for chunk in chunks:
@@ -66,21 +243,103 @@ def commit_log(*, repo_dir: Path, from_ref: str | None, to_ref: str) -> list[Com
         if not chunk.strip():
             continue
         lines = chunk.splitlines()
-        sha = lines[0].strip()
+        sha, *parents = lines[0].split()
         subject = lines[1].strip() if len(lines) > 1 else ""
         body = "\n".join(lines[2:]).strip() if len(lines) > 2 else ""
-        commits.append(Commit(sha=sha, subject=subject, body=body))
+        commits.append(Commit(sha=sha, subject=subject, body=body, merge=len(parents) > 1))
     return commits
 
 
-def diff_stat(*, repo_dir: Path, from_ref: str | None, to_ref: str) -> str:
-    args = ["diff", "--stat"]
-    if from_ref:
-        args += [from_ref, to_ref]
-    else:
-        args += [to_ref]
-    res = run_git(args, cwd=repo_dir)
-    return res.stdout
+@dataclass(frozen=True, slots=True)
+class TagRef:
+    name: str
+    sha: str  # peeled commit sha
+
+
+def list_tags(*, repo_dir: Path, tag_prefix: str) -> list[TagRef]:
+    # %(*objectname) is the peeled commit for annotated tags, empty for lightweight ones
+    fmt = "%(refname:short)%00%(objectname)%00%(*objectname)"
+    res = run_git(["for-each-ref", f"--format={fmt}", f"refs/tags/{tag_prefix}*"], cwd=repo_dir)
+    tags: list[TagRef] = []
+    for line in res.stdout.splitlines():
+        if not line:
+            continue
+        name, obj, peeled = line.split("\0")
+        tags.append(TagRef(name=name, sha=peeled or obj))
+    return tags
+
+
+def tag_range_commits(*, repo_dir: Path, tags: list[TagRef]) -> list[tuple[list[Commit], str]]:
+    # tags ordered oldest first; range i holds commits reachable from tags[i] but not
+    # from any earlier tag, paired with the tagged commit's date (YYYY-MM-DD).
+    # One history walk serves every range instead of a git log per tag pair.
+    if not tags:
+        return []
+    fmt = "%H%x00%P%x00%cs%x00%s%x00%b%x1e"
+    res = run_git(
+        ["log", "--no-color", "--topo-order", f"--pretty=format:{fmt}", *(t.sha for t in tags)],
+        cwd=repo_dir,
+    )
+    order: dict[str, int] = {}
+    parents: dict[str, list[str]] = {}
+    dates: dict[str, str] = {}
+    commits: dict[str, Commit] = {}
+    for record in res.stdout.split("\x1e"):
+        record = record.lstrip("\n")
+        if not record:
+            continue
+        sha, parent_list, cdate, subject, body = record.split("\0", 4)
+        order[sha] = len(order)
+        parents[sha] = parent_list.split()
+        dates[sha] = cdate
+        commits[sha] = Commit(sha=sha, subject=subject.strip(), body=body.strip(), merge=len(parents[sha]) > 1)
+
+    seen: set[str] = set()
+    ranges: list[tuple[list[Commit], str]] = []
+    for t in tags:
+        members: list[str] = []
+        stack = [t.sha]
+        while stack:
+            sha = stack.pop()
+            if sha in seen or sha not in commits:
+                continue
+            seen.add(sha)
+            members.append(sha)
+            stack.extend(parents[sha])
+        members.sort(key=order.__getitem__)
+        ranges.append(([commits[s] for s in members], dates.get(t.sha, "")))
+    return ranges
+
+
+@dataclass(frozen=True, slots=True)
+class FileStat:
+    path: str
+    added: int | None  # None for binary files
+    deleted: int | None
+
+
+def empty_tree(*, repo_dir: Path) -> str:
+    # the empty tree's id depends on the repo's hash algorithm
+    return run_git(["hash-object", "-t", "tree", "--stdin"], cwd=repo_dir, input="").stdout.strip()
+
+
+def iter_numstat(*, repo_dir: Path, from_sha: str, to_sha: str) -> Iterator[FileStat]:
+    # `git diff --numstat -z` records: "added\tdeleted\tpath", or for a rename
+    # "added\tdeleted\t" followed by the old and new path as separate records.
+    # Renames are off, so a move counts as a delete plus an add.
+    records = iter_git_z(["diff", "--numstat", "-z", "--no-renames", "--no-color", from_sha, to_sha], cwd=repo_dir)
+    for rec in records:
+        if not rec:
+            continue
+        added, deleted, path = rec.split("\t", 2)
+        if not path:
+            next(records)  # old path
+            path = next(records)
+        yield FileStat(
+            path=path,
+            added=None if added == "-" else int(added),
+            deleted=None if deleted == "-" else int(deleted),
+        )
 
 
 def commit_file(*, repo_dir: Path, path: Path, message: str, sign: bool = False) -> str:
@@ -93,20 +352,92 @@ def commit_file(*, repo_dir: Path, path: Path, message: str, sign: bool = False)
     return sha
 
 
+@dataclass(frozen=True, slots=True)
+class RefUpdate:
+    ref: str
+    new: str | None  # None deletes the ref
+    old: str | None = None  # expected current value; "" requires that the ref does not exist
+
+
+def update_refs(*, repo_dir: Path, updates: list[RefUpdate]) -> None:
+    # One `git update-ref --stdin` transaction: every ref changes, or none does.
+    if not updates:
+        return
+    lines = ["start"]
+    for u in updates:
+        if u.new is None:
+            lines.append(f"delete {u.ref}" + (f" {u.old}" if u.old else ""))
+        elif u.old == "":
+            lines.append(f"create {u.ref} {u.new}")
+        else:
+            lines.append(f"update {u.ref} {u.new}" + (f" {u.old}" if u.old else ""))
+    lines += ["prepare", "commit"]
+    run_git(["update-ref", "--stdin"], cwd=repo_dir, input="\n".join(lines) + "\n")
+
+
+def tag_refs(*, repo_dir: Path) -> dict[str, str]:
+    # tag name -> ref value (the tag object for annotated tags)
+    res = run_git(["for-each-ref", "--format=%(refname:strip=2)%00%(objectname)", "refs/tags"], cwd=repo_dir)
+    return dict(line.split("\0", 1) for line in res.stdout.splitlines() if line)
+
+
 def create_tag(*, repo_dir: Path, tag: str, sign: bool = False) -> None:
     if sign:
         run_git(["tag", "-s", tag, "-m", f"release {tag}"], cwd=repo_dir)
     else:
-        run_git(["tag", tag], cwd=repo_dir)
+        head = resolve_commit(repo_dir=repo_dir, ref="HEAD")
+        update_refs(repo_dir=repo_dir, updates=[RefUpdate(ref=f"refs/tags/{tag}", new=head, old="")])
+
+
+def delete_tags(*, repo_dir: Path, tags: list[str]) -> list[str]:
+    # Deletes the existing tags in one transaction, each guarded by its current value.
+    current = tag_refs(repo_dir=repo_dir)
+    present = [t for t in tags if t in current]
+    update_refs(
+        repo_dir=repo_dir,
+        updates=[RefUpdate(ref=f"refs/tags/{t}", new=None, old=current[t]) for t in present],
+    )
+    return present
 
 
 def delete_tag(*, repo_dir: Path, tag: str) -> None:
-    run_git(["tag", "-d", tag], cwd=repo_dir)
+    if not delete_tags(repo_dir=repo_dir, tags=[tag]):
+        raise GitError(f"tag {tag} not found")
 
 
-def push_branch(*, repo_dir: Path, remote: str, branch: str) -> None:
-    run_git(["push", remote, branch], cwd=repo_dir)
+def notes_list(*, repo_dir: Path, ref: str) -> dict[str, str]:
+    # annotated object -> note blob, for every note under `ref`
+    try:
+        res = run_git(["notes", f"--ref={ref}", "list"], cwd=repo_dir)
+    except GitError:
+        return {}
+    notes = {}
+    for line in res.stdout.splitlines():
+        blob, _, obj = line.partition(" ")
+        if obj:
+            notes[obj] = blob
+    return notes
+
+
+def write_notes(*, repo_dir: Path, ref: str, notes: dict[str, str], message: str) -> None:
+    # Adds or replaces many notes in one commit on `ref` through a single `git fast-import`,
+    # which also keeps the notes tree fanned out. Contents must be ASCII (data lengths are
+    # counted in characters). Fails if `ref` moved since it was read, instead of overwriting.
+    if not notes:
+        return
+    full = ref if ref.startswith("refs/") else f"refs/notes/{ref}"
+    try:
+        parent: str | None = run_git(["rev-parse", "--verify", "-q", full], cwd=repo_dir).stdout.strip()
+    except GitError:
+        parent = None
+    out = [f"commit {full}", "committer arm <arm@localhost> now", f"data {len(message)}", message]
+    if parent:
+        out.append(f"from {parent}")
+    for obj, text in notes.items():
+        out += [f"N inline {obj}", f"data {len(text)}", text]
+    run_git(["fast-import", "--quiet", "--date-format=now"], cwd=repo_dir, input="\n".join(out) + "\n")
 
 
-def push_tag(*, repo_dir: Path, remote: str, tag: str) -> None:
-    run_git(["push", remote, tag], cwd=repo_dir)
+def push_atomic(*, repo_dir: Path, remote: str, refspecs: list[str]) -> None:
+    # the remote accepts all refs or none
+    run_git(["push", "--atomic", remote, *refspecs], cwd=repo_dir)
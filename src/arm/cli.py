@@ -1,23 +1,58 @@
 from __future__ import annotations
 
 import fnmatch
+import hashlib
+import io
 import json
+import os
+import sys
+import time
+from contextlib import redirect_stderr, redirect_stdout
+from dataclasses import asdict
+from datetime import date
 from pathlib import Path
 
 import typer
+import typer.core
+import typer.main
 
-from arm.config import load_config
+from arm.config import PackageConfig, ReleasePolicy, load_config
 from arm.adapters import git as git_adapter
-from arm.adapters.git import GitError
-from arm.domain.models import BumpType, SemVer
-from arm.services.changelog import prepend_changelog, render_release_section
-from arm.services.conventional_commits import validate_commits
-from arm.services.packager import PackageSpec, build_zip
-from arm.services.rollback import rollback_last_release
+from arm.adapters.fswatch import RefWatcher
+from arm.adapters.git import GitCall, GitError
+from arm.domain.models import BumpType, ConventionalCommit, SemVer
+from arm.services.batch import BatchSession, batch_argv, batch_result
+from arm.services.changelog import prepend_changelog, rebuild_changelog, render_release_section
+from arm.services.conventional_commits import ConventionalCommitError
+from arm.services.diffstats import DiffStats, diff_stats, stats_json, summary_lines
+from arm.services.metrics import MetricsRecorder, write_textfile
+from arm.services.checkpoint import clear_checkpoint, completed_tasks, load_checkpoint, save_checkpoint
+from arm.services.packager import (
+    CompressionPolicy,
+    PackageResult,
+    PackageSpec,
+    artifact_paths,
+    build_package,
+    manifest_path,
+    package_name,
+    read_manifest,
+)
+from arm.services.push import PushResult, push_command, push_remotes, quorum_met, required_successes
+from arm.services.repo_cache import RepoCache
+from arm.services.rollback import RollbackError, rollback_release
 from arm.services.semver import compute_next_version
-from arm.services.transaction_log import build_transaction, read_last_release, write_last_release
+from arm.services.transaction_log import ReleaseJournal, append_release, build_transaction
+from arm.services.verify import file_sha256, verify_artifact
+from arm.services.wal import ReleaseWAL, recover_release
+from arm.services.watch import IncrementalPlanner
+from arm.workflow.dag import Task, TaskRun, run_dag
+from arm.workflow.profile import CommandProfile
+from arm.workflow.state_machine import ReleaseContext, ReleaseState
+from arm.workflow.trace import write_chrome_trace
 
 app = typer.Typer(add_completion=False, help="Autonomous Release Manager (arm)")
+changelog_app = typer.Typer(add_completion=False, help="Changelog maintenance")
+app.add_typer(changelog_app, name="changelog")
 
 
 class ValidationFailed(RuntimeError):
@@ -35,6 +70,114 @@ def _level_to_bump(level: str) -> BumpType | None:
     return BumpType(level)
 
 
+def _history_mode(override: str | None, policy: ReleasePolicy) -> str:
+    if override is None:
+        return policy.normalize_history_mode()
+    if override not in git_adapter.HISTORY_MODES:
+        typer.echo(f"Unknown --history-mode {override!r}: use all, first-parent or merges-only.", err=True)
+        raise typer.Exit(code=2)
+    return override
+
+
+def _diff_stats(
+    repo_dir: Path, from_ref: str | None, to_ref: str, *, mode: str, cache: bool
+) -> DiffStats | None:
+    if mode == "none":
+        return None
+    if mode not in ("summary", "files"):
+        typer.echo(f"Unknown --diff-stats {mode!r}: use none, summary or files.", err=True)
+        raise typer.Exit(code=2)
+    return diff_stats(repo_dir=repo_dir, from_ref=from_ref, to_ref=to_ref, cache=cache)
+
+
+def _notes_ref(policy: ReleasePolicy) -> str | None:
+    return policy.notes_ref if policy.notes_cache else None
+
+
+def _workers(override: int | None, configured: int) -> int:
+    n = configured if override is None else override
+    return n if n > 0 else (os.cpu_count() or 1)
+
+
+def _package_spec(
+    cfg: PackageConfig,
+    *,
+    repo_dir: Path,
+    project_name: str,
+    version: str,
+    workers: int | None,
+    source: str | None,
+    ref: str,
+    incremental: bool | None,
+    formats: list[str],
+) -> PackageSpec:
+    # CLI flags override the [package] section of arm.toml
+    return PackageSpec(
+        project_name=project_name,
+        version=version,
+        repo_dir=repo_dir,
+        dist_dir=repo_dir / "dist",
+        workers=_workers(workers, cfg.workers),
+        source=source or cfg.source,
+        ref=ref,
+        include_untracked=cfg.include_untracked,
+        incremental=cfg.incremental if incremental is None else incremental,
+        formats=tuple(formats or cfg.formats),
+        compression=CompressionPolicy.legacy() if cfg.compression == "legacy" else CompressionPolicy(),
+        store_dir=repo_dir / ".arm" / "store" if cfg.store else None,
+        store_max_bytes=cfg.store_max_mb * 1024 * 1024,
+    )
+
+
+def _skip() -> None:
+    pass
+
+
+def _artifact_hashes(repo_dir: Path, artifacts: list[Path]) -> dict[str, str]:
+    # archive hashes were computed while writing; only SHA256SUMS is hashed here
+    archives = (read_manifest(manifest_path(repo_dir, artifacts[0])) or {}).get("archives", {})
+    return {str(a): archives[a.name]["sha256"] if a.name in archives else file_sha256(a) for a in artifacts}
+
+
+def _observe_commits(
+    metrics: MetricsRecorder, parsed: list[ConventionalCommit], errors: list[ConventionalCommitError]
+) -> None:
+    metrics.inc("arm_commits_parsed", len(parsed))
+    metrics.inc("arm_validation_errors", len(errors))
+
+
+def _observe_package(metrics: MetricsRecorder, result: PackageResult, seconds: float) -> None:
+    raw = sum(f.size for f in result.files)
+    for a in result.artifacts:
+        size = a.stat().st_size
+        metrics.set("arm_artifact_bytes", size, format=a.name[len(package_name(a)) :].lstrip(".").lower())
+        if a.name.endswith(".zip") and size:
+            metrics.set("arm_package_compression_ratio", raw / size)
+    if not result.cached and seconds > 0:
+        metrics.set("arm_package_throughput_bytes_per_second", raw / seconds)
+
+
+def _export_metrics(ctx: typer.Context, metrics: MetricsRecorder, textfile: Path) -> None:
+    started = time.monotonic()
+    calls: list[GitCall] = []
+    git_adapter.record_git_calls(calls)
+
+    def write() -> None:
+        git_adapter.stop_git_calls(calls)
+        elapsed = time.monotonic() - started
+        metrics.observe("arm_command_duration_seconds", elapsed, command=ctx.invoked_subcommand or "")
+        for c in calls:
+            metrics.inc("arm_git_calls", subcommand=c.subcommand)
+            metrics.observe("arm_git_duration_seconds", c.duration, subcommand=c.subcommand)
+        try:
+            write_textfile(textfile, metrics)
+        except OSError as exc:
+            # monitoring must not fail the command
+            typer.echo(f"Could not write metrics to {textfile}: {exc}", err=True)
+
+    ctx.call_on_close(write)
+
+
 def _branch_allowed(branch: str, patterns: set[str]) -> bool:
     if not patterns:
         return True
@@ -46,10 +189,31 @@ def _root(
     ctx: typer.Context,
     repo: str | None = typer.Option(None, "--repo", help="Path to the git repo (default: cwd)"),
     config: str | None = typer.Option(None, "--config", help="Path to arm.toml policy config"),
+    profile: Path | None = typer.Option(
+        None, "--profile", help="Run under cProfile, write .pstats here and print a git/Python summary"
+    ),
+    metrics_file: Path | None = typer.Option(
+        None, "--metrics-file", help="Merge this run's metrics into an OpenMetrics textfile"
+    ),
 ) -> None:
     ctx.ensure_object(dict)
-    ctx.obj["repo_dir"] = _repo_dir(repo)
-    ctx.obj["config"] = load_config(config)
+    session: BatchSession | None = ctx.obj.get("batch")
+    ctx.obj["repo_dir"] = repo_dir = _repo_dir(repo)
+    ctx.obj["config"] = session.configs.load(config) if session else load_config(config)
+    ctx.obj["cache"] = session.repo_cache(repo_dir) if session else RepoCache(repo_dir)
+    ctx.obj["metrics"] = metrics = MetricsRecorder(repo=str(ctx.obj["repo_dir"]))
+    textfile = metrics_file or ctx.obj["config"].metrics.textfile
+    if textfile:
+        _export_metrics(ctx, metrics, Path(textfile))
+    if profile is not None:
+        prof = CommandProfile(profile)
+
+        def report() -> None:
+            prof.stop()
+            typer.echo(prof.summary(), err=True)
+
+        prof.start()
+        ctx.call_on_close(report)
 
 
 @app.command()
@@ -60,7 +224,7 @@ def status(ctx: typer.Context, tag_prefix: str = typer.Option("v", "--tag-prefix
     branch = None
     try:
         dirty = git_adapter.is_dirty(repo_dir=repo_dir)
-        last = git_adapter.last_tag(repo_dir=repo_dir, tag_prefix=tag_prefix)
+        last = ctx.obj["cache"].last_tag(tag_prefix)
         branch = git_adapter.current_branch(repo_dir=repo_dir)
     except Exception:
         # keep status usable even if not a git repo
@@ -79,12 +243,18 @@ def validate(
     from_ref: str = typer.Option(None, "--from"),
     to_ref: str = typer.Option("HEAD", "--to"),
     tag_prefix: str = typer.Option("v", "--tag-prefix"),
+    history_mode: str | None = typer.Option(
+        None, "--history-mode", help="all, first-parent or merges-only (default: history_mode from arm.toml)"
+    ),
 ) -> None:
-    repo_dir: Path = ctx.obj["repo_dir"]
+    cache: RepoCache = ctx.obj["cache"]
     if from_ref is None:
-        from_ref = git_adapter.last_tag(repo_dir=repo_dir, tag_prefix=tag_prefix)
-    commits = git_adapter.commit_log(repo_dir=repo_dir, from_ref=from_ref, to_ref=to_ref)
-    parsed, errors = validate_commits(commits)
+        from_ref = cache.last_tag(tag_prefix)
+    policy = ctx.obj["config"].policy
+    _, parsed, errors = cache.commits(
+        from_ref, to_ref, history_mode=_history_mode(history_mode, policy), notes_ref=_notes_ref(policy)
+    )
+    _observe_commits(ctx.obj["metrics"], parsed, errors)
     if errors:
         for e in errors:
             typer.echo(f"{e.sha[:8]} {e.reason}: {e.subject}", err=True)
@@ -100,14 +270,24 @@ def plan(
     tag_prefix: str = typer.Option("v", "--tag-prefix"),
     initial_version: str = typer.Option(None, "--initial-version"),
     to_ref: str = typer.Option("HEAD", "--to"),
+    history_mode: str | None = typer.Option(
+        None, "--history-mode", help="all, first-parent or merges-only (default: history_mode from arm.toml)"
+    ),
+    stats_mode: str = typer.Option(
+        "none", "--diff-stats", help="none, summary (totals and per-scope counts) or files (also per file)"
+    ),
+    diff_scope_depth: int = typer.Option(1, "--diff-scope-depth", help="Directory levels that make up a scope"),
 ) -> None:
     repo_dir: Path = ctx.obj["repo_dir"]
     policy = ctx.obj["config"].policy
-    last = git_adapter.last_tag(repo_dir=repo_dir, tag_prefix=tag_prefix)
+    cache: RepoCache = ctx.obj["cache"]
+    last = cache.last_tag(tag_prefix)
     initial = initial_version or policy.initial_version
     current = SemVer.parse(last.lstrip(tag_prefix)) if last else SemVer.parse(initial)
-    commits = git_adapter.commit_log(repo_dir=repo_dir, from_ref=last, to_ref=to_ref)
-    parsed, errors = validate_commits(commits)
+    _, parsed, errors = cache.commits(
+        last, to_ref, history_mode=_history_mode(history_mode, policy), notes_ref=_notes_ref(policy)
+    )
+    _observe_commits(ctx.obj["metrics"], parsed, errors)
     if errors:
         for e in errors:
             typer.echo(f"{e.sha[:8]} {e.reason}: {e.subject}", err=True)
@@ -115,7 +295,10 @@ def plan(
     next_v, decision = compute_next_version(
         current, parsed, policy=policy, forced=_level_to_bump(level)
     )
-    preview = render_release_section(next_v, parsed)
+    stats = _diff_stats(repo_dir, last, to_ref, mode=stats_mode, cache=True)
+    preview = render_release_section(
+        next_v, parsed, diff_summary=summary_lines(stats, depth=diff_scope_depth) if stats else None
+    )
 
     if json_out:
         typer.echo(
@@ -128,6 +311,11 @@ def plan(
                     "bump": decision.bump,
                     "reason": decision.reason,
                     "changelog_preview": preview,
+                    **(
+                        {"diff_stats": stats_json(stats, depth=diff_scope_depth, files=stats_mode == "files")}
+                        if stats
+                        else {}
+                    ),
                 },
                 indent=2,
                 default=str,
@@ -150,13 +338,71 @@ def release(
     allow_dirty: bool = typer.Option(False, "--allow-dirty"),
     push: bool = typer.Option(False, "--push"),
     remote_safe: bool | None = typer.Option(None, "--remote-safe/--no-remote-safe"),
-    remote: str | None = typer.Option(None, "--remote"),
+    remote: list[str] = typer.Option(
+        [], "--remote", help="Push to this remote, repeatable (default: default_remote from arm.toml)"
+    ),
+    push_quorum: int | None = typer.Option(
+        None, "--push-quorum", help="Remotes that must accept the push (0 = all)"
+    ),
+    push_workers: int | None = typer.Option(None, "--push-workers", help="Concurrent pushes"),
+    history_mode: str | None = typer.Option(
+        None, "--history-mode", help="all, first-parent or merges-only (default: history_mode from arm.toml)"
+    ),
     tag_prefix: str = typer.Option("v", "--tag-prefix"),
     initial_version: str = typer.Option(None, "--initial-version"),
     project_name: str = typer.Option("project", "--project-name"),
+    package_workers: int | None = typer.Option(
+        None, "--package-workers", help="Zip compression threads (0 = cpu count)"
+    ),
+    package_source: str | None = typer.Option(
+        None,
+        "--package-source",
+        help="walk (working tree), git (tracked files via git ls-files) or tree (the tagged commit)",
+    ),
+    incremental: bool | None = typer.Option(
+        None, "--incremental/--no-incremental", help="Reuse unchanged entries of the previous artifact"
+    ),
+    formats: list[str] = typer.Option(
+        [], "--format", help="Package format, repeatable: zip, tar.gz, tar.xz, sha256sums"
+    ),
+    trace: Path | None = typer.Option(
+        None, "--trace", help="Write per-stage timings as a Chrome trace-event JSON file"
+    ),
+    stats_mode: str = typer.Option(
+        "none", "--diff-stats", help="none, summary (totals and per-scope counts) or files (also per file)"
+    ),
+    diff_scope_depth: int = typer.Option(1, "--diff-scope-depth", help="Directory levels that make up a scope"),
+    resume: bool = typer.Option(
+        False, "--resume", help="Continue an interrupted release from its last checkpoint"
+    ),
 ) -> None:
     repo_dir: Path = ctx.obj["repo_dir"]
     policy = ctx.obj["config"].policy
+    package_cfg = ctx.obj["config"].package
+    metrics: MetricsRecorder = ctx.obj["metrics"]
+    rc = ReleaseContext(probe=git_adapter.git_stats)
+    task_runs: list[TaskRun] = []
+    if trace is not None:
+        # also written when the release stops early, covering the stages that ran
+        ctx.call_on_close(lambda: write_chrome_trace(trace, rc.events, tasks=task_runs))
+
+    wal = ReleaseWAL(repo_dir)
+    checkpoint = load_checkpoint(repo_dir) if resume else None
+    if resume and (dry_run or checkpoint is None or not wal.exists()):
+        typer.echo("No interrupted release to resume (--resume cannot be combined with --dry-run).", err=True)
+        raise typer.Exit(code=1)
+    if wal.exists() and not resume:
+        typer.echo("An interrupted release was found. Run `arm release --resume` or `arm recover` first.", err=True)
+        raise typer.Exit(code=1)
+    if checkpoint is not None:
+        # the interrupted run's options win over this invocation's
+        opts = checkpoint.plan["options"]
+        project_name, formats, package_workers = opts["project_name"], opts["formats"], opts["package_workers"]
+        package_source, incremental = opts["package_source"], opts["incremental"]
+        no_commit, no_tag, sign_commit, sign_tag = opts["no_commit"], opts["no_tag"], opts["sign_commit"], opts["sign_tag"]
+        push, remote = opts["push"], [opts["remote"]] if isinstance(opts["remote"], str) else opts["remote"] or []
+        push_quorum, push_workers = opts.get("push_quorum"), opts.get("push_workers")
+
     branch = git_adapter.current_branch(repo_dir=repo_dir)
     if not _branch_allowed(branch, policy.allowed_branches):
         typer.echo(
@@ -172,101 +418,279 @@ def release(
             err=True,
         )
         raise typer.Exit(code=1)
-    remote_name = remote or policy.default_remote
-
-    enforce_clean = policy.fail_on_dirty and not allow_dirty
-    if enforce_clean and git_adapter.is_dirty(repo_dir=repo_dir):
-        typer.echo("Dirty working tree. Use --allow-dirty to override.", err=True)
-        raise typer.Exit(code=1)
+    remotes = list(dict.fromkeys(remote)) or list(policy.default_remotes)
+    quorum = policy.push_quorum if push_quorum is None else push_quorum
+    required = required_successes(quorum, len(remotes))
 
-    last = git_adapter.last_tag(repo_dir=repo_dir, tag_prefix=tag_prefix)
-    initial = initial_version or policy.initial_version
-    current = SemVer.parse(last.lstrip(tag_prefix)) if last else SemVer.parse(initial)
-
-    commits = git_adapter.commit_log(repo_dir=repo_dir, from_ref=last, to_ref="HEAD")
-    parsed, errors = validate_commits(commits)
-    if errors:
-        for e in errors:
-            typer.echo(f"{e.sha[:8]} {e.reason}: {e.subject}", err=True)
-        raise typer.Exit(code=2)
+    changelog_path = repo_dir / "CHANGELOG.md"
+    stats: DiffStats | None = None
+    if checkpoint is None:
+        enforce_clean = policy.fail_on_dirty and not allow_dirty
+        if enforce_clean and git_adapter.is_dirty(repo_dir=repo_dir):
+            typer.echo("Dirty working tree. Use --allow-dirty to override.", err=True)
+            raise typer.Exit(code=1)
+
+        cache: RepoCache = ctx.obj["cache"]
+        last = cache.last_tag(tag_prefix)
+        initial = initial_version or policy.initial_version
+        current = SemVer.parse(last.lstrip(tag_prefix)) if last else SemVer.parse(initial)
+
+        commits, parsed, errors = cache.commits(
+            last,
+            "HEAD",
+            history_mode=_history_mode(history_mode, policy),
+            notes_ref=_notes_ref(policy),
+            write_notes=not dry_run,
+        )
+        rc.transition(ReleaseState.DIFF_COLLECTED, reason=f"{len(commits)} commits since {last or 'start'}")
+        _observe_commits(metrics, parsed, errors)
+        if errors:
+            for e in errors:
+                typer.echo(f"{e.sha[:8]} {e.reason}: {e.subject}", err=True)
+            raise typer.Exit(code=2)
+        rc.transition(ReleaseState.COMMITS_VALIDATED, reason=f"{len(parsed)} conventional commits")
 
-    try:
-        next_v, decision = compute_next_version(
-            current, parsed, policy=policy, forced=_level_to_bump(level)
+        try:
+            next_v, decision = compute_next_version(
+                current, parsed, policy=policy, forced=_level_to_bump(level)
+            )
+        except ValueError as exc:
+            typer.echo(str(exc), err=True)
+            raise typer.Exit(code=2)
+        rc.transition(ReleaseState.VERSION_BUMPED, reason=f"{current} -> {next_v} ({decision.bump})")
+        stats = _diff_stats(repo_dir, last, "HEAD", mode=stats_mode, cache=not dry_run)
+        section = render_release_section(
+            next_v, parsed, diff_summary=summary_lines(stats, depth=diff_scope_depth) if stats else None
         )
-    except ValueError as exc:
-        typer.echo(str(exc), err=True)
-        raise typer.Exit(code=2)
-    section = render_release_section(next_v, parsed)
 
-    changelog_path = repo_dir / "CHANGELOG.md"
-    existing = changelog_path.read_text(encoding="utf-8") if changelog_path.exists() else ""
-    new_changelog = prepend_changelog(existing, section)
+        existing = changelog_path.read_text(encoding="utf-8") if changelog_path.exists() else ""
+        plan = {
+            "current_version": str(current),
+            "next_version": str(next_v),
+            "bump": decision.bump.value,
+            "reason": decision.reason,
+            "tag": f"{tag_prefix}{next_v}",
+            "changelog_path": str(changelog_path),
+            "new_changelog": prepend_changelog(existing, section),
+            "changelog_existed_before": changelog_path.exists(),
+            "changelog_before": existing if changelog_path.exists() else None,
+            # per-file counts stay out of the checkpoint, which is rewritten after every task
+            "diff_stats": stats_json(stats, depth=diff_scope_depth) if stats else None,
+            "options": {
+                "project_name": project_name,
+                "formats": formats,
+                "package_workers": package_workers,
+                "package_source": package_source,
+                "incremental": incremental,
+                "no_commit": no_commit,
+                "no_tag": no_tag,
+                "sign_commit": sign_commit,
+                "sign_tag": sign_tag,
+                "push": push,
+                "remote": remote,
+                "push_quorum": push_quorum,
+                "push_workers": push_workers,
+            },
+        }
+    else:
+        plan = checkpoint.plan
+        rc = ReleaseContext(state=checkpoint.state, events=list(checkpoint.events), probe=git_adapter.git_stats)
 
-    tag = f"{tag_prefix}{next_v}"
-    dist_dir = repo_dir / "dist"
+    version: str = plan["next_version"]
+    tag: str = plan["tag"]
+    new_changelog: str = plan["new_changelog"]
+    changelog_existed_before: bool = plan["changelog_existed_before"]
+    changelog_before: str | None = plan["changelog_before"]
 
     actions: list[str] = []
     artifacts: list[Path] = []
     rollback_actions: list[str] = []
     changelog_commit_sha: str | None = None
     tag_created = False
-    changelog_existed_before = changelog_path.exists()
-    changelog_before = existing if changelog_existed_before else None
+    tag_target: str | None = None
+    artifact_hashes: dict[str, str] = {}
 
-    try:
-        actions.append(f"write {changelog_path}")
+    def write_changelog() -> None:
         if not dry_run:
+            wal.intent("changelog")
             changelog_path.write_text(new_changelog, encoding="utf-8")
-
-        if not no_commit:
-            actions.append("git commit CHANGELOG.md")
-            if not dry_run:
-                changelog_commit_sha = git_adapter.commit_file(
-                    repo_dir=repo_dir,
-                    path=changelog_path,
-                    message=f"chore(release): {tag}",
-                    sign=sign_commit,
-                )
-
-        if not no_tag:
-            actions.append(f"git tag {tag}")
-            if not dry_run:
+            wal.done("changelog")
+            metrics.inc("arm_changelog_bytes_written", len(new_changelog.encode("utf-8")))
+
+    def commit() -> None:
+        nonlocal changelog_commit_sha
+        if not dry_run and not no_commit:
+            wal.intent("commit")
+            changelog_commit_sha = git_adapter.commit_file(
+                repo_dir=repo_dir,
+                path=changelog_path,
+                message=f"chore(release): {tag}",
+                sign=sign_commit,
+            )
+            wal.done("commit", sha=changelog_commit_sha)
+
+    def create_tag() -> None:
+        nonlocal tag_created, tag_target
+        if not dry_run and not no_tag:
+            existing = git_adapter.tag_refs(repo_dir=repo_dir).get(tag) if checkpoint is not None else None
+            if existing is None:
+                wal.intent("tag")
                 git_adapter.create_tag(repo_dir=repo_dir, tag=tag, sign=sign_tag)
-                tag_created = True
+                wal.done("tag")
+            else:
+                # the interrupted run may have died between `git tag` and its checkpoint
+                target = git_adapter.resolve_commit(repo_dir=repo_dir, ref=f"refs/tags/{tag}")
+                expected = changelog_commit_sha or git_adapter.resolve_commit(repo_dir=repo_dir, ref="HEAD")
+                if target != expected:
+                    raise RuntimeError(f"Tag {tag} already exists on {target}, not on the release commit {expected}")
+                wal.done("tag")
+            tag_created = True
+            tag_target = git_adapter.resolve_commit(repo_dir=repo_dir, ref=f"refs/tags/{tag}")
+
+    def build() -> None:
+        if dry_run:
+            return
+        spec = _package_spec(
+            package_cfg,
+            repo_dir=repo_dir,
+            project_name=project_name,
+            version=version,
+            workers=package_workers,
+            source=package_source,
+            ref=changelog_commit_sha or "HEAD",
+            incremental=incremental,
+            formats=formats,
+        )
+        wal.intent("package", artifacts=[str(a) for a in artifact_paths(spec)])
+        started = time.monotonic()
+        result = build_package(spec)
+        _observe_package(metrics, result, time.monotonic() - started)
+        artifacts.extend(result.artifacts)
+        artifact_hashes.update(_artifact_hashes(repo_dir, artifacts))
+
+    def verify() -> None:
+        if dry_run:
+            return
+        for a in artifacts:
+            check = verify_artifact(a, repo_dir=repo_dir)
+            if not check.ok:
+                raise RuntimeError(f"Artifact verification failed for {a.name}: {'; '.join(check.problems)}")
+        wal.done("package", artifacts=[str(a) for a in artifacts])
+
+    def record() -> None:
+        if dry_run:
+            return
+        tx = build_transaction(
+            repo_dir=repo_dir,
+            version=version,
+            tag=None if no_tag else tag,
+            changelog_path=changelog_path,
+            changelog_commit_sha=changelog_commit_sha,
+            changelog_existed_before=changelog_existed_before,
+            changelog_before=changelog_before,
+            artifacts=artifacts,
+        )
+        wal.intent("journal")
+        append_release(repo_dir=repo_dir, tx=tx)
+        wal.done("journal")
 
-        actions.append("build zip")
-        if not dry_run:
-            zip_path = build_zip(
-                PackageSpec(
-                    project_name=project_name,
-                    version=str(next_v),
+    refspecs = [branch] if no_tag else [branch, f"refs/tags/{tag}"]
+    push_results: list[PushResult] = []
+
+    def push_refs() -> None:
+        if push and not dry_run:
+            push_results.extend(
+                push_remotes(
                     repo_dir=repo_dir,
-                    dist_dir=dist_dir,
+                    remotes=remotes,
+                    refspecs=refspecs,
+                    workers=policy.push_workers if push_workers is None else push_workers,
+                    on_start=lambda r: wal.intent(f"push:{r}", command=push_command(r, refspecs)),
+                    on_done=lambda res: wal.done(f"push:{res.remote}") if res.ok else None,
                 )
             )
-            artifacts.append(zip_path)
+            if not any(r.ok for r in push_results):
+                # nothing was published anywhere, so the release can still be rolled back
+                raise RuntimeError("Push failed on every remote: " + "; ".join(r.error or "" for r in push_results))
+
+    # Packaging reads the working tree (walk), the index (git) or the release commit (tree),
+    # so it waits for the changelog or its commit but overlaps with tagging. Nothing is
+    # recorded or pushed before the artifacts verify.
+    package_after = "changelog" if (package_source or package_cfg.source) == "walk" else "commit"
+    steps = [
+        ("changelog", write_changelog, ()),
+        ("commit", commit, ("changelog",)),
+        ("tag", create_tag, ("commit",)),
+        ("package", build, (package_after,)),
+        ("verify", verify, ("package",)),
+        ("journal", record, ("tag", "verify")),
+        ("push", push_refs, ("journal",)),
+    ]
+    resumed: set[str] = set()
+    evidence: dict[str, dict] = {}
+    if checkpoint is not None:
+        # skip tasks whose effect is still in place and pick up their results
+        resumed = completed_tasks(repo_dir, checkpoint, {name: deps for name, _, deps in steps})
+        evidence = {name: checkpoint.tasks[name] for name in resumed}
+        changelog_commit_sha = evidence.get("commit", {}).get("sha")
+        tag_target = evidence.get("tag", {}).get("target")
+        tag_created = tag_target is not None
+        artifact_hashes = dict(evidence.get("package", {}).get("artifacts", {}))
+        artifacts = [Path(a) for a in artifact_hashes]
+    tasks = [Task(name, _skip if name in resumed else fn, deps=deps) for name, fn, deps in steps]
+
+    actions.append(f"write {changelog_path}")
+    if not no_commit:
+        actions.append("git commit CHANGELOG.md")
+    if not no_tag:
+        actions.append(f"git tag {tag}")
+    actions += ["build package", "verify package"]
+    if push:
+        actions += [push_command(r, refspecs) for r in remotes]
+
+    # state-machine stages complete once all of their tasks have, in stage order
+    milestones = [
+        (ReleaseState.CHANGELOG_WRITTEN, {"changelog", "commit", "tag"}, "changelog written, committed and tagged"),
+        (ReleaseState.PACKAGED, {"package", "verify"}, "built and verified"),
+        (ReleaseState.COMPLETED, {"journal", "push"}, "recorded" + (" and pushed" if push else "")),
+    ]
+    reached = {e.to_state for e in rc.events}
+    milestones = [m for m in milestones if m[0] not in reached]
+    finished: set[str] = set()
+
+    def advance(name: str) -> None:
+        finished.add(name)
+        while milestones and milestones[0][1] <= finished:
+            state, _, reason = milestones.pop(0)
+            stage_artifacts = [str(a) for a in artifacts] if state is ReleaseState.PACKAGED else None
+            rc.transition(state, reason=reason, artifacts=stage_artifacts)
+        if dry_run:
+            return
+        if name not in evidence:
+            evidence[name] = {
+                "changelog": {"sha256": hashlib.sha256(new_changelog.encode("utf-8")).hexdigest()},
+                "commit": {"sha": changelog_commit_sha},
+                "tag": {"target": tag_target},
+                "package": {"artifacts": artifact_hashes},
+            }.get(name, {})
+        save_checkpoint(repo_dir, plan=plan, rc=rc, tasks=evidence)
 
+    try:
         if not dry_run:
-            tx = build_transaction(
-                repo_dir=repo_dir,
-                version=str(next_v),
-                tag=None if no_tag else tag,
-                changelog_path=changelog_path,
-                changelog_commit_sha=changelog_commit_sha,
-                changelog_existed_before=changelog_existed_before,
-                changelog_before=changelog_before,
-                artifacts=artifacts,
-            )
-            write_last_release(repo_dir=repo_dir, tx=tx)
-        if push:
-            actions.append(f"git push {remote_name} {branch}")
-            if not dry_run:
-                git_adapter.push_branch(repo_dir=repo_dir, remote=remote_name, branch=branch)
-            if not no_tag:
-                actions.append(f"git push {remote_name} {tag}")
-                if not dry_run:
-                    git_adapter.push_tag(repo_dir=repo_dir, remote=remote_name, tag=tag)
+            if checkpoint is None:
+                wal.begin(
+                    version=version,
+                    tag=tag,
+                    head=git_adapter.resolve_commit(repo_dir=repo_dir, ref="HEAD"),
+                    changelog_path=str(changelog_path),
+                    changelog_existed_before=changelog_existed_before,
+                    changelog_before=changelog_before,
+                )
+            save_checkpoint(repo_dir, plan=plan, rc=rc, tasks=evidence)
+        task_runs.extend(run_dag(tasks, workers=len(tasks), on_done=advance))
+        if not dry_run:
+            wal.clear()
+            clear_checkpoint(repo_dir)
     except Exception as exc:
         if not dry_run:
             # Compensating rollback for partial execution.
@@ -293,6 +717,13 @@ def release(
                 if a.exists():
                     a.unlink()
                     rollback_actions.append(f"deleted artifact {a}")
+            leftover_tag = checkpoint is not None and not tag_created and not no_tag
+            if leftover_tag and tag in git_adapter.tag_refs(repo_dir=repo_dir):
+                # left by the interrupted run; `arm recover` still needs the WAL to undo it
+                rollback_actions.append(f"failed deleting tag {tag}: not created by this run")
+            if not any(a.startswith("failed") for a in rollback_actions):
+                wal.clear()
+                clear_checkpoint(repo_dir)
         typer.echo(
             json.dumps(
                 {
@@ -307,42 +738,273 @@ def release(
         )
         raise typer.Exit(code=1)
 
+    result = {
+        "current_version": plan["current_version"],
+        "next_version": version,
+        "bump": plan["bump"],
+        "reason": plan["reason"],
+        "tag": None if no_tag else tag,
+        "dry_run": dry_run,
+        "remote_safe": remote_safe_effective,
+        "actions": actions,
+        "artifacts": [str(a) for a in artifacts],
+    }
+    if not dry_run:
+        metrics.inc("arm_releases", bump=plan["bump"])
+    if checkpoint is not None:
+        result["resumed"] = [name for name, _, _ in steps if name in resumed]
+    if stats is not None:
+        result["diff_stats"] = stats_json(stats, depth=diff_scope_depth, files=stats_mode == "files")
+    elif plan.get("diff_stats"):
+        result["diff_stats"] = plan["diff_stats"]
+    if push_results:
+        result["push"] = [asdict(r) for r in push_results]
+        result["push_quorum"] = {"required": required, "succeeded": sum(r.ok for r in push_results)}
+    typer.echo(json.dumps(result, indent=2, default=str))
+    if push_results and not quorum_met(push_results, quorum):
+        # already published on some remotes, so the release stands; rerun the failed pushes
+        typer.echo(f"Push quorum not met: {required} remote(s) required.", err=True)
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def package(
+    ctx: typer.Context,
+    ref: str | None = typer.Option(None, "--ref", help="Package this commit or tag's tree (no checkout)"),
+    project_name: str = typer.Option("project", "--project-name"),
+    version: str | None = typer.Option(None, "--version", help="Default: --ref without --tag-prefix"),
+    tag_prefix: str = typer.Option("v", "--tag-prefix"),
+    package_workers: int | None = typer.Option(None, "--package-workers"),
+    package_source: str | None = typer.Option(None, "--package-source"),
+    incremental: bool | None = typer.Option(None, "--incremental/--no-incremental"),
+    formats: list[str] = typer.Option([], "--format"),
+) -> None:
+    repo_dir: Path = ctx.obj["repo_dir"]
+    if version is None:
+        if ref is None:
+            typer.echo("--version is required without --ref.", err=True)
+            raise typer.Exit(code=2)
+        version = ref[len(tag_prefix):] if ref.startswith(tag_prefix) else ref
+    spec = _package_spec(
+        ctx.obj["config"].package,
+        repo_dir=repo_dir,
+        project_name=project_name,
+        version=version,
+        workers=package_workers,
+        source="tree" if ref else package_source,
+        ref=ref or "HEAD",
+        incremental=incremental,
+        formats=formats,
+    )
+    started = time.monotonic()
+    try:
+        result = build_package(spec)
+    except (GitError, ValueError) as exc:
+        typer.echo(str(exc), err=True)
+        raise typer.Exit(code=1)
+    _observe_package(ctx.obj["metrics"], result, time.monotonic() - started)
     typer.echo(
         json.dumps(
             {
-                "current_version": str(current),
-                "next_version": str(next_v),
-                "bump": decision.bump,
-                "reason": decision.reason,
-                "tag": None if no_tag else tag,
-                "dry_run": dry_run,
-                "remote_safe": remote_safe_effective,
-                "actions": actions,
-                "artifacts": [str(a) for a in artifacts],
+                "artifacts": [str(a) for a in result.artifacts],
+                "files": len(result.files),
+                "reused": result.reused,
+                "cached": result.cached,
             },
             indent=2,
-            default=str,
         )
     )
 
 
+@app.command()
+def verify(
+    ctx: typer.Context,
+    artifacts: list[Path] = typer.Argument(..., help="Artifacts in dist/ to check against their manifest"),
+    deep: bool = typer.Option(False, "--deep", help="Also decompress every entry and compare SHA-256"),
+    workers: int = typer.Option(0, "--workers", help="Decompression threads for --deep (0 = cpu count)"),
+) -> None:
+    repo_dir: Path = ctx.obj["repo_dir"]
+    results = [
+        verify_artifact(a.resolve(), repo_dir=repo_dir, deep=deep, workers=_workers(workers, 0))
+        for a in artifacts
+    ]
+    typer.echo(
+        json.dumps(
+            [
+                {"artifact": str(r.artifact), "entries": r.entries, "deep": r.deep, "ok": r.ok, "problems": r.problems}
+                for r in results
+            ],
+            indent=2,
+        )
+    )
+    if not all(r.ok for r in results):
+        raise typer.Exit(code=1)
+
+
 @app.command()
 def rollback(
     ctx: typer.Context,
     dry_run: bool = typer.Option(False, "--dry-run"),
     hard: bool = typer.Option(False, "--hard"),
     keep_artifacts: bool = typer.Option(False, "--keep-artifacts"),
+    version: str | None = typer.Option(None, "--version", help="Roll back this release instead of the latest"),
+    steps: int = typer.Option(1, "--steps", help="Roll back the Nth most recent release (1 = latest)"),
 ) -> None:
     repo_dir: Path = ctx.obj["repo_dir"]
-    tx = read_last_release(repo_dir=repo_dir)
-    res = rollback_last_release(repo_dir=repo_dir, tx=tx, dry_run=dry_run, hard=hard, keep_artifacts=keep_artifacts)
+    journal = ReleaseJournal(repo_dir)
+    try:
+        seq, tx = journal.find_release(version=version, steps=steps)
+        latest = seq == journal.find_release()[0]
+        res = rollback_release(
+            repo_dir=repo_dir, tx=tx, dry_run=dry_run, hard=hard, keep_artifacts=keep_artifacts, latest=latest
+        )
+    except (LookupError, ValueError) as exc:
+        typer.echo(str(exc), err=True)
+        raise typer.Exit(code=1)
+    except RollbackError as exc:
+        # the release commit is undone first, so anything done already makes the release dead
+        if exc.done:
+            journal.append_rollback(seq, actions=[*exc.done, f"failed: {exc}"])
+        typer.echo(str(exc), err=True)
+        raise typer.Exit(code=1)
     if not dry_run:
-        # best-effort cleanup of tx log
+        journal.append_rollback(seq, actions=res.actions)
+    typer.echo(json.dumps({"dry_run": dry_run, "version": tx.version, "actions": res.actions}, indent=2))
+
+
+@app.command()
+def recover(
+    ctx: typer.Context,
+    dry_run: bool = typer.Option(False, "--dry-run"),
+) -> None:
+    try:
+        res = recover_release(repo_dir=ctx.obj["repo_dir"], dry_run=dry_run)
+    except GitError as exc:
+        typer.echo(str(exc), err=True)
+        raise typer.Exit(code=1)
+    typer.echo(json.dumps({"dry_run": dry_run, "outcome": res.outcome, "actions": res.actions}, indent=2))
+
+
+@app.command()
+def journal(
+    ctx: typer.Context,
+    limit: int = typer.Option(20, "--limit", help="Newest records to show (0 = all)"),
+) -> None:
+    log = ReleaseJournal(ctx.obj["repo_dir"])
+    records = []
+    for e in log.entries_newest_first():
+        if limit and len(records) >= limit:
+            break
+        records.append(log.read(e))
+    typer.echo(json.dumps(records, indent=2))
+
+
+@app.command()
+def watch(
+    ctx: typer.Context,
+    level: str = typer.Option("auto", "--level"),
+    tag_prefix: str = typer.Option("v", "--tag-prefix"),
+    initial_version: str = typer.Option(None, "--initial-version"),
+    poll: bool = typer.Option(False, "--poll", help="Poll ref files instead of using inotify"),
+    interval: float = typer.Option(0.05, "--interval", help="Polling interval in seconds"),
+    max_updates: int = typer.Option(0, "--max-updates", help="Exit after this many JSON lines (0 = never)"),
+    history_mode: str | None = typer.Option(
+        None, "--history-mode", help="all, first-parent or merges-only (default: history_mode from arm.toml)"
+    ),
+) -> None:
+    repo_dir: Path = ctx.obj["repo_dir"]
+    planner = IncrementalPlanner(
+        repo_dir,
+        policy=ctx.obj["config"].policy,
+        tag_prefix=tag_prefix,
+        initial_version=initial_version,
+        forced=_level_to_bump(level),
+        history_mode=_history_mode(history_mode, ctx.obj["config"].policy),
+    )
+    try:
+        watcher = RefWatcher(repo_dir, poll_interval=interval, force_poll=poll)
+    except FileNotFoundError as exc:
+        typer.echo(str(exc), err=True)
+        raise typer.Exit(code=1)
+    emitted = 0
+    with watcher:
+        try:
+            # the first refresh runs after the watch is armed, so no commit slips in between
+            while True:
+                update = planner.refresh()
+                if update is not None:
+                    typer.echo(json.dumps({**asdict(update), "watcher": watcher.backend}))
+                    sys.stdout.flush()
+                    emitted += 1
+                    if max_updates and emitted >= max_updates:
+                        return
+                watcher.wait()
+        except KeyboardInterrupt:
+            return
+
+
+def _invoke(command: typer.core.TyperGroup, argv: list[str], session: BatchSession) -> int:
+    try:
+        code = command.main(args=argv, prog_name="arm", standalone_mode=False, obj={"batch": session})
+    except Exception as exc:
+        # usage errors carry their own exit code and message; anything else is a crash
+        code = getattr(exc, "exit_code", 1)
+        format_message = getattr(exc, "format_message", None)
+        typer.echo(format_message() if format_message else f"{type(exc).__name__}: {exc}", err=True)
+    return code if isinstance(code, int) else 0
+
+
+@app.command()
+def batch(ctx: typer.Context) -> None:
+    session = BatchSession()
+    command = typer.main.get_command(app)
+    index = 0
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request: object = None
         try:
-            (repo_dir / ".arm" / "last_release.json").unlink()
-        except FileNotFoundError:
-            pass
-    typer.echo(json.dumps({"dry_run": dry_run, "actions": res.actions}, indent=2))
+            request = json.loads(line)
+            argv = batch_argv(request)
+        except ValueError as exc:
+            result = batch_result(index, request, 2, "", str(exc))
+        else:
+            out, err = io.StringIO(), io.StringIO()
+            with redirect_stdout(out), redirect_stderr(err):
+                code = _invoke(command, argv, session)
+            result = batch_result(index, request, code, out.getvalue(), err.getvalue())
+        typer.echo(json.dumps(result, default=str))
+        sys.stdout.flush()
+        index += 1
+
+
+@changelog_app.command("rebuild")
+def changelog_rebuild(
+    ctx: typer.Context,
+    dry_run: bool = typer.Option(False, "--dry-run"),
+    tag_prefix: str = typer.Option("v", "--tag-prefix"),
+    workers: int = typer.Option(0, "--workers", help="Render processes (0 = cpu count)"),
+) -> None:
+    repo_dir: Path = ctx.obj["repo_dir"]
+    releases = []
+    for t in git_adapter.list_tags(repo_dir=repo_dir, tag_prefix=tag_prefix):
+        try:
+            releases.append((SemVer.parse(t.name[len(tag_prefix):]), t))
+        except ValueError:
+            continue
+    releases.sort(key=lambda r: (r[0].major, r[0].minor, r[0].patch))
+    ranges = git_adapter.tag_range_commits(repo_dir=repo_dir, tags=[t for _, t in releases])
+    content = rebuild_changelog(
+        [(v, commits, date.fromisoformat(d)) for (v, _), (commits, d) in zip(releases, ranges)],
+        workers=workers,
+    )
+    if dry_run:
+        typer.echo(content, nl=False)
+        return
+    changelog_path = repo_dir / "CHANGELOG.md"
+    changelog_path.write_text(content, encoding="utf-8")
+    ctx.obj["metrics"].inc("arm_changelog_bytes_written", len(content.encode("utf-8")))
+    typer.echo(json.dumps({"path": str(changelog_path), "sections": len(releases)}, indent=2))
 
 
 if __name__ == "__main__":
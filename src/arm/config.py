@@ -18,7 +18,16 @@ class ReleasePolicy:
     fail_on_dirty: bool = True
     allowed_branches: set[str] = field(default_factory=set)  # empty = allow all
     remote_safe_default: bool = True
-    default_remote: str = "origin"
+    default_remotes: tuple[str, ...] = ("origin",)  # primary first, then mirrors
+    push_quorum: int = 0  # remotes that must accept a push, 0 = all
+    push_workers: int = 4
+    history_mode: str = "all"  # all|first-parent|merges-only
+    notes_cache: bool = False  # share validation verdicts through git notes
+    notes_ref: str = "refs/notes/arm"
+
+    @property
+    def default_remote(self) -> str:
+        return self.default_remotes[0]
 
     def normalize_behavior(self) -> str:
         b = self.unknown_type_behavior.strip().lower()
@@ -26,6 +35,12 @@ class ReleasePolicy:
             return "patch"
         return b
 
+    def normalize_history_mode(self) -> str:
+        m = self.history_mode.strip().lower()
+        if m not in {"all", "first-parent", "merges-only"}:
+            return "all"
+        return m
+
     def forced_bump(self, level: str) -> BumpType | None:
         level = (level or "auto").strip().lower()
         if level == "auto":
@@ -33,9 +48,28 @@ class ReleasePolicy:
         return BumpType(level)
 
 
+@dataclass(frozen=True, slots=True)
+class PackageConfig:
+    workers: int = 1  # 0 = cpu count
+    source: str = "walk"  # walk|git
+    include_untracked: bool = False
+    incremental: bool = True  # reuse unchanged entries of the previous artifact
+    formats: tuple[str, ...] = ("zip",)  # zip, tar.gz, tar.xz, sha256sums
+    compression: str = "adaptive"  # adaptive|legacy
+    store: bool = True  # content-addressed artifact store under .arm/store
+    store_max_mb: int = 2048
+
+
+@dataclass(frozen=True, slots=True)
+class MetricsConfig:
+    textfile: str | None = None  # OpenMetrics file for node-exporter's textfile collector
+
+
 @dataclass(frozen=True, slots=True)
 class AppConfig:
     policy: ReleasePolicy
+    package: PackageConfig = field(default_factory=PackageConfig)
+    metrics: MetricsConfig = field(default_factory=MetricsConfig)
 
 
 def _read_toml(path: Path) -> dict:
@@ -44,6 +78,12 @@ def _read_toml(path: Path) -> dict:
     return tomllib.loads(path.read_text(encoding="utf-8"))
 
 
+def _remotes(value: object) -> tuple[str, ...]:
+    # default_remote is a name or a list of names
+    names = [str(v) for v in value] if isinstance(value, list) else [str(value)]
+    return tuple(dict.fromkeys(n for n in names if n)) or ("origin",)
+
+
 def load_config(config_path: str | None) -> AppConfig:
     path = Path(config_path).resolve() if config_path else Path("arm.toml").resolve()
     data = _read_toml(path)
@@ -62,6 +102,24 @@ def load_config(config_path: str | None) -> AppConfig:
         if isinstance(pol.get("allowed_branches", []), list)
         else set(),
         remote_safe_default=bool(pol.get("remote_safe_default", True)),
-        default_remote=str(pol.get("default_remote", "origin")),
+        default_remotes=_remotes(pol.get("default_remote", "origin")),
+        push_quorum=int(pol.get("push_quorum", 0)),
+        push_workers=int(pol.get("push_workers", 4)),
+        history_mode=str(pol.get("history_mode", "all")),
+        notes_cache=bool(pol.get("notes_cache", False)),
+        notes_ref=str(pol.get("notes_ref", "refs/notes/arm")),
+    )
+    pkg = (data.get("package") or {}) if isinstance(data, dict) else {}
+    package = PackageConfig(
+        workers=int(pkg.get("workers", 1)),
+        source=str(pkg.get("source", "walk")),
+        include_untracked=bool(pkg.get("include_untracked", False)),
+        incremental=bool(pkg.get("incremental", True)),
+        formats=tuple(pkg.get("formats", ["zip"])) if isinstance(pkg.get("formats", []), list) else ("zip",),
+        compression=str(pkg.get("compression", "adaptive")),
+        store=bool(pkg.get("store", True)),
+        store_max_mb=int(pkg.get("store_max_mb", 2048)),
     )
-    return AppConfig(policy=policy)
+    met = (data.get("metrics") or {}) if isinstance(data, dict) else {}
+    metrics = MetricsConfig(textfile=str(met["textfile"]) if met.get("textfile") else None)
+    return AppConfig(policy=policy, package=package, metrics=metrics)
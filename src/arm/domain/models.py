@@ -45,6 +45,7 @@ class Commit:
     sha: str
     subject: str
     body: str
+    merge: bool = False  # more than one parent
 
 
 @dataclass(frozen=True, slots=True)
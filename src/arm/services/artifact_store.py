@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import errno
+import os
+import shutil
+import sys
+from pathlib import Path
+
+# Content-addressed store: <root>/<key>/<file>, one directory per package key. A key
+# directory's mtime is its last use, which drives LRU garbage collection.
+
+_FICLONE = 0x40049409  # linux ioctl: share extents (reflink) between two files
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    if not sys.platform.startswith("linux"):
+        return False
+    import fcntl
+
+    with src.open("rb") as s, dst.open("wb") as d:
+        try:
+            fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+            return True
+        except OSError:
+            pass
+    dst.unlink(missing_ok=True)
+    return False
+
+
+def link_or_copy(src: Path, dst: Path) -> None:
+    # hardlink, else reflink, else a plain copy; dst is replaced atomically
+    tmp = dst.with_name(dst.name + ".link")
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(src, tmp)
+    except OSError as exc:
+        if exc.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP):
+            raise
+        if not _reflink(src, tmp):
+            shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+
+class ArtifactStore:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def get(self, key: str) -> Path | None:
+        d = self.root / key
+        if not d.is_dir():
+            return None
+        os.utime(d)
+        return d
+
+    def put(self, key: str, files: list[Path]) -> Path:
+        final = self.root / key
+        if final.is_dir():
+            os.utime(final)
+            return final
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.root / f".{key}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir()
+        for f in files:
+            link_or_copy(f, tmp / f.name)
+        try:
+            os.rename(tmp, final)
+        except OSError:
+            # another run stored the same key first; its content is identical
+            shutil.rmtree(tmp, ignore_errors=True)
+        return final
+
+    def discard(self, key: str) -> None:
+        shutil.rmtree(self.root / key, ignore_errors=True)
+
+    def gc(self, max_bytes: int, *, keep: str | None = None) -> list[str]:
+        # evict least recently used keys until the store fits; `keep` is never evicted
+        if not self.root.is_dir():
+            return []
+        entries = []
+        total = 0
+        for d in self.root.iterdir():
+            if not d.is_dir() or d.name.startswith("."):
+                continue
+            size = sum(f.stat().st_size for f in d.iterdir())
+            total += size
+            if d.name != keep:
+                entries.append((d.stat().st_mtime, size, d))
+        removed: list[str] = []
+        for _, size, d in sorted(entries):
+            if total <= max_bytes:
+                break
+            shutil.rmtree(d, ignore_errors=True)
+            total -= size
+            removed.append(d.name)
+        return removed
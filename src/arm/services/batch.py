@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from arm.services.repo_cache import ConfigCache, RepoCache
+
+# `arm batch` reads one command per JSON line, e.g.
+#   {"cmd": "plan", "repo": "/src/app", "args": {"json": true, "tag_prefix": "v"}}
+# and runs it in the same process, so interpreter startup, CLI setup, config parsing,
+# tag lookups and commit parsing are paid once per repo state instead of once per command.
+
+
+class BatchError(ValueError):
+    pass
+
+
+class BatchSession:
+    # caches shared by every command of one batch
+    def __init__(self) -> None:
+        self.configs = ConfigCache()
+        self._repos: dict[Path, RepoCache] = {}
+
+    def repo_cache(self, repo_dir: Path) -> RepoCache:
+        return self._repos.setdefault(repo_dir, RepoCache(repo_dir))
+
+
+def _option(name: str) -> str:
+    return "--" + name.replace("_", "-")
+
+
+def batch_argv(request: dict) -> list[str]:
+    # Global options (repo, config) go before the command. Dict args become options: true
+    # adds a flag (use "no_incremental": true for --no-incremental), false/null are
+    # omitted, lists repeat the option; a list of strings is passed through as argv.
+    if not isinstance(request, dict) or not isinstance(request.get("cmd"), str) or not request["cmd"].strip():
+        raise BatchError('each line needs a "cmd" string')
+    cmd = request["cmd"].split()
+    if cmd[0] == "batch":
+        raise BatchError("batch cannot be nested")
+    argv: list[str] = []
+    for key in ("repo", "config", "metrics_file"):
+        if request.get(key) is not None:
+            argv += [_option(key), str(request[key])]
+    argv += cmd
+    args = request.get("args", {})
+    if isinstance(args, list) and all(isinstance(a, str) for a in args):
+        return argv + args
+    if not isinstance(args, dict):
+        raise BatchError('"args" must be an object or a list of strings')
+    for name, value in args.items():
+        if name == "_":
+            argv += [str(v) for v in (value if isinstance(value, list) else [value])]  # positionals
+        elif value is True:
+            argv.append(_option(name))
+        elif value is False or value is None:
+            continue
+        elif isinstance(value, list):
+            for v in value:
+                argv += [_option(name), str(v)]
+        else:
+            argv += [_option(name), str(value)]
+    return argv
+
+
+def batch_result(index: int, request: object, exit_code: int, stdout: str, stderr: str) -> dict:
+    out: dict = {"index": index, "cmd": request.get("cmd") if isinstance(request, dict) else None}
+    if isinstance(request, dict) and "id" in request:
+        out["id"] = request["id"]  # echoed so callers can correlate without counting lines
+    out["exit_code"] = exit_code
+    try:
+        out["result"] = json.loads(stdout)
+    except ValueError:
+        out["stdout"] = stdout
+    if stderr:
+        out["stderr"] = stderr
+    return out
@@ -1,12 +1,21 @@
 from __future__ import annotations
 
+import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date
 
-from arm.domain.models import ConventionalCommit, SemVer
+from arm.domain.models import Commit, ConventionalCommit, SemVer
+from arm.services.conventional_commits import validate_commits
 
 
-def render_release_section(version: SemVer, commits: list[ConventionalCommit]) -> str:
-    d = date.today().isoformat()
+def render_release_section(
+    version: SemVer,
+    commits: list[ConventionalCommit],
+    *,
+    release_date: date | None = None,
+    diff_summary: list[str] | None = None,
+) -> str:
+    d = (release_date or date.today()).isoformat()
     lines: list[str] = []
     lines.append(f"## {version} - {d}")
 
@@ -29,6 +38,8 @@ def render_release_section(version: SemVer, commits: list[ConventionalCommit]) -
     add_group("Features", feats)
     add_group("Fixes", fixes)
     add_group("Other", other)
+    if diff_summary:
+        lines += ["", "### Diff Stats", *diff_summary]
 
     lines.append("")
     return "\n".join(lines)
@@ -42,3 +53,23 @@ def prepend_changelog(existing: str | None, new_section: str) -> str:
         rest = existing.split("\n", 1)[1].lstrip("\n") if "\n" in existing else ""
         return header + new_section.rstrip() + "\n\n" + rest
     return header + new_section.rstrip() + "\n\n" + existing
+
+
+def _render_historical(item: tuple[SemVer, list[Commit], date]) -> str:
+    version, commits, release_date = item
+    parsed, _ = validate_commits(commits)
+    # release commits are created after the section was rendered originally
+    parsed = [c for c in parsed if not (c.type == "chore" and c.scope == "release")]
+    return render_release_section(version, parsed, release_date=release_date)
+
+
+def rebuild_changelog(releases: list[tuple[SemVer, list[Commit], date]], *, workers: int = 0) -> str:
+    # releases ordered oldest first; output matches prepending each section in turn
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(releases) < 2:
+        sections = [_render_historical(r) for r in releases]
+    else:
+        chunksize = max(1, len(releases) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            sections = list(ex.map(_render_historical, releases, chunksize=chunksize))
+    return "# Changelog\n\n" + "".join(s.rstrip() + "\n\n" for s in reversed(sections))
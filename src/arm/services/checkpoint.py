@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from arm.adapters.git import GitError, is_ancestor, resolve_commit
+from arm.services.transaction_log import read_last_release
+from arm.services.verify import file_sha256
+from arm.workflow.state_machine import ReleaseContext, ReleaseEvent, ReleaseState
+
+# .arm/checkpoint.json is rewritten (atomically) after every finished release task and
+# state transition. It holds the release plan, the state machine, and per-task evidence
+# that lets `release --resume` confirm the task's effect is still in place.
+
+
+@dataclass(frozen=True, slots=True)
+class Checkpoint:
+    plan: dict  # everything release decided before its first side effect
+    state: ReleaseState
+    events: list[ReleaseEvent]
+    tasks: dict[str, dict] = field(default_factory=dict)  # finished task -> evidence
+
+
+def checkpoint_path(repo_dir: Path) -> Path:
+    return repo_dir / ".arm" / "checkpoint.json"
+
+
+def save_checkpoint(repo_dir: Path, *, plan: dict, rc: ReleaseContext, tasks: dict[str, dict]) -> None:
+    path = checkpoint_path(repo_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {"plan": plan, "state": rc.state.value, "events": [asdict(e) for e in rc.events], "tasks": tasks}
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as fh:
+        json.dump(data, fh, default=str)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+
+
+def load_checkpoint(repo_dir: Path) -> Checkpoint | None:
+    try:
+        data = json.loads(checkpoint_path(repo_dir).read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return None
+    events = [
+        ReleaseEvent(**{**e, "from_state": ReleaseState(e["from_state"]), "to_state": ReleaseState(e["to_state"])})
+        for e in data["events"]
+    ]
+    return Checkpoint(plan=data["plan"], state=ReleaseState(data["state"]), events=events, tasks=data["tasks"])
+
+
+def clear_checkpoint(repo_dir: Path) -> None:
+    checkpoint_path(repo_dir).unlink(missing_ok=True)
+
+
+def _holds(repo_dir: Path, plan: dict, name: str, evidence: dict) -> bool:
+    try:
+        match name:
+            case "changelog":
+                return file_sha256(Path(plan["changelog_path"])) == evidence["sha256"]
+            case "commit":
+                sha = evidence.get("sha")
+                return sha is None or is_ancestor(repo_dir=repo_dir, ancestor=sha, ref="HEAD")
+            case "tag":
+                target = evidence.get("target")
+                return target is None or resolve_commit(repo_dir=repo_dir, ref=f"refs/tags/{plan['tag']}") == target
+            case "package":
+                return all(file_sha256(Path(a)) == h for a, h in evidence["artifacts"].items())
+            case "journal":
+                return read_last_release(repo_dir=repo_dir).version == plan["next_version"]
+            case _:
+                return True
+    except (FileNotFoundError, GitError, KeyError):
+        return False
+
+
+def completed_tasks(repo_dir: Path, cp: Checkpoint, deps: dict[str, tuple[str, ...]]) -> set[str]:
+    # Finished tasks whose effect still checks out against the repo; a task also has to be
+    # rerun when anything it depends on is.
+    good: set[str] = set()
+    remaining = dict(deps)
+    while remaining:
+        progressed = False
+        for name, d in list(remaining.items()):
+            if all(x not in remaining for x in d):
+                del remaining[name]
+                progressed = True
+                if name in cp.tasks and set(d) <= good and _holds(repo_dir, cp.plan, name, cp.tasks[name]):
+                    good.add(name)
+        if not progressed:
+            break
+    return good
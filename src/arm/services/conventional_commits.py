@@ -6,6 +6,11 @@ from dataclasses import dataclass
 from arm.domain.models import Commit, ConventionalCommit
 
 
+# Bump whenever a commit could be parsed differently: verdicts cached under another version
+# (see verdict_notes) are then ignored.
+PARSER_VERSION = 1
+
+
 @dataclass(frozen=True, slots=True)
 class ConventionalCommitError:
     sha: str
@@ -33,17 +38,45 @@ def parse_conventional_subject(subject: str) -> ConventionalCommit | None:
     return ConventionalCommit(type=typ, scope=scope, description=desc, breaking=breaking)
 
 
+# subjects git and forges generate for merges; they say nothing about the change
+_MERGE_SUBJECT_RE = re.compile(r"^Merge (branch|branches|remote-tracking branch|tag|commit|pull request|PR) ")
+
+
+def _merge_description(c: Commit) -> ConventionalCommit | None:
+    # A merge on the mainline describes its branch: by a conventional subject, or, under a
+    # generated "Merge pull request ..." subject, by the first body line (the PR title).
+    parsed = parse_conventional_subject(c.subject)
+    if parsed or not _MERGE_SUBJECT_RE.match(c.subject):
+        return parsed
+    first = next((line for line in c.body.splitlines() if line.strip()), "")
+    return parse_conventional_subject(first)
+
+
 def has_breaking_footer(body: str) -> bool:
     # Conventional Commits: footer token "BREAKING CHANGE:" or "BREAKING-CHANGE:"
     b = body or ""
     return ("BREAKING CHANGE:" in b) or ("BREAKING-CHANGE:" in b)
 
 
-def validate_commits(commits: list[Commit]) -> tuple[list[ConventionalCommit], list[ConventionalCommitError]]:
+def validate_commits(
+    commits: list[Commit], *, history_mode: str = "all"
+) -> tuple[list[ConventionalCommit], list[ConventionalCommitError]]:
+    # history_mode "all" validates every commit as written; the first-parent modes only see
+    # mainline commits, so merges are read for the description of the branch they bring in.
     ok: list[ConventionalCommit] = []
     errs: list[ConventionalCommitError] = []
     for c in commits:
-        parsed = parse_conventional_subject(c.subject)
+        if c.merge and history_mode != "all":
+            parsed = _merge_description(c)
+            if not parsed:
+                errs.append(
+                    ConventionalCommitError(
+                        sha=c.sha, subject=c.subject, reason="Merge without a conventional subject or PR title"
+                    )
+                )
+                continue
+        else:
+            parsed = parse_conventional_subject(c.subject)
         if not parsed:
             errs.append(ConventionalCommitError(sha=c.sha, subject=c.subject, reason="Non-conventional subject"))
             continue
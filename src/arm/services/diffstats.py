@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+from arm.adapters.git import FileStat, empty_tree, iter_numstat, resolve_commit
+
+# Per-release diff statistics, streamed from `git diff --numstat -z` and cached in
+# .arm/cache/diffstat/ by (from SHA, to SHA): a commit range never changes, so a plan that is
+# re-run, or the release that follows it, never diffs the same range twice.
+
+_CACHE_FORMAT = 1
+
+
+@dataclass(frozen=True, slots=True)
+class DiffStats:
+    from_sha: str
+    to_sha: str
+    files: list[FileStat]
+    cached: bool = False
+
+    def totals(self) -> dict[str, int]:
+        return {
+            "files": len(self.files),
+            "insertions": sum(f.added or 0 for f in self.files),
+            "deletions": sum(f.deleted or 0 for f in self.files),
+            "binary": sum(f.added is None for f in self.files),
+        }
+
+    def by_scope(self, *, depth: int = 1) -> dict[str, dict[str, int]]:
+        # scope = the first `depth` directories of the path; files above that depth are "."
+        scopes: dict[str, dict[str, int]] = {}
+        for f in self.files:
+            parts = f.path.split("/")[:-1][:depth]
+            s = scopes.setdefault("/".join(parts) or ".", {"files": 0, "insertions": 0, "deletions": 0})
+            s["files"] += 1
+            s["insertions"] += f.added or 0
+            s["deletions"] += f.deleted or 0
+        return dict(sorted(scopes.items(), key=lambda kv: (-(kv[1]["insertions"] + kv[1]["deletions"]), kv[0])))
+
+
+def _cache_path(repo_dir: Path, from_sha: str, to_sha: str) -> Path:
+    return repo_dir / ".arm" / "cache" / "diffstat" / f"{from_sha}..{to_sha}.json"
+
+
+def _load(path: Path) -> list[FileStat] | None:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return None
+    if data.get("format") != _CACHE_FORMAT:
+        return None
+    return [FileStat(path=p, added=a, deleted=d) for p, a, d in data["files"]]
+
+
+def _store(path: Path, files: list[FileStat]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {"format": _CACHE_FORMAT, "files": [[f.path, f.added, f.deleted] for f in files]}
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as fh:
+        json.dump(data, fh, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def diff_stats(*, repo_dir: Path, from_ref: str | None, to_ref: str, cache: bool = True) -> DiffStats:
+    # from_ref None diffs against the empty tree (first release)
+    from_sha = resolve_commit(repo_dir=repo_dir, ref=from_ref) if from_ref else empty_tree(repo_dir=repo_dir)
+    to_sha = resolve_commit(repo_dir=repo_dir, ref=to_ref)
+    path = _cache_path(repo_dir, from_sha, to_sha)
+    if cache and (files := _load(path)) is not None:
+        return DiffStats(from_sha=from_sha, to_sha=to_sha, files=files, cached=True)
+    files = list(iter_numstat(repo_dir=repo_dir, from_sha=from_sha, to_sha=to_sha))
+    if cache:
+        _store(path, files)
+    return DiffStats(from_sha=from_sha, to_sha=to_sha, files=files)
+
+
+def stats_json(stats: DiffStats, *, depth: int = 1, files: bool = False) -> dict:
+    out: dict = {
+        "from": stats.from_sha,
+        "to": stats.to_sha,
+        "cached": stats.cached,
+        **stats.totals(),
+        "scopes": stats.by_scope(depth=depth),
+    }
+    if files:
+        out["per_file"] = [{"path": f.path, "insertions": f.added, "deletions": f.deleted} for f in stats.files]
+    return out
+
+
+def summary_lines(stats: DiffStats, *, depth: int = 1, top: int = 10) -> list[str]:
+    # changelog bullets: the totals, then the busiest scopes
+    t = stats.totals()
+    lines = [f"- {t['files']} files changed, +{t['insertions']} -{t['deletions']}"]
+    scopes = list(stats.by_scope(depth=depth).items())
+    for name, s in scopes[:top]:
+        lines.append(f"- `{name}`: {s['files']} files, +{s['insertions']} -{s['deletions']}")
+    if len(scopes) > top:
+        lines.append(f"- {len(scopes) - top} more scopes")
+    return lines
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+# Exclude globs use gitignore-style semantics:
+#   - a pattern without "/" (other than a trailing one) matches at any depth: "*.pyc"
+#   - a pattern containing "/" is anchored at the repo root: "docs/build/*"
+#   - "*" and "?" never cross "/", "**" does ("a/**/b", "**/tmp", "out/**")
+#   - a trailing "/" matches directories only, a leading "!" re-includes
+#   - the last matching pattern wins; nothing below an excluded directory is re-included
+# For compatibility with the earlier fnmatch matcher, "dir/*" and "dir/**" also match a
+# *file* named "dir" (e.g. the ".git" file of a worktree).
+
+_MAX_DIR_CACHE = 200_000
+_PRUNE = "\0"
+
+
+@dataclass(frozen=True, slots=True)
+class _Pattern:
+    index: int  # position in the glob list; duplicates keep their own regex group
+    source: str
+    negate: bool
+    dir_only: bool
+    anchored: bool
+    body: str
+
+
+def _parse(glob: str, index: int) -> _Pattern:
+    negate = glob.startswith("!")
+    body = glob[1:] if negate else glob
+    dir_only = body.endswith("/")
+    body = body.rstrip("/")
+    anchored = "/" in body
+    return _Pattern(index=index, source=glob, negate=negate, dir_only=dir_only, anchored=anchored, body=body.lstrip("/"))
+
+
+def _translate(body: str) -> str:
+    out: list[str] = []
+    i, n = 0, len(body)
+    while i < n:
+        c = body[i]
+        if c == "*":
+            if body.startswith("**", i):
+                if i + 2 < n and body[i + 2] == "/":
+                    out.append("(?:.*/)?")
+                    i += 3
+                else:
+                    out.append(".*")
+                    i += 2
+                continue
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            start = i + 2 if body.startswith(("[!", "[^"), i) else i + 1
+            # a "]" right after "[" or "[!" is a member of the class, not its end
+            j = body.find("]", start + 1 if body[start : start + 1] == "]" else start)
+            if j < 0:
+                out.append(re.escape(c))
+            else:
+                members = body[start:j].replace("\\", "\\\\").replace("[", "\\[")
+                if members.startswith("]"):
+                    members = "\\" + members
+                out.append(("[^" if start > i + 1 else "[") + members + "]")
+                i = j
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(body[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def _pattern_regex(p: _Pattern, *, for_dir: bool) -> str:
+    body = p.body
+    self_match = "" if for_dir else "?"
+    if body.endswith("/**"):
+        rx = _translate(body[:-3]) + "(?:/.*)" + self_match
+    elif body.endswith("/*"):
+        rx = _translate(body[:-2]) + "(?:/[^/]*)" + self_match
+    else:
+        rx = _translate(body)
+    return rx if p.anchored else "(?:.*/)?" + rx
+
+
+def _literal_prefix(p: _Pattern) -> list[str] | None:
+    # Directory whose whole subtree the pattern excludes, if it is spelled literally.
+    body = p.body
+    for suffix in ("/**", "/*"):
+        if body.endswith(suffix):
+            body = body[: -len(suffix)]
+            break
+    if not p.anchored or not body or any(ch in body for ch in "*?[\\"):
+        return None
+    return body.split("/")
+
+
+class ExcludeMatcher:
+    def __init__(self, globs: tuple[str, ...]) -> None:
+        self.globs = globs
+        parsed = (_parse(g, i) for i, g in enumerate(globs) if not g.startswith("#"))
+        self._patterns = [p for p in parsed if p.body]
+        self._negated = {p.index for p in self._patterns if p.negate}
+        self._has_negation = bool(self._negated)
+        self._file_re = self._combine([p for p in self._patterns if not p.dir_only], for_dir=False)
+        self._dir_re = self._combine(self._patterns, for_dir=True)
+        self._dir_cache: dict[str, bool] = {}
+        # Literal anchored directories are pruned with a trie walk instead of regex matching.
+        # A later "!" pattern could re-include something below them, so only without negation.
+        self._trie: dict = {}
+        if not self._has_negation:
+            for p in self._patterns:
+                parts = _literal_prefix(p)
+                if parts is None:
+                    continue
+                node = self._trie
+                for part in parts:
+                    node = node.setdefault(part, {})
+                node[_PRUNE] = True
+
+    def _combine(self, patterns: list[_Pattern], *, for_dir: bool) -> re.Pattern[str] | None:
+        if not patterns:
+            return None
+        # Alternatives are tried in order, so listing them last-pattern-first makes the
+        # reported group the pattern gitignore semantics would pick.
+        alts = [f"(?P<p{p.index}>{_pattern_regex(p, for_dir=for_dir)})" for p in reversed(patterns)]
+        return re.compile("(?:" + "|".join(alts) + r")\Z", re.DOTALL)
+
+    def _match(self, rel: str, rx: re.Pattern[str] | None) -> bool:
+        if rx is None:
+            return False
+        m = rx.match(rel)
+        if m is None:
+            return False
+        if not self._has_negation:
+            return True
+        return int(m.lastgroup[1:]) not in self._negated
+
+    def _pruned(self, rel: str, *, is_dir: bool) -> bool:
+        node = self._trie
+        parts = rel.split("/")
+        for depth, part in enumerate(parts, 1):
+            node = node.get(part)
+            if node is None:
+                return False
+            if _PRUNE in node and (depth < len(parts) or is_dir):
+                return True
+        return False
+
+    def excludes_dir(self, rel: str) -> bool:
+        hit = self._dir_cache.get(rel)
+        if hit is not None:
+            return hit
+        parent = rel.rpartition("/")[0]
+        excluded = (
+            (bool(self._trie) and self._pruned(rel, is_dir=True))
+            or (bool(parent) and self.excludes_dir(parent))
+            or self._match(rel, self._dir_re)
+        )
+        if len(self._dir_cache) >= _MAX_DIR_CACHE:
+            self._dir_cache.clear()
+        self._dir_cache[rel] = excluded
+        return excluded
+
+    def excludes(self, rel: str, *, is_dir: bool = False) -> bool:
+        if is_dir:
+            return self.excludes_dir(rel)
+        parent = rel.rpartition("/")[0]
+        if parent and self.excludes_dir(parent):
+            return True
+        return self._match(rel, self._file_re)
+
+
+@lru_cache(maxsize=32)
+def compile_excludes(globs: tuple[str, ...]) -> ExcludeMatcher:
+    return ExcludeMatcher(globs)
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import fcntl
+import json
+import math
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+# Metrics are exported as an OpenMetrics textfile for node-exporter's textfile collector.
+# Counters and histograms accumulate across runs: the running totals live in a JSON
+# sidecar next to the textfile, and each run merges its own samples into it under an
+# exclusive flock before atomically replacing both files, so concurrent `arm` processes
+# never lose each other's updates or expose a half-written file.
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+_STATE_FORMAT = 1
+
+
+@dataclass(frozen=True, slots=True)
+class Family:
+    type: str  # counter|gauge|histogram
+    help: str
+    buckets: tuple[float, ...] = ()
+
+
+FAMILIES: dict[str, Family] = {
+    "arm_command_duration_seconds": Family("histogram", "Wall time of arm commands.", DURATION_BUCKETS),
+    "arm_git_calls": Family("counter", "git subprocesses started, by subcommand."),
+    "arm_git_duration_seconds": Family("histogram", "git subprocess latency, by subcommand.", DURATION_BUCKETS),
+    "arm_commits_parsed": Family("counter", "Conventional commits parsed."),
+    "arm_validation_errors": Family("counter", "Commits rejected by conventional-commit validation."),
+    "arm_releases": Family("counter", "Finished releases, by bump type."),
+    "arm_changelog_bytes_written": Family("counter", "Bytes of CHANGELOG.md written."),
+    "arm_artifact_bytes": Family("gauge", "Size of the last built artifact, by format."),
+    "arm_package_compression_ratio": Family("gauge", "Input bytes / zip bytes of the last package."),
+    "arm_package_throughput_bytes_per_second": Family("gauge", "Input bytes packaged per second, last build."),
+}
+
+
+def _key(labels: dict[str, str]) -> str:
+    return json.dumps(sorted(labels.items()), separators=(",", ":"))
+
+
+class MetricsRecorder:
+    # Samples observed by one arm process; merged into the textfile by write_textfile.
+    def __init__(self, **const_labels: str) -> None:
+        self.const_labels = const_labels
+        self.samples: dict[str, dict[str, object]] = {}
+        self._lock = threading.Lock()  # release tasks report from worker threads
+
+    def _slot(self, name: str, labels: dict[str, str]) -> tuple[dict[str, object], str]:
+        if name not in FAMILIES:
+            raise KeyError(f"unknown metric {name}")
+        return self.samples.setdefault(name, {}), _key({**self.const_labels, **labels})
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        with self._lock:
+            slot, key = self._slot(name, labels)
+            slot[key] = slot.get(key, 0) + value  # type: ignore[operator]
+
+    def set(self, name: str, value: float, **labels: str) -> None:
+        with self._lock:
+            slot, key = self._slot(name, labels)
+            slot[key] = value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        with self._lock:
+            slot, key = self._slot(name, labels)
+            h = slot.setdefault(key, {"buckets": [0] * len(FAMILIES[name].buckets), "sum": 0.0, "count": 0})
+            for i, bound in enumerate(FAMILIES[name].buckets):
+                if value <= bound:
+                    h["buckets"][i] += 1  # type: ignore[index]
+            h["sum"] += value  # type: ignore[index]
+            h["count"] += 1  # type: ignore[index]
+
+
+def _merge(state: dict[str, dict[str, object]], run: dict[str, dict[str, object]]) -> None:
+    for name, samples in run.items():
+        kind = FAMILIES[name].type
+        dest = state.setdefault(name, {})
+        for key, value in samples.items():
+            old = dest.get(key)
+            if kind == "gauge" or old is None:
+                dest[key] = value
+            elif kind == "counter":
+                dest[key] = old + value  # type: ignore[operator]
+            else:
+                dest[key] = {
+                    "buckets": [a + b for a, b in zip(old["buckets"], value["buckets"])],  # type: ignore[index]
+                    "sum": old["sum"] + value["sum"],  # type: ignore[index]
+                    "count": old["count"] + value["count"],  # type: ignore[index]
+                }
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(key: str, extra: tuple[str, str] | None = None) -> str:
+    items = [tuple(kv) for kv in json.loads(key)] + ([extra] if extra else [])
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+
+def _num(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_openmetrics(state: dict[str, dict[str, object]]) -> str:
+    lines: list[str] = []
+    for name in sorted(state):
+        fam = FAMILIES[name]
+        lines += [f"# TYPE {name} {fam.type}", f"# HELP {name} {fam.help}"]
+        for key, value in sorted(state[name].items()):
+            if fam.type == "counter":
+                lines.append(f"{name}_total{_labels(key)} {_num(value)}")  # type: ignore[arg-type]
+            elif fam.type == "gauge":
+                lines.append(f"{name}{_labels(key)} {_num(value)}")  # type: ignore[arg-type]
+            else:
+                # bucket counts are already cumulative: observe() counts a value in every bucket it fits
+                for bound, n in zip(fam.buckets, value["buckets"]):  # type: ignore[index]
+                    lines.append(f"{name}_bucket{_labels(key, ('le', _num(bound)))} {n}")
+                lines.append(f"{name}_bucket{_labels(key, ('le', '+Inf'))} {value['count']}")  # type: ignore[index]
+                lines.append(f"{name}_count{_labels(key)} {value['count']}")  # type: ignore[index]
+                lines.append(f"{name}_sum{_labels(key)} {_num(value['sum'])}")  # type: ignore[index]
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+def _replace(path: Path, text: str) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write(text)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.chmod(tmp, 0o644)  # readable by the exporter, not just this user
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def state_path(textfile: Path) -> Path:
+    return textfile.with_name(textfile.name + ".state.json")
+
+
+def write_textfile(path: Path, recorder: MetricsRecorder) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(path.name + ".lock"), "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            data = json.loads(state_path(path).read_text(encoding="utf-8"))
+            state = data["metrics"] if data.get("format") == _STATE_FORMAT else {}
+        except (FileNotFoundError, ValueError, KeyError):
+            state = {}
+        state = {name: samples for name, samples in state.items() if name in FAMILIES}
+        _merge(state, recorder.samples)
+        _replace(state_path(path), json.dumps({"format": _STATE_FORMAT, "metrics": state}))
+        _replace(path, render_openmetrics(state))
@@ -1,10 +1,82 @@
 from __future__ import annotations
 
-import fnmatch
+import gzip
+import hashlib
+import io
+import json
+import lzma
 import os
+import stat
+import sys
+import tarfile
 import zipfile
-from dataclasses import dataclass
+import zlib
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from functools import partial
 from pathlib import Path
+from typing import TypeVar
+
+from arm.adapters.git import commit_time, iter_blobs, ls_files, ls_tree, resolve_commit
+from arm.services.artifact_store import ArtifactStore, link_or_copy
+from arm.services.exclude import ExcludeMatcher, compile_excludes
+from arm.services.transaction_log import read_last_release
+from arm.services.zip_writer import ZIP_DEFLATED, ZIP_STORED, ZipEntry, ZipWriter, deflate, dos_date_time, read_raw_payload
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+_COMPRESSED_EXTENSIONS = frozenset(
+    {
+        ".7z", ".apk", ".avif", ".br", ".bz2", ".docx", ".ear", ".egg", ".gif", ".gz", ".heic", ".jar",
+        ".jpeg", ".jpg", ".lz4", ".lzma", ".mkv", ".mov", ".mp3", ".mp4", ".nupkg", ".ogg", ".png",
+        ".pptx", ".rar", ".tgz", ".war", ".webm", ".webp", ".whl", ".woff", ".woff2", ".xlsx", ".xz",
+        ".zip", ".zst",
+    }
+)
+
+
+@dataclass(frozen=True, slots=True)
+class CompressionPolicy:
+    stored_extensions: frozenset[str] = _COMPRESSED_EXTENSIONS
+    sample_bytes: int = 64 * 1024  # 0 disables sampling
+    min_saving: float = 0.05  # sample must shrink by at least this fraction at level 1
+    levels_by_size: tuple[tuple[int, int], ...] = ((64 * 1024, 9),)  # (size below, level)
+    default_level: int = 6
+
+    @classmethod
+    def legacy(cls) -> "CompressionPolicy":
+        # deflate everything at the default level
+        return cls(stored_extensions=frozenset(), sample_bytes=0, min_saving=0.0, levels_by_size=())
+
+    def choose(self, name: str, data: bytes) -> tuple[int, int]:
+        # returns (zip method, deflate level)
+        method, level, _ = self.plan(name, data)
+        return method, level
+
+    def plan(self, name: str, data: bytes) -> tuple[int, int, bytes | None]:
+        # choose() plus the payload when the level-1 sample already is the whole deflated entry
+        ext = os.path.splitext(name)[1].lower()
+        if ext in self.stored_extensions:
+            return ZIP_STORED, 0, None
+        sampled = None
+        if self.sample_bytes and len(data) > 512:
+            sample = data[: self.sample_bytes]
+            sampled = deflate(sample, 1)
+            if len(sampled) > len(sample) * (1 - self.min_saving):
+                return ZIP_STORED, 0, None
+            if len(sample) < len(data):
+                sampled = None
+        level = next((lv for limit, lv in self.levels_by_size if len(data) < limit), self.default_level)
+        return ZIP_DEFLATED, level, sampled if level == 1 else None
+
+    def settings(self) -> list:
+        # as stored in manifests and hashed into store keys
+        levels = [list(pair) for pair in self.levels_by_size]
+        return [sorted(self.stored_extensions), self.sample_bytes, self.min_saving, levels, self.default_level]
 
 
 @dataclass(frozen=True, slots=True)
@@ -21,30 +93,488 @@ class PackageSpec:
         "__pycache__/*",
         "*.pyc",
     )
+    workers: int = 1  # compression threads; zlib releases the GIL
+    source: str = "walk"  # walk|git|tree
+    include_untracked: bool = False  # git source: add untracked, non-ignored files
+    ref: str = "HEAD"  # tree source: commit or tag whose tree is packaged
+    incremental: bool = False  # reuse unchanged compressed entries from the previous artifact
+    previous_artifact: Path | None = None  # default: last release in the transaction log, else newest in dist_dir
+    formats: tuple[str, ...] = ("zip",)  # zip, tar.gz, tar.xz, sha256sums
+    compression: CompressionPolicy = field(default_factory=CompressionPolicy)
+    store_dir: Path | None = None  # content-addressed artifact store, e.g. <repo>/.arm/store
+    store_max_bytes: int = 2 * 1024**3
 
+    def excluder(self) -> ExcludeMatcher:
+        # compiled once per distinct glob tuple
+        return compile_excludes(self.exclude_globs)
 
-def _is_excluded(rel_posix: str, globs: tuple[str, ...]) -> bool:
-    for g in globs:
-        if fnmatch.fnmatch(rel_posix, g) or fnmatch.fnmatch(rel_posix + "/", g):
-            return True
-    return False
 
+def _iter_walk_files(spec: PackageSpec) -> Iterator[str]:
+    matcher = spec.excluder()
+    for root, dirs, files in os.walk(spec.repo_dir):
+        rel_root = Path(root).relative_to(spec.repo_dir).as_posix()
+        prefix = (rel_root + "/") if rel_root != "." else ""
+        # prune excluded dirs; sorted so the archive layout is deterministic
+        dirs[:] = sorted(d for d in dirs if not matcher.excludes_dir(prefix + d))
+        for f in sorted(files):
+            rel = prefix + f
+            if matcher.excludes(rel):
+                continue
+            yield rel
 
-def build_zip(spec: PackageSpec) -> Path:
+
+def _iter_git_files(spec: PackageSpec) -> Iterator[str]:
+    # Only the index is enumerated, so untracked trees (node_modules, .tox, build caches)
+    # are never visited.
+    matcher = spec.excluder()
+    prev = None
+    for rel in ls_files(repo_dir=spec.repo_dir, include_untracked=spec.include_untracked):
+        # unmerged paths are listed once per stage
+        if rel == prev:
+            continue
+        prev = rel
+        if matcher.excludes(rel):
+            continue
+        # skips submodules and tracked files deleted from the working tree
+        if (spec.repo_dir / rel).is_file():
+            yield rel
+
+
+@dataclass(frozen=True, slots=True)
+class _SourceFile:
+    name: str
+    path: Path | None = None  # on disk, stat'ed and read by a worker
+    data: bytes = b""
+    mode: int = 0
+    mtime: float = 0.0
+
+    def load(self) -> tuple[bytes, int, float]:
+        if self.path is None:
+            return self.data, self.mode, self.mtime
+        st = self.path.stat()
+        return self.path.read_bytes(), st.st_mode, st.st_mtime
+
+
+def _iter_tree_files(spec: PackageSpec) -> Iterator[_SourceFile]:
+    # Reads the committed tree through git itself: the working tree is never touched and
+    # every entry carries the commit time, so the archive depends only on the commit.
+    commit = resolve_commit(repo_dir=spec.repo_dir, ref=spec.ref)
+    mtime = commit_time(repo_dir=spec.repo_dir, ref=commit)
+    matcher = spec.excluder()
+    entries = [e for e in ls_tree(repo_dir=spec.repo_dir, ref=commit) if not matcher.excludes(e.path)]
+    blobs = iter_blobs(repo_dir=spec.repo_dir, shas=[e.sha for e in entries])
+    try:
+        for e, data in zip(entries, blobs):
+            yield _SourceFile(name=e.path, data=data, mode=e.mode, mtime=mtime)
+    finally:
+        blobs.close()
+
+
+def _iter_files(spec: PackageSpec) -> Iterator[_SourceFile]:
+    match spec.source:
+        case "walk":
+            names = _iter_walk_files(spec)
+        case "git":
+            names = _iter_git_files(spec)
+        case "tree":
+            return _iter_tree_files(spec)
+        case _:
+            raise ValueError(f"Unknown package source: {spec.source!r}")
+    return (_SourceFile(name=rel, path=spec.repo_dir / rel) for rel in names)
+
+
+@dataclass(frozen=True, slots=True)
+class PackagedFile:
+    name: str
+    size: int
+    mode: int
+    crc32: int
+    sha256: str
+    method: int
+    level: int
+
+
+@dataclass(frozen=True, slots=True)
+class PackageResult:
+    artifacts: list[Path]
+    files: list[PackagedFile] = field(default_factory=list)
+    reused: int = 0
+    cached: bool = False  # served from the artifact store without building
+
+
+_MANIFEST_FORMAT = 2
+_STORE_FORMAT = 2
+_TAR_GZ_LEVEL = 6
+FORMATS = ("zip", "tar.gz", "tar.xz", "sha256sums")
+
+
+def package_name(artifact: Path) -> str:
+    name = artifact.name
+    for suffix in (".zip", ".tar.gz", ".tar.xz", ".SHA256SUMS"):
+        if name.endswith(suffix):
+            return name[: -len(suffix)]
+    return name
+
+
+def artifact_paths(spec: PackageSpec) -> list[Path]:
+    # every file build_package writes to dist/, in the order it returns them
+    base = spec.dist_dir / f"{spec.project_name}-{spec.version}"
+    paths = [base.with_name(f"{base.name}.{fmt}") for fmt in FORMATS if fmt in spec.formats and fmt != "sha256sums"]
+    if "sha256sums" in spec.formats:
+        paths.append(base.with_name(f"{base.name}.SHA256SUMS"))
+    return paths
+
+
+def manifest_path(repo_dir: Path, artifact: Path) -> Path:
+    # one manifest per package, shared by all of its archive formats
+    return repo_dir / ".arm" / "manifests" / f"{package_name(artifact)}.json"
+
+
+def write_manifest(
+    path: Path, *, files: list[PackagedFile], archives: dict[str, dict], compression: CompressionPolicy
+) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "format": _MANIFEST_FORMAT,
+        "zlib": zlib.ZLIB_RUNTIME_VERSION,
+        "compression": compression.settings(),
+        "archives": archives,
+        "files": [asdict(f) for f in files],
+    }
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(data, separators=(",", ":")) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def read_manifest(path: Path) -> dict | None:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return None
+    return data if data.get("format") == _MANIFEST_FORMAT else None
+
+
+class _PreviousArtifact:
+    # Raw entries of an earlier zip whose manifest says they were built from identical input.
+
+    def __init__(self, path: Path, manifest: dict) -> None:
+        self._fd = os.open(path, os.O_RDONLY)
+        known = {f["name"]: PackagedFile(**f) for f in manifest["files"]}
+        self._entries: dict[str, tuple[PackagedFile, int, int]] = {}
+        with zipfile.ZipFile(path) as zf:
+            for info in zf.infolist():
+                pf = known.get(info.filename)
+                # the zip itself must agree with its manifest before anything is copied
+                if pf and (pf.crc32, pf.size, pf.method) == (info.CRC, info.file_size, info.compress_type):
+                    self._entries[info.filename] = (pf, info.header_offset, info.compress_size)
+
+    def lookup(self, name: str, size: int, crc32: int, sha256: str) -> PackagedFile | None:
+        # the previous entry for identical content, whose method and level are then reused
+        hit = self._entries.get(name)
+        if hit is None or (hit[0].size, hit[0].crc32, hit[0].sha256) != (size, crc32, sha256):
+            return None
+        return hit[0]
+
+    def payload(self, pf: PackagedFile) -> bytes:
+        _, offset, compress_size = self._entries[pf.name]
+        return read_raw_payload(self._fd, header_offset=offset, compress_size=compress_size)
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def find_previous_artifact(spec: PackageSpec) -> Path | None:
+    if spec.previous_artifact is not None:
+        return spec.previous_artifact
+    try:
+        tx = read_last_release(repo_dir=spec.repo_dir)
+        candidates = [Path(a) for a in tx.artifacts if a.endswith(".zip")]
+    except (FileNotFoundError, ValueError, TypeError):
+        candidates = []
+    candidates += sorted(
+        spec.dist_dir.glob(f"{spec.project_name}-*.zip"), key=lambda p: p.stat().st_mtime, reverse=True
+    )
+    for c in candidates:
+        if c.is_file() and manifest_path(spec.repo_dir, c).exists():
+            return c
+    return None
+
+
+def _open_previous(spec: PackageSpec) -> _PreviousArtifact | None:
+    prev = find_previous_artifact(spec)
+    if prev is None:
+        return None
+    manifest = read_manifest(manifest_path(spec.repo_dir, prev))
+    # deflate output is only reproducible with the same zlib build, and the reused methods and
+    # levels only match a clean build under the same compression policy
+    if manifest is None or manifest.get("zlib") != zlib.ZLIB_RUNTIME_VERSION:
+        return None
+    if manifest.get("compression") != spec.compression.settings():
+        return None
+    try:
+        return _PreviousArtifact(prev, manifest)
+    except (OSError, zipfile.BadZipFile):
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class _Packed:
+    file: PackagedFile
+    mtime: float
+    entry: ZipEntry | None  # None when no zip is being written
+    data: bytes | None  # kept only for tar writers
+    reused: bool
+
+
+def _pack_file(
+    previous: _PreviousArtifact | None,
+    compression: CompressionPolicy,
+    want_zip: bool,
+    want_data: bool,
+    src: _SourceFile,
+) -> _Packed:
+    # Each source file is read exactly once; every output and hash is fed from this buffer.
+    # Content the previous artifact already holds is never deflated, not even as a sample.
+    data, st_mode, mtime = src.load()
+    rel = src.name
+    crc32 = zlib.crc32(data)
+    sha256 = hashlib.sha256(data).hexdigest()
+    method, level = ZIP_STORED, 0
+    payload = None
+    reused = False
+    if want_zip:
+        if previous is not None and (hit := previous.lookup(rel, len(data), crc32, sha256)) is not None:
+            method, level = hit.method, hit.level
+            if method != ZIP_STORED:
+                payload = previous.payload(hit)
+                reused = True
+        else:
+            method, level, payload = compression.plan(rel, data)
+        if payload is None:
+            payload = data if method == ZIP_STORED else deflate(data, level)
+    pf = PackagedFile(
+        name=rel,
+        size=len(data),
+        mode=st_mode & 0xFFFF,
+        crc32=crc32,
+        sha256=sha256,
+        method=method,
+        level=level,
+    )
+    entry = None
+    if want_zip:
+        entry = ZipEntry(
+            name=rel,
+            payload=payload,
+            crc32=pf.crc32,
+            file_size=pf.size,
+            compress_type=pf.method,
+            date_time=dos_date_time(mtime),
+            external_attr=pf.mode << 16,
+        )
+    return _Packed(file=pf, mtime=mtime, entry=entry, data=data if want_data else None, reused=reused)
+
+
+def _ordered_map(fn: Callable[[T], R], items: Iterable[T], *, workers: int) -> Iterator[R]:
+    # Results come back in input order; at most workers * 4 are in flight to bound memory.
+    if workers <= 1:
+        yield from map(fn, items)
+        return
+    window = workers * 4
+    pending: deque[Future[R]] = deque()
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        for item in items:
+            pending.append(ex.submit(fn, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+class _HashingFile:
+    # Write-through file that hashes the archive bytes as they are produced.
+
+    def __init__(self, path: Path) -> None:
+        self._fh = path.open("wb")
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def write(self, b: bytes) -> int:
+        self._fh.write(b)
+        self.sha256.update(b)
+        self.size += len(b)
+        return len(b)
+
+    def flush(self) -> None:
+        self._fh.flush()
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+class _ZipOutput:
+    def __init__(self, fh: _HashingFile) -> None:
+        self._writer = ZipWriter(fh)
+
+    def add(self, packed: _Packed) -> None:
+        assert packed.entry is not None
+        self._writer.add(packed.entry)
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+class _TarOutput:
+    def __init__(self, fh: _HashingFile, compression: str) -> None:
+        # fixed gzip header fields keep the archive reproducible
+        if compression == "gz":
+            self._stream = gzip.GzipFile(filename="", fileobj=fh, mode="wb", compresslevel=_TAR_GZ_LEVEL, mtime=0)
+        else:
+            self._stream = lzma.LZMAFile(fh, "wb")
+        self._tar = tarfile.open(fileobj=self._stream, mode="w|", format=tarfile.PAX_FORMAT)
+
+    def add(self, packed: _Packed) -> None:
+        assert packed.data is not None
+        info = tarfile.TarInfo(packed.file.name)
+        info.mode = packed.file.mode & 0o7777
+        info.mtime = int(packed.mtime)
+        if stat.S_ISLNK(packed.file.mode):
+            info.type = tarfile.SYMTYPE
+            info.linkname = os.fsdecode(packed.data)
+            self._tar.addfile(info)
+            return
+        info.size = packed.file.size
+        self._tar.addfile(info, io.BytesIO(packed.data))
+
+    def close(self) -> None:
+        self._tar.close()
+        self._stream.close()
+
+
+def _fingerprint(src: _SourceFile) -> str:
+    # Stat data only, like git's index: a store miss must not read every file twice. A content
+    # change moves ctime even when size and mtime are restored.
+    assert src.path is not None
+    st = src.path.stat()
+    return f"{src.name}\0{st.st_mode}\0{st.st_size}\0{st.st_mtime_ns}\0{st.st_ctime_ns}\n"
+
+
+def package_key(spec: PackageSpec) -> str:
+    # Everything that determines the output bytes: the input file list with its stat data
+    # (or the commit for tree sources) plus the settings and libraries used to build it.
+    h = hashlib.sha256()
+    settings = {
+        "store": _STORE_FORMAT,
+        "name": f"{spec.project_name}-{spec.version}",
+        "formats": sorted(spec.formats),
+        "excludes": list(spec.exclude_globs),
+        "compression": spec.compression.settings(),
+        "zlib": zlib.ZLIB_RUNTIME_VERSION,
+        "python": sys.version.split()[0],
+    }
+    h.update(json.dumps(settings, sort_keys=True).encode())
+    if spec.source == "tree":
+        h.update(resolve_commit(repo_dir=spec.repo_dir, ref=spec.ref).encode())
+    else:
+        for line in _ordered_map(_fingerprint, _iter_files(spec), workers=spec.workers):
+            h.update(line.encode())
+    return h.hexdigest()
+
+
+def _checkout_cached(spec: PackageSpec, key: str, names: list[str]) -> PackageResult | None:
+    store = ArtifactStore(spec.store_dir)
+    hit = store.get(key)
+    if hit is None:
+        return None
+    manifest = manifest_path(spec.repo_dir, spec.dist_dir / names[0])
+    stored = read_manifest(hit / manifest.name)
+    archives = stored["archives"] if stored else {}
+    # dist/ files are hardlinks, so an in-place edit there also changes the stored copy
+    if not stored or not all(
+        (hit / n).is_file() and (n not in archives or (hit / n).stat().st_size == archives[n]["size"]) for n in names
+    ):
+        store.discard(key)
+        return None
     spec.dist_dir.mkdir(parents=True, exist_ok=True)
-    out = spec.dist_dir / f"{spec.project_name}-{spec.version}.zip"
-    if out.exists():
-        out.unlink()
-
-    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-        for root, dirs, files in os.walk(spec.repo_dir):
-            root_p = Path(root)
-            rel_root = root_p.relative_to(spec.repo_dir).as_posix()
-            # prune excluded dirs
-            dirs[:] = [d for d in dirs if not _is_excluded(((rel_root + "/") if rel_root != "." else "") + d, spec.exclude_globs)]
-            for f in files:
-                rel = (root_p / f).relative_to(spec.repo_dir).as_posix()
-                if _is_excluded(rel, spec.exclude_globs):
-                    continue
-                zf.write(spec.repo_dir / rel, arcname=rel)
-    return out
+    manifest.parent.mkdir(parents=True, exist_ok=True)
+    artifacts = []
+    for n in names:
+        link_or_copy(hit / n, spec.dist_dir / n)
+        artifacts.append(spec.dist_dir / n)
+    link_or_copy(hit / manifest.name, manifest)
+    files = [PackagedFile(**f) for f in stored["files"]]
+    return PackageResult(artifacts=artifacts, files=files, cached=True)
+
+
+def build_package(spec: PackageSpec) -> PackageResult:
+    unknown = set(spec.formats) - set(FORMATS)
+    if unknown or not set(spec.formats) - {"sha256sums"}:
+        raise ValueError(f"Unsupported package formats: {spec.formats!r}")
+    base = f"{spec.project_name}-{spec.version}"
+    archive_formats = [f for f in FORMATS if f in spec.formats and f != "sha256sums"]
+    if spec.store_dir is None:
+        return _build(spec, base, archive_formats)
+
+    names = [p.name for p in artifact_paths(spec)]
+    key = package_key(spec)
+    cached = _checkout_cached(spec, key, names)
+    if cached is not None:
+        return cached
+    result = _build(spec, base, archive_formats)
+    # dist/ files become hardlinks of the stored copies
+    store = ArtifactStore(spec.store_dir)
+    store.put(key, [*result.artifacts, manifest_path(spec.repo_dir, result.artifacts[0])])
+    store.gc(spec.store_max_bytes, keep=key)
+    return result
+
+
+def _build(spec: PackageSpec, base: str, archive_formats: list[str]) -> PackageResult:
+    spec.dist_dir.mkdir(parents=True, exist_ok=True)
+    outs = [spec.dist_dir / f"{base}.{fmt}" for fmt in archive_formats]
+    tmps = [o.with_name(o.name + ".tmp") for o in outs]
+    want_zip = "zip" in archive_formats
+    # opened before writing: the previous artifact may be the file being replaced
+    previous = _open_previous(spec) if spec.incremental and want_zip else None
+    files: list[PackagedFile] = []
+    reused = 0
+    handles: list[_HashingFile] = []
+
+    try:
+        writers: list[_ZipOutput | _TarOutput] = []
+        for fmt, tmp in zip(archive_formats, tmps):
+            fh = _HashingFile(tmp)
+            handles.append(fh)
+            writers.append(_ZipOutput(fh) if fmt == "zip" else _TarOutput(fh, fmt.rsplit(".", 1)[1]))
+        want_data = any(isinstance(w, _TarOutput) for w in writers)
+        pack = partial(_pack_file, previous, spec.compression, want_zip, want_data)
+        for packed in _ordered_map(pack, _iter_files(spec), workers=spec.workers):
+            for w in writers:
+                w.add(packed)
+            files.append(packed.file)
+            reused += packed.reused
+        for w in writers:
+            w.close()
+        for fh in handles:
+            fh.close()
+        for tmp, out in zip(tmps, outs):
+            os.replace(tmp, out)
+    finally:
+        for fh in handles:
+            fh.close()
+        for tmp in tmps:
+            tmp.unlink(missing_ok=True)
+        if previous:
+            previous.close()
+
+    archives = {o.name: {"sha256": fh.sha256.hexdigest(), "size": fh.size} for o, fh in zip(outs, handles)}
+    artifacts = list(outs)
+    if "sha256sums" in spec.formats:
+        sums = spec.dist_dir / f"{base}.SHA256SUMS"
+        sums.write_text("".join(f"{a['sha256']}  {name}\n" for name, a in archives.items()), encoding="utf-8")
+        artifacts.append(sums)
+    write_manifest(manifest_path(spec.repo_dir, outs[0]), files=files, archives=archives, compression=spec.compression)
+    return PackageResult(artifacts=artifacts, files=files, reused=reused)
+
+
+def build_zip(spec: PackageSpec) -> Path:
+    return build_package(spec).artifacts[0]
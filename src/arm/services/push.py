@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from arm.adapters.git import GitError, push_atomic
+
+# A release goes to every configured remote (primary plus mirrors) at once: each remote
+# gets a single `git push --atomic` of the branch and tag, so a remote ends up with both
+# refs or neither, and the total latency is that of the slowest remote.
+
+
+@dataclass(frozen=True, slots=True)
+class PushResult:
+    remote: str
+    ok: bool
+    seconds: float
+    error: str | None = None
+
+
+def push_command(remote: str, refspecs: list[str]) -> str:
+    return f"git push --atomic {remote} {' '.join(refspecs)}"
+
+
+def push_remotes(
+    *,
+    repo_dir: Path,
+    remotes: list[str],
+    refspecs: list[str],
+    workers: int,
+    on_start: Callable[[str], None] | None = None,
+    on_done: Callable[[PushResult], None] | None = None,
+) -> list[PushResult]:
+    # Results come back in `remotes` order. A failing remote never stops the others;
+    # whether enough of them succeeded is the caller's call (see quorum_met).
+    def one(remote: str) -> PushResult:
+        if on_start is not None:
+            on_start(remote)
+        started = time.monotonic()
+        try:
+            push_atomic(repo_dir=repo_dir, remote=remote, refspecs=refspecs)
+            res = PushResult(remote=remote, ok=True, seconds=time.monotonic() - started)
+        except GitError as exc:
+            res = PushResult(remote=remote, ok=False, seconds=time.monotonic() - started, error=str(exc))
+        if on_done is not None:
+            on_done(res)
+        return res
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(remotes)))) as ex:
+        return list(ex.map(one, remotes))
+
+
+def required_successes(quorum: int, remotes: int) -> int:
+    # quorum 0 means every remote
+    return remotes if quorum <= 0 else min(quorum, remotes)
+
+
+def quorum_met(results: list[PushResult], quorum: int) -> bool:
+    return sum(r.ok for r in results) >= required_successes(quorum, len(results))
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from arm.adapters import git as git_adapter
+from arm.adapters.fswatch import refs_fingerprint
+from arm.config import AppConfig, load_config
+from arm.domain.models import Commit, ConventionalCommit
+from arm.services.conventional_commits import ConventionalCommitError, validate_commits
+from arm.services.verdict_notes import validate_with_notes
+
+# Commands that only read history (status, validate, plan, release planning) resolve the
+# last tag and parse the commit range through a RepoCache. Entries are keyed by the stat
+# fingerprint of the ref storage, so any commit, tag, fetch or checkout drops them; a
+# handful of stat calls is far cheaper than the git processes it saves when one process
+# serves many commands (`arm batch`).
+
+CommitRange = tuple[list[Commit], list[ConventionalCommit], list[ConventionalCommitError]]
+
+
+class RepoCache:
+    def __init__(self, repo_dir: Path) -> None:
+        self.repo_dir = repo_dir
+        self._fingerprint: tuple | None = None
+        self._last_tags: dict[str, str | None] = {}
+        self._ranges: dict[tuple[str | None, str, str], CommitRange] = {}
+        self.hits = 0
+
+    def _fresh(self) -> bool:
+        fp = refs_fingerprint(self.repo_dir)
+        if fp is None or fp != self._fingerprint:
+            self._fingerprint = fp
+            self._last_tags.clear()
+            self._ranges.clear()
+        return fp is not None
+
+    def last_tag(self, tag_prefix: str) -> str | None:
+        if not self._fresh():
+            return git_adapter.last_tag(repo_dir=self.repo_dir, tag_prefix=tag_prefix)
+        if tag_prefix in self._last_tags:
+            self.hits += 1
+        else:
+            self._last_tags[tag_prefix] = git_adapter.last_tag(repo_dir=self.repo_dir, tag_prefix=tag_prefix)
+        return self._last_tags[tag_prefix]
+
+    def commits(
+        self,
+        from_ref: str | None,
+        to_ref: str,
+        *,
+        history_mode: str = "all",
+        notes_ref: str | None = None,
+        write_notes: bool = True,
+    ) -> CommitRange:
+        # commit log of from_ref..to_ref with its conventional-commit validation; with
+        # notes_ref, verdicts are read from (and added to) that git notes ref
+        key = (from_ref, to_ref, history_mode)
+        if self._fresh() and key in self._ranges:
+            self.hits += 1
+            return self._ranges[key]
+        commits = git_adapter.commit_log(
+            repo_dir=self.repo_dir, from_ref=from_ref, to_ref=to_ref, history_mode=history_mode
+        )
+        if notes_ref:
+            parsed, errors = validate_with_notes(
+                commits, repo_dir=self.repo_dir, ref=notes_ref, history_mode=history_mode, write=write_notes
+            )
+        else:
+            parsed, errors = validate_commits(commits, history_mode=history_mode)
+        if self._fingerprint is not None:
+            self._ranges[key] = (commits, parsed, errors)
+        return commits, parsed, errors
+
+
+class ConfigCache:
+    # load_config results keyed by the resolved arm.toml path and its mtime
+    def __init__(self) -> None:
+        self._entries: dict[Path, tuple[int | None, AppConfig]] = {}
+
+    def load(self, config_path: str | None) -> AppConfig:
+        path = Path(config_path).resolve() if config_path else Path("arm.toml").resolve()
+        try:
+            mtime: int | None = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        hit = self._entries.get(path)
+        if hit is not None and hit[0] == mtime:
+            return hit[1]
+        cfg = load_config(str(path))
+        self._entries[path] = (mtime, cfg)
+        return cfg
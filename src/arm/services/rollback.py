@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path
 
-from arm.adapters.git import GitError, delete_tag, run_git
+from arm.adapters.git import GitError, delete_tags, is_ancestor, run_git
 from arm.services.transaction_log import ReleaseTransaction
 
 
@@ -12,43 +13,73 @@ class RollbackResult:
     actions: list[str]
 
 
-def rollback_last_release(*, repo_dir: Path, tx: ReleaseTransaction, dry_run: bool, hard: bool, keep_artifacts: bool) -> RollbackResult:
+class RollbackError(RuntimeError):
+    # a step failed; done lists the actions that were already applied
+    def __init__(self, message: str, *, done: list[str]) -> None:
+        super().__init__(message)
+        self.done = done
+
+
+def _revert(repo_dir: Path, sha: str) -> None:
+    try:
+        run_git(["revert", "--no-edit", sha], cwd=repo_dir)
+    except GitError:
+        # never leave the repository mid-revert
+        try:
+            run_git(["revert", "--abort"], cwd=repo_dir)
+        except GitError:
+            pass
+        raise
+
+
+def rollback_release(
+    *, repo_dir: Path, tx: ReleaseTransaction, dry_run: bool, hard: bool, keep_artifacts: bool, latest: bool = True
+) -> RollbackResult:
+    # The release commit is undone before the tag is deleted, so a failed revert leaves the
+    # release as it was. --hard rewinds HEAD, which is only safe for the newest live release.
+    sha = tx.changelog_commit_sha
+    if hard and sha:
+        if not latest:
+            raise ValueError(f"--hard only rolls back the newest release; roll back the releases after {tx.version} first")
+        if not is_ancestor(repo_dir=repo_dir, ancestor=sha, ref="HEAD"):
+            raise ValueError(f"Release commit {sha} is not an ancestor of HEAD; refusing to reset")
+
     actions: list[str] = []
+    done: list[str] = []
 
-    if tx.tag:
-        actions.append(f"delete tag {tx.tag}")
-        if not dry_run:
-            try:
-                delete_tag(repo_dir=repo_dir, tag=tx.tag)
-            except GitError:
-                # ignore missing tag
-                pass
-
-    if tx.changelog_commit_sha:
+    def step(action: str, fn: Callable[[], object]) -> None:
+        actions.append(action)
+        if dry_run:
+            return
+        try:
+            fn()
+        except GitError as exc:
+            raise RollbackError(f"{action} failed: {exc}", done=done) from exc
+        done.append(action)
+
+    if sha:
         if hard:
-            actions.append(f"hard reset to {tx.changelog_commit_sha}^")
-            if not dry_run:
-                run_git(["reset", "--hard", f"{tx.changelog_commit_sha}^"], cwd=repo_dir)
+            step(f"hard reset to {sha}^", lambda: run_git(["reset", "--hard", f"{sha}^"], cwd=repo_dir))
         else:
-            actions.append(f"revert commit {tx.changelog_commit_sha}")
-            if not dry_run:
-                run_git(["revert", "--no-edit", tx.changelog_commit_sha], cwd=repo_dir)
+            step(f"revert commit {sha}", lambda: _revert(repo_dir, sha))
     elif tx.changelog_path:
-        actions.append(f"restore changelog {tx.changelog_path}")
-        if not dry_run:
-            p = Path(tx.changelog_path)
-            if tx.changelog_existed_before:
+        p = Path(tx.changelog_path)
+        if tx.changelog_existed_before:
+
+            def restore() -> None:
                 p.parent.mkdir(parents=True, exist_ok=True)
                 p.write_text(tx.changelog_before or "", encoding="utf-8")
-            else:
-                p.unlink(missing_ok=True)
+
+            step(f"restore changelog {tx.changelog_path}", restore)
+        else:
+            step(f"restore changelog {tx.changelog_path}", lambda: p.unlink(missing_ok=True))
+
+    if tx.tag:
+        # missing tags are skipped
+        step(f"delete tag {tx.tag}", lambda: delete_tags(repo_dir=repo_dir, tags=[tx.tag]))
 
     if not keep_artifacts:
         for a in tx.artifacts:
-            actions.append(f"delete artifact {a}")
-            if not dry_run:
-                p = Path(a)
-                if p.exists():
-                    p.unlink()
+            step(f"delete artifact {a}", lambda a=a: Path(a).unlink(missing_ok=True))
 
     return RollbackResult(actions=actions)
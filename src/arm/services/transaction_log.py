@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import os
+import struct
+from collections.abc import Iterator
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
@@ -43,15 +47,179 @@ def build_transaction(
     )
 
 
-def write_last_release(*, repo_dir: Path, tx: ReleaseTransaction) -> Path:
-    arm_dir = repo_dir / ".arm"
-    arm_dir.mkdir(parents=True, exist_ok=True)
-    path = arm_dir / "last_release.json"
-    path.write_text(json.dumps(asdict(tx), indent=2) + "\n", encoding="utf-8")
-    return path
+# .arm/journal.jsonl is append-only: one JSON record per line, fsync'd before the release
+# or rollback it describes is reported. .arm/journal.v2.idx holds one fixed-width entry per
+# record (offset, length, rollback target, kind, version hash), so releases are found by
+# steps or version from the end of the index, and only the matching record is read.
+
+_INDEX = struct.Struct("<QIiBxxxQ")
+_INDEX_NAME = "journal.v2.idx"
+_OLD_INDEXES = ("journal.idx",)  # rebuilt from the journal under the new name
+_RELEASE = 1
+_ROLLBACK = 2
+
+
+@dataclass(frozen=True, slots=True)
+class JournalEntry:
+    seq: int
+    offset: int
+    length: int
+    target: int  # rolled back release seq, -1 for releases
+    kind: int
+    version: int  # _version_hash of the release, 0 for rollbacks
+
+
+def _version_hash(version: str) -> int:
+    return int.from_bytes(hashlib.blake2b(version.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _fsync_dir(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class ReleaseJournal:
+    def __init__(self, repo_dir: Path) -> None:
+        self.dir = repo_dir / ".arm"
+        self.path = self.dir / "journal.jsonl"
+        self.index_path = self.dir / _INDEX_NAME
+        self._legacy = self.dir / "last_release.json"
+
+    def __len__(self) -> int:
+        try:
+            return self.index_path.stat().st_size // _INDEX.size
+        except FileNotFoundError:
+            return 0
+
+    def read(self, entry: JournalEntry) -> dict:
+        with self.path.open("rb") as fh:
+            fh.seek(entry.offset)
+            return json.loads(fh.read(entry.length))
+
+    def entries_newest_first(self, *, batch: int = 256) -> Iterator[JournalEntry]:
+        n = len(self)
+        if not n:
+            return
+        with self.index_path.open("rb") as fh:
+            while n:
+                first = max(0, n - batch)
+                fh.seek(first * _INDEX.size)
+                buf = fh.read((n - first) * _INDEX.size)
+                for i in range(n - first - 1, -1, -1):
+                    yield JournalEntry(first + i, *_INDEX.unpack_from(buf, i * _INDEX.size))
+                n = first
+
+    def _repair(self) -> None:
+        # A crash can leave a torn index entry, journal lines the index has not caught up
+        # with, or a torn final line; only the bytes after the last indexed record are read.
+        for name in _OLD_INDEXES:
+            (self.dir / name).unlink(missing_ok=True)
+        n = len(self)
+        if self.index_path.exists() and self.index_path.stat().st_size != n * _INDEX.size:
+            os.truncate(self.index_path, n * _INDEX.size)
+        end = 0
+        if n:
+            last = next(self.entries_newest_first(batch=1))
+            end = last.offset + last.length + 1
+        size = self.path.stat().st_size if self.path.exists() else 0
+        if size == end:
+            return
+        if size < end:
+            raise ValueError(f"{self.path} is shorter than its index")
+        with self.path.open("rb") as fh:
+            fh.seek(end)
+            tail = fh.read()
+        complete = tail.rpartition(b"\n")[0] + b"\n" if b"\n" in tail else b""
+        pos = end
+        for line in complete.splitlines():
+            record = json.loads(line)
+            self._append_index(pos, len(line), record)
+            pos += len(line) + 1
+        os.truncate(self.path, pos)
+
+    def _append_index(self, offset: int, length: int, record: dict) -> None:
+        kind = _ROLLBACK if record["kind"] == "rollback" else _RELEASE
+        target = record["target"] if kind == _ROLLBACK else -1
+        version = _version_hash(record["tx"]["version"]) if kind == _RELEASE else 0
+        with self.index_path.open("ab") as fh:
+            fh.write(_INDEX.pack(offset, length, target, kind, version))
+            fh.flush()
+            os.fsync(fh.fileno())
+
+    def _append(self, record: dict) -> int:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._repair()
+        seq = len(self)
+        line = json.dumps({**record, "seq": seq}, separators=(",", ":")).encode("utf-8")
+        new = not self.path.exists()
+        with self.path.open("ab") as fh:
+            offset = fh.tell()
+            fh.write(line + b"\n")
+            fh.flush()
+            os.fsync(fh.fileno())
+        self._append_index(offset, len(line), record)
+        if new:
+            _fsync_dir(self.dir)
+        return seq
+
+    def _migrate_legacy(self) -> None:
+        # import the single-file log written by earlier versions
+        if self._legacy.exists() and not self.path.exists():
+            tx = ReleaseTransaction(**json.loads(self._legacy.read_text(encoding="utf-8")))
+            self._append({"kind": "release", "tx": asdict(tx)})
+            self._legacy.unlink()
+
+    def append_release(self, tx: ReleaseTransaction) -> int:
+        self._migrate_legacy()
+        return self._append({"kind": "release", "tx": asdict(tx)})
+
+    def append_rollback(self, seq: int, *, actions: list[str]) -> int:
+        record = {
+            "kind": "rollback",
+            "target": seq,
+            "created_at_utc": datetime.now(timezone.utc).isoformat(),
+            "actions": actions,
+        }
+        return self._append(record)
+
+    def _live_entries(self) -> Iterator[JournalEntry]:
+        # release index entries, newest first, skipping releases that were rolled back
+        self._migrate_legacy()
+        if self.dir.is_dir():
+            self._repair()
+        rolled_back: set[int] = set()
+        for e in self.entries_newest_first():
+            if e.kind == _ROLLBACK:
+                rolled_back.add(e.target)
+            elif e.seq not in rolled_back:
+                yield e
+
+    def live_releases(self) -> Iterator[tuple[int, ReleaseTransaction]]:
+        for e in self._live_entries():
+            yield e.seq, ReleaseTransaction(**self.read(e)["tx"])
+
+    def find_release(self, *, version: str | None = None, steps: int = 1) -> tuple[int, ReleaseTransaction]:
+        if steps < 1:
+            raise ValueError("--steps must be at least 1")
+        wanted_hash = _version_hash(version) if version is not None else None
+        for i, e in enumerate(self._live_entries(), 1):
+            if (wanted_hash is None and i == steps) or e.version == wanted_hash:
+                tx = ReleaseTransaction(**self.read(e)["tx"])
+                if version is None or tx.version == version:  # hash collision otherwise
+                    return e.seq, tx
+        wanted = f"version {version}" if version else f"{steps} release(s) back"
+        raise LookupError(f"No release to roll back ({wanted}) in {self.path}")
+
+
+def append_release(*, repo_dir: Path, tx: ReleaseTransaction) -> int:
+    return ReleaseJournal(repo_dir).append_release(tx)
 
 
 def read_last_release(*, repo_dir: Path) -> ReleaseTransaction:
-    path = repo_dir / ".arm" / "last_release.json"
-    data = json.loads(path.read_text(encoding="utf-8"))
-    return ReleaseTransaction(**data)
+    try:
+        return ReleaseJournal(repo_dir).find_release()[1]
+    except LookupError as exc:
+        raise FileNotFoundError(str(exc)) from exc
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from arm.adapters.git import GitError, iter_blobs, notes_list, write_notes
+from arm.domain.models import Commit, ConventionalCommit
+from arm.services.conventional_commits import PARSER_VERSION, ConventionalCommitError, validate_commits
+
+# Validation verdicts shared through git notes (refs/notes/arm by default), so any clone that
+# fetches the notes ref skips parsing commits another clone has already seen. A note holds
+#   {"v": PARSER_VERSION, "all": ["feat", "scope", 1, "description"]}
+# or ["!", "reason"] for a rejected commit. Merges can also carry a "mainline" verdict, which
+# is how the first-parent history modes read them. Notes from another parser version are
+# ignored and rewritten.
+
+
+def _key(c: Commit, history_mode: str) -> str:
+    return "mainline" if c.merge and history_mode != "all" else "all"
+
+
+def _encode(verdict: ConventionalCommit | ConventionalCommitError) -> list:
+    if isinstance(verdict, ConventionalCommitError):
+        return ["!", verdict.reason]
+    return [verdict.type, verdict.scope, int(verdict.breaking), verdict.description]
+
+
+def _decode(c: Commit, v: list) -> ConventionalCommit | ConventionalCommitError:
+    if v[0] == "!":
+        return ConventionalCommitError(sha=c.sha, subject=c.subject, reason=v[1])
+    return ConventionalCommit(type=v[0], scope=v[1], breaking=bool(v[2]), description=v[3])
+
+
+def read_verdicts(*, repo_dir: Path, ref: str, shas: list[str]) -> dict[str, dict]:
+    # one `git notes list` plus one `git cat-file --batch` for every note that is needed
+    blobs = notes_list(repo_dir=repo_dir, ref=ref)
+    wanted = [(sha, blobs[sha]) for sha in dict.fromkeys(shas) if sha in blobs]
+    out: dict[str, dict] = {}
+    if not wanted:
+        return out
+    for (sha, _), raw in zip(wanted, iter_blobs(repo_dir=repo_dir, shas=[b for _, b in wanted])):
+        try:
+            note = json.loads(raw)
+        except ValueError:
+            continue
+        if isinstance(note, dict) and note.get("v") == PARSER_VERSION:
+            out[sha] = note
+    return out
+
+
+def validate_with_notes(
+    commits: list[Commit], *, repo_dir: Path, ref: str, history_mode: str = "all", write: bool = True
+) -> tuple[list[ConventionalCommit], list[ConventionalCommitError]]:
+    # Same result as validate_commits; commits with a verdict note are not parsed, and
+    # verdicts for the rest are added to the notes ref unless write is False.
+    try:
+        notes = read_verdicts(repo_dir=repo_dir, ref=ref, shas=[c.sha for c in commits])
+    except GitError:
+        notes = {}
+    verdicts: dict[str, ConventionalCommit | ConventionalCommitError] = {}
+    missing: list[Commit] = []
+    for c in commits:
+        v = notes.get(c.sha, {}).get(_key(c, history_mode))
+        if v:
+            verdicts[c.sha] = _decode(c, v)
+        else:
+            missing.append(c)
+
+    new_notes: dict[str, str] = {}
+    for c in missing:
+        parsed, errors = validate_commits([c], history_mode=history_mode)
+        verdict = parsed[0] if parsed else errors[0]
+        verdicts[c.sha] = verdict
+        note = {**notes.get(c.sha, {"v": PARSER_VERSION}), _key(c, history_mode): _encode(verdict)}
+        new_notes[c.sha] = json.dumps(note, separators=(",", ":"))  # ASCII, as write_notes needs
+    if write and new_notes:
+        try:
+            write_notes(repo_dir=repo_dir, ref=ref, notes=new_notes, message=f"arm: {len(new_notes)} verdicts\n")
+        except GitError:
+            pass  # a concurrent writer won the race; these verdicts are simply not shared
+
+    ok: list[ConventionalCommit] = []
+    errs: list[ConventionalCommitError] = []
+    for c in commits:
+        v = verdicts[c.sha]
+        (errs if isinstance(v, ConventionalCommitError) else ok).append(v)  # type: ignore[arg-type]
+    return ok, errs
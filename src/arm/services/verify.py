@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from arm.services.packager import PackagedFile, manifest_path, read_manifest
+from arm.services.zip_writer import ZIP_DEFLATED, ZIP_STORED, payload_offset, read_raw_payload
+
+# Artifacts are checked against the manifest written while packaging. The default check
+# reads only the zip central directory and local headers; --deep decompresses every entry.
+
+_CHUNK = 1 << 20
+
+
+@dataclass(frozen=True, slots=True)
+class VerifyResult:
+    artifact: Path
+    entries: int
+    deep: bool
+    problems: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.problems
+
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as fh:
+        while chunk := fh.read(_CHUNK):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _check_entry_data(fd: int, info: zipfile.ZipInfo, pf: PackagedFile) -> str | None:
+    raw = read_raw_payload(fd, header_offset=info.header_offset, compress_size=info.compress_size)
+    if info.compress_type == ZIP_STORED:
+        data = raw
+    elif info.compress_type == ZIP_DEFLATED:
+        try:
+            d = zlib.decompressobj(-15)
+            data = d.decompress(raw) + d.flush()
+        except zlib.error as exc:
+            return f"{info.filename}: {exc}"
+    else:
+        return f"{info.filename}: unsupported compression {info.compress_type}"
+    if zlib.crc32(data) != info.CRC or hashlib.sha256(data).hexdigest() != pf.sha256:
+        return f"{info.filename}: content does not match manifest"
+    return None
+
+
+def _verify_zip(path: Path, files: list[PackagedFile], *, deep: bool, workers: int) -> tuple[int, list[str]]:
+    try:
+        zf = zipfile.ZipFile(path)
+    except (zipfile.BadZipFile, OSError) as exc:
+        return 0, [f"unreadable central directory: {exc}"]
+    with zf:
+        infos = zf.infolist()
+        cd_offset = zf.start_dir
+    problems: list[str] = []
+    if len(infos) != len(files):
+        problems.append(f"entry count {len(infos)} != manifest {len(files)}")
+    expected = {f.name: f for f in files}
+    checked: list[tuple[zipfile.ZipInfo, PackagedFile]] = []
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        for info in infos:
+            pf = expected.get(info.filename)
+            if pf is None:
+                problems.append(f"{info.filename}: not in manifest")
+                continue
+            if (info.file_size, info.CRC, info.compress_type) != (pf.size, pf.crc32, pf.method):
+                problems.append(f"{info.filename}: size/crc/method differ from manifest")
+                continue
+            try:
+                end = payload_offset(fd, header_offset=info.header_offset) + info.compress_size
+            except ValueError as exc:
+                problems.append(f"{info.filename}: {exc}")
+                continue
+            if end > cd_offset:
+                problems.append(f"{info.filename}: data runs past the central directory")
+                continue
+            checked.append((info, pf))
+        if deep and not problems:
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as ex:
+                results = ex.map(lambda c: _check_entry_data(fd, *c), checked)
+                problems.extend(p for p in results if p)
+    finally:
+        os.close(fd)
+    return len(infos), problems
+
+
+def verify_artifact(artifact: Path, *, repo_dir: Path, deep: bool = False, workers: int = 1) -> VerifyResult:
+    manifest = read_manifest(manifest_path(repo_dir, artifact))
+    if manifest is None:
+        return VerifyResult(artifact=artifact, entries=0, deep=deep, problems=["no manifest for artifact"])
+    if not artifact.is_file():
+        return VerifyResult(artifact=artifact, entries=0, deep=deep, problems=["artifact is missing"])
+    archives: dict[str, dict] = manifest.get("archives", {})
+    files = [PackagedFile(**f) for f in manifest.get("files", [])]
+
+    if artifact.name.endswith(".SHA256SUMS"):
+        want = "".join(f"{a['sha256']}  {name}\n" for name, a in archives.items())
+        bad = artifact.read_text(encoding="utf-8") != want
+        return VerifyResult(
+            artifact=artifact, entries=len(archives), deep=deep, problems=["checksums differ from manifest"] if bad else []
+        )
+
+    problems: list[str] = []
+    recorded = archives.get(artifact.name)
+    if recorded is None:
+        problems.append("artifact not recorded in manifest")
+    elif artifact.stat().st_size != recorded["size"]:
+        problems.append(f"size {artifact.stat().st_size} != manifest {recorded['size']}")
+    elif deep and file_sha256(artifact) != recorded["sha256"]:
+        problems.append("sha256 differs from manifest")
+    entries = len(files)
+    if artifact.name.endswith(".zip") and not problems:
+        entries, zip_problems = _verify_zip(artifact, files, deep=deep, workers=workers)
+        problems.extend(zip_problems)
+    return VerifyResult(artifact=artifact, entries=entries, deep=deep, problems=problems)
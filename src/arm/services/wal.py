@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from arm.adapters.git import GitError, delete_tags, resolve_commit, run_git, tag_refs
+from arm.services.checkpoint import clear_checkpoint
+from arm.services.transaction_log import append_release, build_transaction, read_last_release
+from arm.services.verify import verify_artifact
+
+# .arm/wal.jsonl describes the release in progress. Every side effect is preceded by an
+# fsync'd "intent" record and followed by a "done" record; the file is removed once the
+# release is in the journal (or has been compensated). A WAL left behind means the process
+# died mid-release, and `arm recover` either finishes or undoes it from these records alone.
+
+
+@dataclass(frozen=True, slots=True)
+class RecoveryResult:
+    outcome: str  # none|finished|undone
+    actions: list[str]
+
+
+class ReleaseWAL:
+    def __init__(self, repo_dir: Path) -> None:
+        self.path = repo_dir / ".arm" / "wal.jsonl"
+        self._lock = threading.Lock()  # release stages may log from several threads
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def _write(self, record: dict, *, mode: str = "ab") -> None:
+        with self._lock, self.path.open(mode) as fh:
+            fh.write(json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n")
+            fh.flush()
+            os.fsync(fh.fileno())
+
+    def begin(self, **state: object) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._write({"op": "begin", **state}, mode="wb")
+        _fsync_dir(self.path.parent)
+
+    def intent(self, step: str, **data: object) -> None:
+        self._write({"op": "intent", "step": step, **data})
+
+    def done(self, step: str, **data: object) -> None:
+        self._write({"op": "done", "step": step, **data})
+
+    def records(self) -> list[dict]:
+        out = []
+        for line in self.path.read_bytes().splitlines():
+            try:
+                out.append(json.loads(line))
+            except ValueError:
+                break  # torn final record: its side effect never started
+        return out
+
+    def clear(self) -> None:
+        self.path.unlink(missing_ok=True)
+        _fsync_dir(self.path.parent)
+
+
+def _fsync_dir(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _state(records: list[dict]) -> tuple[dict, dict[str, dict], dict[str, dict]]:
+    begin = records[0] if records and records[0].get("op") == "begin" else {}
+    intents = {r["step"]: r for r in records if r.get("op") == "intent"}
+    done = {r["step"]: r for r in records if r.get("op") == "done"}
+    return begin, intents, done
+
+
+def _finish(repo_dir: Path, begin: dict, done: dict[str, dict], *, dry_run: bool) -> list[str] | None:
+    # Everything up to packaging completed: record the release unless an artifact is damaged.
+    artifacts = [Path(a) for a in done["package"]["artifacts"]]
+    if not all(verify_artifact(a, repo_dir=repo_dir).ok for a in artifacts):
+        return None
+    actions = []
+    try:
+        # killed between appending to the journal and its done record
+        last = read_last_release(repo_dir=repo_dir)
+        journaled = (last.version, last.changelog_commit_sha) == (begin["version"], done.get("commit", {}).get("sha"))
+    except FileNotFoundError:
+        journaled = False
+    if "journal" not in done and not journaled:
+        actions.append(f"record release {begin['version']}")
+        if not dry_run:
+            tx = build_transaction(
+                repo_dir=repo_dir,
+                version=begin["version"],
+                tag=begin["tag"] if "tag" in done else None,
+                changelog_path=Path(begin["changelog_path"]),
+                changelog_commit_sha=done.get("commit", {}).get("sha"),
+                changelog_existed_before=begin["changelog_existed_before"],
+                changelog_before=begin["changelog_before"],
+                artifacts=artifacts,
+            )
+            append_release(repo_dir=repo_dir, tx=tx)
+    return actions
+
+
+def _head(repo_dir: Path) -> str | None:
+    try:
+        return resolve_commit(repo_dir=repo_dir, ref="HEAD")
+    except GitError:
+        return None
+
+
+def _undo(
+    repo_dir: Path, begin: dict, intents: dict[str, dict], done: dict[str, dict], *, dry_run: bool
+) -> list[str]:
+    actions: list[str] = []
+    if "package" in intents:
+        for a in map(Path, intents["package"]["artifacts"]):
+            for p in (a, a.with_name(a.name + ".tmp")):
+                if p.exists():
+                    actions.append(f"delete artifact {p}")
+                    if not dry_run:
+                        p.unlink()
+    if "tag" in intents and begin["tag"] in tag_refs(repo_dir=repo_dir):
+        actions.append(f"delete tag {begin['tag']}")
+        if not dry_run:
+            delete_tags(repo_dir=repo_dir, tags=[begin["tag"]])
+    changelog = Path(begin["changelog_path"])
+    if "commit" in intents:
+        head = _head(repo_dir)
+        sha = done.get("commit", {}).get("sha")
+        if sha is None and head != begin.get("head"):
+            # killed between `git commit` and its done record
+            subject = run_git(["log", "-1", "--format=%s"], cwd=repo_dir).stdout.strip()
+            if subject == f"chore(release): {begin['tag']}":
+                sha = head
+        if sha and head == sha:
+            actions.append(f"reset to {begin['head']}")
+            if not dry_run:
+                run_git(["reset", "--soft", begin["head"]], cwd=repo_dir)
+                run_git(["reset", "-q", begin["head"], "--", str(changelog)], cwd=repo_dir)
+        elif sha:
+            actions.append(f"revert commit {sha}")
+            if not dry_run:
+                run_git(["revert", "--no-edit", sha], cwd=repo_dir)
+                return actions  # the revert restored the changelog
+        elif "changelog" in intents:
+            # nothing committed yet, but `git add` may have staged the changelog
+            actions.append(f"unstage {changelog}")
+            if not dry_run and begin.get("head"):
+                run_git(["reset", "-q", begin["head"], "--", str(changelog)], cwd=repo_dir)
+    if "changelog" in intents:
+        actions.append(f"restore changelog {changelog}")
+        if not dry_run:
+            if begin["changelog_existed_before"]:
+                changelog.write_text(begin["changelog_before"] or "", encoding="utf-8")
+            else:
+                changelog.unlink(missing_ok=True)
+    return actions
+
+
+def recover_release(*, repo_dir: Path, dry_run: bool = False) -> RecoveryResult:
+    wal = ReleaseWAL(repo_dir)
+    if not wal.exists():
+        return RecoveryResult(outcome="none", actions=[])
+    begin, intents, done = _state(wal.records())
+    if not begin:
+        if not dry_run:
+            wal.clear()
+        return RecoveryResult(outcome="none", actions=["discard empty write-ahead log"])
+
+    if "package" in done:
+        actions = _finish(repo_dir, begin, done, dry_run=dry_run)
+        if actions is not None:
+            # pushes are not repeated: the remote may or may not have accepted them
+            for step, intent in intents.items():
+                if step.startswith("push") and step not in done:
+                    actions.append(f"unconfirmed: {intent['command']}")
+            if not dry_run:
+                wal.clear()
+                clear_checkpoint(repo_dir)
+            return RecoveryResult(outcome="finished", actions=actions)
+
+    actions = _undo(repo_dir, begin, intents, done, dry_run=dry_run)
+    if not dry_run:
+        wal.clear()
+        clear_checkpoint(repo_dir)
+    return RecoveryResult(outcome="undone", actions=actions)
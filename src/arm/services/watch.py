@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from arm.adapters import git as git_adapter
+from arm.adapters.git import GitError
+from arm.config import ReleasePolicy
+from arm.domain.models import BumpDecision, BumpType, ConventionalCommit, SemVer
+from arm.services.changelog import render_release_section
+from arm.services.conventional_commits import ConventionalCommitError, validate_commits
+from arm.services.semver import bump_from_commit, max_bump
+
+# Keeps a release plan current while HEAD moves. When the previous HEAD is an ancestor of
+# the new one and the last tag is unchanged, only the new commits are logged and parsed and
+# folded into the running bump decision; a new tag, a rewind or a rebase replans the range.
+
+
+@dataclass(frozen=True, slots=True)
+class PlanUpdate:
+    event: str  # initial|update|reset
+    head: str
+    last_tag: str | None
+    current_version: str
+    next_version: str
+    bump: str
+    reason: str
+    commits: int
+    new_commits: list[str]  # subjects, newest first
+    errors: list[str] = field(default_factory=list)
+    changelog_preview: str = ""
+
+
+class IncrementalPlanner:
+    def __init__(
+        self,
+        repo_dir: Path,
+        *,
+        policy: ReleasePolicy,
+        tag_prefix: str = "v",
+        initial_version: str | None = None,
+        forced: BumpType | None = None,
+        history_mode: str = "all",
+    ) -> None:
+        self.repo_dir = repo_dir
+        self.policy = policy
+        self.tag_prefix = tag_prefix
+        self.initial_version = initial_version or policy.initial_version
+        self.forced = forced
+        self.history_mode = history_mode
+        self.head: str | None = None
+        self.last_tag: str | None = None
+        self.parsed: list[ConventionalCommit] = []  # newest first, like git log
+        self.errors: list[ConventionalCommitError] = []
+        self.count = 0
+        self.decision = BumpDecision(BumpType.none, "no commits")
+        self.policy_error: str | None = None
+
+    def _fold(self, parsed: list[ConventionalCommit]) -> None:
+        # newer commits go first, matching compute_next_version's tie-breaking over git log order
+        try:
+            decisions = [bump_from_commit(c, policy=self.policy) for c in parsed]
+        except ValueError as exc:
+            self.policy_error = str(exc)
+            return
+        self.decision = max_bump([*decisions, self.decision])
+
+    def refresh(self) -> PlanUpdate | None:
+        # None when neither HEAD nor the last tag moved
+        try:
+            head = git_adapter.resolve_commit(repo_dir=self.repo_dir, ref="HEAD")
+        except GitError:
+            return None  # no commits yet
+        last = git_adapter.last_tag(repo_dir=self.repo_dir, tag_prefix=self.tag_prefix)
+        if head == self.head and last == self.last_tag:
+            return None
+        incremental = (
+            self.head is not None
+            and last == self.last_tag
+            and self.policy_error is None
+            and git_adapter.is_ancestor(repo_dir=self.repo_dir, ancestor=self.head, ref=head)
+        )
+        if incremental:
+            commits = git_adapter.commit_log(
+                repo_dir=self.repo_dir, from_ref=self.head, to_ref=head, history_mode=self.history_mode
+            )
+            event = "update"
+        else:
+            commits = git_adapter.commit_log(
+                repo_dir=self.repo_dir, from_ref=last, to_ref=head, history_mode=self.history_mode
+            )
+            event = "initial" if self.head is None else "reset"
+            self.parsed, self.errors, self.count = [], [], 0
+            self.decision = BumpDecision(BumpType.none, "no commits")
+            self.policy_error = None
+        parsed, errors = validate_commits(commits, history_mode=self.history_mode)
+        self._fold(parsed)
+        self.parsed[:0] = parsed
+        self.errors[:0] = errors
+        self.count += len(commits)
+        self.head, self.last_tag = head, last
+        return self._snapshot(event, [c.subject for c in commits])
+
+    def _snapshot(self, event: str, new_commits: list[str]) -> PlanUpdate:
+        current = SemVer.parse(self.last_tag[len(self.tag_prefix):] if self.last_tag else self.initial_version)
+        decision = BumpDecision(self.forced, "forced") if self.forced and self.forced != BumpType.none else self.decision
+        next_v = current.bump(decision.bump)
+        errors = [f"{e.sha[:8]} {e.reason}: {e.subject}" for e in self.errors]
+        if self.policy_error:
+            errors.append(self.policy_error)
+        return PlanUpdate(
+            event=event,
+            head=self.head or "",
+            last_tag=self.last_tag,
+            current_version=str(current),
+            next_version=str(next_v),
+            bump=decision.bump.value,
+            reason=decision.reason,
+            commits=self.count,
+            new_commits=new_commits,
+            errors=errors,
+            changelog_preview="" if errors else render_release_section(next_v, self.parsed),
+        )
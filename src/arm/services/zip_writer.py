@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import os
+import struct
+import time
+import zlib
+from dataclasses import dataclass
+from typing import BinaryIO
+
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+
+_LOCAL_HEADER = struct.Struct("<4sHHHHHIIIHH")
+_CENTRAL_HEADER = struct.Struct("<4sBBBBHHHHIIIHHHHHII")
+_END_RECORD = struct.Struct("<4sHHHHIIH")
+_END_RECORD64 = struct.Struct("<4sQHHIIQQQQ")
+_END_LOCATOR64 = struct.Struct("<4sIQI")
+
+_ZIP32_MAX = 0xFFFFFFFF
+_ZIP16_MAX = 0xFFFF
+_UNIX = 3
+
+
+@dataclass(frozen=True, slots=True)
+class ZipEntry:
+    name: str
+    payload: bytes  # bytes as stored in the archive (deflated unless compress_type is stored)
+    crc32: int
+    file_size: int
+    compress_type: int
+    date_time: tuple[int, int, int, int, int, int]
+    external_attr: int
+
+
+def dos_date_time(mtime: float) -> tuple[int, int, int, int, int, int]:
+    # same clamping as zipfile with strict_timestamps=False
+    dt = time.localtime(mtime)[:6]
+    if dt[0] < 1980:
+        return (1980, 1, 1, 0, 0, 0)
+    if dt[0] > 2107:
+        return (2107, 12, 31, 23, 59, 59)
+    return dt
+
+
+def deflate(data: bytes, level: int) -> bytes:
+    co = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return co.compress(data) + co.flush()
+
+
+def make_entry(name: str, data: bytes, *, mtime: float, mode: int, level: int = 6) -> ZipEntry:
+    return ZipEntry(
+        name=name,
+        payload=deflate(data, level),
+        crc32=zlib.crc32(data),
+        file_size=len(data),
+        compress_type=ZIP_DEFLATED,
+        date_time=dos_date_time(mtime),
+        external_attr=(mode & 0xFFFF) << 16,
+    )
+
+
+def payload_offset(fd: int, *, header_offset: int) -> int:
+    # Start of an entry's stored bytes, found via its local header; pread keeps this thread-safe.
+    header = os.pread(fd, _LOCAL_HEADER.size, header_offset)
+    if len(header) != _LOCAL_HEADER.size or header[:4] != b"PK\x03\x04":
+        raise ValueError(f"No local file header at offset {header_offset}")
+    fields = _LOCAL_HEADER.unpack(header)
+    return header_offset + _LOCAL_HEADER.size + fields[9] + fields[10]
+
+
+def read_raw_payload(fd: int, *, header_offset: int, compress_size: int) -> bytes:
+    start = payload_offset(fd, header_offset=header_offset)
+    payload = os.pread(fd, compress_size, start)
+    if len(payload) != compress_size:
+        raise ValueError(f"Truncated entry at offset {header_offset}")
+    return payload
+
+
+class ZipWriter:
+    # Writes precompressed entries sequentially; zip64 records are emitted only when needed.
+
+    def __init__(self, fh: BinaryIO) -> None:
+        self._fh = fh
+        self._offset = 0
+        self._central: list[bytes] = []
+
+    def _write(self, b: bytes) -> None:
+        self._fh.write(b)
+        self._offset += len(b)
+
+    def add(self, entry: ZipEntry) -> None:
+        name = entry.name.encode("utf-8")
+        flags = 0 if entry.name.isascii() else 0x800
+        y, mo, d, h, mi, s = entry.date_time
+        dos_time = (h << 11) | (mi << 5) | (s // 2)
+        dos_date = ((y - 1980) << 9) | (mo << 5) | d
+        csize = len(entry.payload)
+        usize = entry.file_size
+        offset = self._offset
+
+        local_zip64 = usize >= _ZIP32_MAX or csize >= _ZIP32_MAX
+        local_extra = struct.pack("<HHQQ", 1, 16, usize, csize) if local_zip64 else b""
+        version = 45 if local_zip64 else 20
+        self._write(
+            _LOCAL_HEADER.pack(
+                b"PK\x03\x04",
+                version,
+                flags,
+                entry.compress_type,
+                dos_time,
+                dos_date,
+                entry.crc32,
+                _ZIP32_MAX if local_zip64 else csize,
+                _ZIP32_MAX if local_zip64 else usize,
+                len(name),
+                len(local_extra),
+            )
+        )
+        self._write(name)
+        self._write(local_extra)
+        self._write(entry.payload)
+
+        fields: list[int] = []
+        if usize >= _ZIP32_MAX:
+            fields.append(usize)
+        if csize >= _ZIP32_MAX:
+            fields.append(csize)
+        if offset >= _ZIP32_MAX:
+            fields.append(offset)
+        extra = struct.pack(f"<HH{len(fields)}Q", 1, 8 * len(fields), *fields) if fields else b""
+        version = 45 if fields else 20
+        self._central.append(
+            _CENTRAL_HEADER.pack(
+                b"PK\x01\x02",
+                version,
+                _UNIX,
+                version,
+                0,
+                flags,
+                entry.compress_type,
+                dos_time,
+                dos_date,
+                entry.crc32,
+                min(csize, _ZIP32_MAX),
+                min(usize, _ZIP32_MAX),
+                len(name),
+                len(extra),
+                0,
+                0,
+                0,
+                entry.external_attr,
+                min(offset, _ZIP32_MAX),
+            )
+            + name
+            + extra
+        )
+
+    def close(self) -> None:
+        cd_offset = self._offset
+        for record in self._central:
+            self._write(record)
+        cd_size = self._offset - cd_offset
+        count = len(self._central)
+        if count > _ZIP16_MAX or cd_offset >= _ZIP32_MAX or cd_size >= _ZIP32_MAX:
+            eocd64_offset = self._offset
+            self._write(_END_RECORD64.pack(b"PK\x06\x06", 44, 45, 45, 0, 0, count, count, cd_size, cd_offset))
+            self._write(_END_LOCATOR64.pack(b"PK\x06\x07", 0, eocd64_offset, 1))
+        self._write(
+            _END_RECORD.pack(
+                b"PK\x05\x06",
+                0,
+                0,
+                min(count, _ZIP16_MAX),
+                min(count, _ZIP16_MAX),
+                min(cd_size, _ZIP32_MAX),
+                min(cd_offset, _ZIP32_MAX),
+                0,
+            )
+        )
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+
+
+class DagError(ValueError):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class Task:
+    name: str
+    run: Callable[[], None]
+    deps: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class TaskRun:
+    name: str
+    started: float  # time.monotonic()
+    ended: float
+    thread: int  # 0-based worker index, for trace lanes
+
+
+def _check(tasks: list[Task]) -> None:
+    names = [t.name for t in tasks]
+    if len(set(names)) != len(names):
+        raise DagError(f"Duplicate task names: {names}")
+    known = set(names)
+    for t in tasks:
+        missing = set(t.deps) - known
+        if missing:
+            raise DagError(f"Task {t.name!r} depends on unknown {sorted(missing)}")
+    # Kahn's algorithm: whatever never reaches in-degree 0 sits on a cycle
+    indegree = {t.name: len(set(t.deps)) for t in tasks}
+    dependents: dict[str, list[str]] = {n: [] for n in names}
+    for t in tasks:
+        for d in set(t.deps):
+            dependents[d].append(t.name)
+    ready = [n for n, k in indegree.items() if k == 0]
+    while ready:
+        for m in dependents[ready.pop()]:
+            indegree[m] -= 1
+            if indegree[m] == 0:
+                ready.append(m)
+    cyclic = sorted(n for n, k in indegree.items() if k)
+    if cyclic:
+        raise DagError(f"Dependency cycle among {cyclic}")
+
+
+def run_dag(
+    tasks: list[Task], *, workers: int, on_done: Callable[[str], None] | None = None
+) -> list[TaskRun]:
+    # Runs each task once all of its deps have finished, up to `workers` at a time, and
+    # submits ready tasks in list order so workers=1 is the plain sequential order.
+    # on_done runs on the calling thread as each task finishes. After the first failure
+    # nothing new starts; running tasks are drained and the first exception re-raised,
+    # leaving compensation to the caller.
+    _check(tasks)
+    pending = {t.name: set(t.deps) for t in tasks}
+    by_name = {t.name: t for t in tasks}
+    order = {t.name: i for i, t in enumerate(tasks)}
+    lanes: dict[int, int] = {}
+    lanes_lock = threading.Lock()
+    runs: list[TaskRun] = []
+
+    def timed(task: Task) -> TaskRun:
+        started = time.monotonic()
+        task.run()
+        with lanes_lock:
+            lane = lanes.setdefault(threading.get_ident(), len(lanes))
+        return TaskRun(name=task.name, started=started, ended=time.monotonic(), thread=lane)
+
+    failure: BaseException | None = None
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as ex:
+        running: dict[Future[TaskRun], str] = {}
+
+        def submit_ready() -> None:
+            for name in [n for n, d in pending.items() if not d]:
+                del pending[name]
+                running[ex.submit(timed, by_name[name])] = name
+
+        submit_ready()
+        while running:
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for f in sorted(finished, key=lambda f: order[running[f]]):
+                name = running.pop(f)
+                try:
+                    runs.append(f.result())
+                    if on_done is not None and failure is None:
+                        on_done(name)
+                except BaseException as exc:
+                    failure = failure or exc
+                    continue
+                for d in pending.values():
+                    d.discard(name)
+            if failure is None:
+                submit_ready()
+    if failure is not None:
+        raise failure
+    return runs
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import cProfile
+import json
+import pstats
+from collections import defaultdict
+from dataclasses import asdict
+from pathlib import Path
+
+from arm.adapters.git import GitCall, record_git_calls, stop_git_calls
+
+# `arm --profile out.pstats <command>` runs the command under cProfile and records every
+# run_git call. cProfile only sees the main thread; git calls made from release workers
+# are still recorded.
+
+
+class CommandProfile:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.calls: list[GitCall] = []
+        self._prof = cProfile.Profile()
+
+    def start(self) -> None:
+        record_git_calls(self.calls)
+        self._prof.enable()
+
+    def stop(self) -> None:
+        self._prof.disable()
+        stop_git_calls(self.calls)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._prof.dump_stats(str(self.path))
+        calls_path = self.path.with_name(self.path.name + ".git.json")
+        calls_path.write_text(json.dumps([asdict(c) for c in self.calls], indent=1) + "\n", encoding="utf-8")
+
+    def summary(self, *, limit: int = 10) -> str:
+        return "\n".join(
+            [*git_call_table(self.calls, limit=limit), "", *function_table(pstats.Stats(self._prof), limit=limit)]
+        )
+
+
+def git_call_table(calls: list[GitCall], *, limit: int) -> list[str]:
+    total = sum(c.duration for c in calls)
+    lines = [f"git: {len(calls)} calls, {total:.3f}s"]
+    by_sub: dict[str, list[GitCall]] = defaultdict(list)
+    for c in calls:
+        by_sub[c.subcommand].append(c)
+    lines.append(f"{'subcommand':<16}{'calls':>7}{'seconds':>10}{'stdout':>12}{'stderr':>10}")
+    for sub, cs in sorted(by_sub.items(), key=lambda kv: -sum(c.duration for c in kv[1]))[:limit]:
+        lines.append(
+            f"{sub:<16}{len(cs):>7}{sum(c.duration for c in cs):>10.3f}"
+            f"{sum(c.stdout_bytes for c in cs):>12}{sum(c.stderr_bytes for c in cs):>10}"
+        )
+    lines.append(f"{'slowest calls':<40}{'rc':>4}{'seconds':>10}")
+    for c in sorted(calls, key=lambda c: -c.duration)[:limit]:
+        lines.append(f"{' '.join(c.argv[1:4])[:40]:<40}{c.returncode:>4}{c.duration:>10.3f}")
+    return lines
+
+
+def function_table(stats: pstats.Stats, *, limit: int) -> list[str]:
+    rows = sorted(stats.stats.items(), key=lambda kv: -kv[1][3])[:limit]  # type: ignore[attr-defined]
+    lines = [f"python: top {len(rows)} functions by cumulative time", f"{'calls':>9}{'tottime':>10}{'cumtime':>10}  function"]
+    for (filename, line, func), (_, ncalls, tottime, cumtime, _) in rows:
+        where = f"{Path(filename).name}:{line}({func})" if line else func
+        lines.append(f"{ncalls:>9}{tottime:>10.3f}{cumtime:>10.3f}  {where}")
+    return lines
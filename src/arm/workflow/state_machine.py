@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import time
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
@@ -37,18 +39,40 @@ class ReleaseEvent:
     timestamp_utc: str
     reason: str
     artifacts: list[str] = field(default_factory=list)
+    # the stage that led to to_state: time.monotonic() bounds and git usage within it
+    started: float = 0.0
+    ended: float = 0.0
+    git_calls: int = 0
+    git_bytes: int = 0
+
+    @property
+    def duration(self) -> float:
+        return self.ended - self.started
+
+
+def _no_probe() -> tuple[int, int]:
+    return (0, 0)
 
 
 @dataclass(slots=True)
 class ReleaseContext:
     state: ReleaseState = ReleaseState.NEW
     events: list[ReleaseEvent] = field(default_factory=list)
+    # returns cumulative (git calls, bytes read from git); see arm.adapters.git.git_stats
+    probe: Callable[[], tuple[int, int]] = _no_probe
+    _mark: float = field(default_factory=time.monotonic)
+    _probe_mark: tuple[int, int] = (0, 0)
+
+    def __post_init__(self) -> None:
+        self._probe_mark = self.probe()
 
     def transition(self, to_state: ReleaseState, *, reason: str, artifacts: list[str] | None = None) -> None:
         allowed = _ALLOWED.get(self.state, set())
         if to_state not in allowed:
             raise StateMachineError(f"Invalid transition: {self.state} -> {to_state}")
         ts = datetime.now(timezone.utc).isoformat()
+        now = time.monotonic()
+        calls, nbytes = self.probe()
         self.events.append(
             ReleaseEvent(
                 from_state=self.state,
@@ -56,6 +80,12 @@ class ReleaseContext:
                 timestamp_utc=ts,
                 reason=reason,
                 artifacts=list(artifacts or []),
+                started=self._mark,
+                ended=now,
+                git_calls=calls - self._probe_mark[0],
+                git_bytes=nbytes - self._probe_mark[1],
             )
         )
         self.state = to_state
+        self._mark = now
+        self._probe_mark = (calls, nbytes)
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Sequence
+from pathlib import Path
+
+from arm.workflow.dag import TaskRun
+from arm.workflow.state_machine import ReleaseEvent
+
+
+def chrome_trace(events: list[ReleaseEvent], *, tasks: Sequence[TaskRun] = ()) -> dict:
+    # Trace Event Format, loadable in chrome://tracing or ui.perfetto.dev; one complete
+    # ("X") event per stage on lane 0 and per executor task on the lane of its worker,
+    # timestamps in microseconds from the first stage's start.
+    origin = events[0].started if events else min((t.started for t in tasks), default=0.0)
+    pid = os.getpid()
+    task_events = [
+        {
+            "name": t.name,
+            "cat": "task",
+            "ph": "X",
+            "ts": round((t.started - origin) * 1e6),
+            "dur": round((t.ended - t.started) * 1e6),
+            "pid": pid,
+            "tid": t.thread + 1,
+        }
+        for t in tasks
+    ]
+    return {
+        "displayTimeUnit": "ms",
+        "traceEvents": task_events + [
+            {
+                "name": e.to_state.value,
+                "cat": "release",
+                "ph": "X",
+                "ts": round((e.started - origin) * 1e6),
+                "dur": round(e.duration * 1e6),
+                "pid": pid,
+                "tid": 0,
+                "args": {
+                    "reason": e.reason,
+                    "git_calls": e.git_calls,
+                    "git_bytes": e.git_bytes,
+                    "artifacts": e.artifacts,
+                },
+            }
+            for e in events
+        ],
+    }
+
+
+def write_chrome_trace(path: Path, events: list[ReleaseEvent], *, tasks: Sequence[TaskRun] = ()) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(chrome_trace(events, tasks=tasks), indent=1) + "\n", encoding="utf-8")
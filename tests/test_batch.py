@@ -0,0 +1,75 @@
+import json
+import subprocess
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from arm import cli
+from arm.services.batch import BatchError, batch_argv
+from arm.services.repo_cache import RepoCache
+
+
+def _git(cwd: Path, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=str(cwd), check=True, capture_output=True)
+
+
+def _repo(tmp_path: Path) -> Path:
+    _git(tmp_path, "init")
+    _git(tmp_path, "config", "user.email", "test@example.com")
+    _git(tmp_path, "config", "user.name", "Tester")
+    (tmp_path / "file.txt").write_text("hi")
+    _git(tmp_path, "add", "file.txt")
+    _git(tmp_path, "commit", "-m", "feat: init")
+    _git(tmp_path, "tag", "v0.1.0")
+    _git(tmp_path, "commit", "--allow-empty", "-m", "fix: second")
+    return tmp_path
+
+
+def test_batch_argv_maps_args_to_options():
+    assert batch_argv(
+        {"cmd": "plan", "repo": "/r", "args": {"json": True, "tag_prefix": "v", "level": None, "format": ["zip", "tar.gz"]}}
+    ) == ["--repo", "/r", "plan", "--json", "--tag-prefix", "v", "--format", "zip", "--format", "tar.gz"]
+    assert batch_argv({"cmd": "changelog rebuild", "args": ["--dry-run"]}) == ["changelog", "rebuild", "--dry-run"]
+    assert batch_argv({"cmd": "verify", "args": {"_": ["a.zip"], "deep": True}}) == ["verify", "a.zip", "--deep"]
+    for bad in ({"args": {}}, {"cmd": "batch"}, {"cmd": "plan", "args": 3}, []):
+        with pytest.raises(BatchError):
+            batch_argv(bad)
+
+
+def test_batch_streams_results_in_order(tmp_path: Path):
+    repo = _repo(tmp_path)
+    lines = [
+        {"cmd": "plan", "repo": str(repo), "args": {"json": True}, "id": "a"},
+        {"cmd": "validate", "repo": str(repo)},
+        {"cmd": "plan", "repo": str(repo), "args": {"no_such_option": True}},
+        "not json",
+        {"cmd": "status", "repo": str(repo)},
+    ]
+    stdin = "\n".join(line if isinstance(line, str) else json.dumps(line) for line in lines) + "\n"
+    r = CliRunner().invoke(cli.app, ["batch"], input=stdin)
+    assert r.exit_code == 0, r.output
+    out = [json.loads(x) for x in r.output.splitlines()]
+    assert [o["index"] for o in out] == [0, 1, 2, 3, 4]
+    assert out[0]["id"] == "a" and out[0]["result"]["next_version"] == "0.1.1"
+    assert out[1]["exit_code"] == 0 and out[1]["stdout"] == "OK (1 commits)\n"
+    assert out[2]["exit_code"] == 2 and "no-such-option" in out[2]["stderr"]
+    assert out[3]["exit_code"] == 2 and out[3]["cmd"] is None
+    assert out[4]["result"]["last_tag"] == "v0.1.0"
+
+
+def test_repo_cache_reuses_ranges_until_refs_change(tmp_path: Path):
+    repo = _repo(tmp_path)
+    cache = RepoCache(repo)
+    assert cache.last_tag("v") == "v0.1.0"
+    commits, parsed, errors = cache.commits("v0.1.0", "HEAD")
+    assert len(commits) == 1 and not errors
+    assert cache.commits("v0.1.0", "HEAD")[0] is commits
+    assert cache.last_tag("v") == "v0.1.0"
+    assert cache.hits == 2
+
+    _git(repo, "commit", "--allow-empty", "-m", "feat: third")
+    assert len(cache.commits("v0.1.0", "HEAD")[0]) == 2
+    _git(repo, "tag", "v0.2.0")
+    assert cache.last_tag("v") == "v0.2.0"
+    assert cache.hits == 2
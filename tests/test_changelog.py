@@ -17,3 +17,31 @@ def test_render_groups():
     sec = render_release_section(SemVer.parse("1.0.0"), commits)
     assert "### Features" in sec
     assert "### Fixes" in sec
+
+
+def test_render_uses_release_date():
+    from datetime import date
+
+    sec = render_release_section(SemVer.parse("1.0.0"), [], release_date=date(2020, 5, 17))
+    assert sec.startswith("## 1.0.0 - 2020-05-17")
+
+
+def test_rebuild_matches_sequential_prepend_and_is_worker_independent():
+    from datetime import date
+
+    from arm.domain.models import Commit
+    from arm.services.changelog import rebuild_changelog
+
+    releases = [
+        (SemVer.parse(f"0.{i}.0"), [Commit(sha=str(i) * 40, subject=f"feat: item {i}", body="")], date(2024, 1, i + 1))
+        for i in range(1, 6)
+    ]
+    expected = ""
+    for v, commits, d in releases:
+        parsed = [
+            ConventionalCommit(type="feat", scope=None, description=c.subject.split(": ", 1)[1], breaking=False)
+            for c in commits
+        ]
+        expected = prepend_changelog(expected, render_release_section(v, parsed, release_date=d))
+    assert rebuild_changelog(releases, workers=1) == expected
+    assert rebuild_changelog(releases, workers=2) == expected
@@ -18,3 +18,23 @@ def test_validate_collects_errors():
     ok, errs = validate_commits(commits)
     assert len(ok) == 1
     assert len(errs) == 1
+
+
+def test_first_parent_modes_read_merges_for_their_branch_description():
+    commits = [
+        Commit(sha="a" * 40, subject="Merge pull request #7 from me/x", body="feat(api): add x\n\nBREAKING CHANGE: y", merge=True),
+        Commit(sha="b" * 40, subject="fix: squash-described merge", body="", merge=True),
+        Commit(sha="c" * 40, subject="Merge branch 'topic'", body="", merge=True),
+        Commit(sha="d" * 40, subject="docs: direct commit", body=""),
+    ]
+    ok, errs = validate_commits(commits, history_mode="first-parent")
+    assert [(c.type, c.description, c.breaking) for c in ok] == [
+        ("feat", "add x", True),
+        ("fix", "squash-described merge", False),
+        ("docs", "direct commit", False),
+    ]
+    assert [e.sha[0] for e in errs] == ["c"]
+
+    # "all" validates merges as written, like any other commit
+    ok, errs = validate_commits(commits, history_mode="all")
+    assert [e.sha[0] for e in errs] == ["a", "c"]
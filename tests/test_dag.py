@@ -0,0 +1,59 @@
+import threading
+
+import pytest
+
+from arm.workflow.dag import DagError, Task, run_dag
+
+
+def test_independent_tasks_overlap_and_deps_are_respected():
+    barrier = threading.Barrier(2, timeout=5)
+    log: list[str] = []
+
+    def step(name, wait=False):
+        def run():
+            if wait:
+                barrier.wait()  # only passes if both run at the same time
+            log.append(name)
+
+        return run
+
+    tasks = [
+        Task("a", step("a")),
+        Task("slow", step("slow", wait=True), deps=("a",)),
+        Task("b", step("b", wait=True), deps=("a",)),
+        Task("c", step("c"), deps=("b", "slow")),
+    ]
+    done: list[str] = []
+    runs = run_dag(tasks, workers=4, on_done=done.append)
+    assert log[0] == "a" and log[-1] == "c"
+    assert done[0] == "a" and done[-1] == "c"
+    assert {r.name for r in runs} == {"a", "slow", "b", "c"}
+
+
+def test_failure_drains_running_tasks_and_skips_dependents():
+    started = threading.Event()
+    ran: list[str] = []
+
+    def boom():
+        started.wait(5)
+        raise RuntimeError("boom")
+
+    def slow():
+        started.set()
+        ran.append("slow")
+
+    tasks = [
+        Task("boom", boom),
+        Task("slow", slow),
+        Task("after", lambda: ran.append("after"), deps=("boom",)),
+    ]
+    with pytest.raises(RuntimeError, match="boom"):
+        run_dag(tasks, workers=2)
+    assert ran == ["slow"]
+
+
+def test_cycles_and_unknown_deps_are_rejected():
+    with pytest.raises(DagError):
+        run_dag([Task("a", lambda: None, deps=("b",)), Task("b", lambda: None, deps=("a",))], workers=1)
+    with pytest.raises(DagError):
+        run_dag([Task("a", lambda: None, deps=("x",))], workers=1)
@@ -0,0 +1,79 @@
+import json
+import subprocess
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from arm import cli
+from arm.adapters.git import FileStat
+from arm.services import diffstats
+from arm.services.diffstats import diff_stats
+
+
+def _git(cwd: Path, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=str(cwd), check=True, capture_output=True)
+
+
+def _repo(tmp_path: Path) -> Path:
+    _git(tmp_path, "init")
+    _git(tmp_path, "config", "user.email", "test@example.com")
+    _git(tmp_path, "config", "user.name", "Tester")
+    (tmp_path / ".gitignore").write_text(".arm/\ndist/\n")
+    (tmp_path / "README").write_text("a\nb\n")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-m", "feat: base")
+    _git(tmp_path, "tag", "v1.0.0")
+    (tmp_path / "README").write_text("a\nc\nd\n")
+    (tmp_path / "src" / "core").mkdir(parents=True)
+    (tmp_path / "src" / "core" / "odd\tname.py").write_text("x = 1\n")
+    (tmp_path / "src" / "logo.bin").write_bytes(b"\0\1\2")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-m", "fix: change")
+    return tmp_path
+
+
+def test_numstat_is_parsed_per_file_and_per_scope(tmp_path: Path):
+    repo = _repo(tmp_path)
+    stats = diff_stats(repo_dir=repo, from_ref="v1.0.0", to_ref="HEAD")
+    assert sorted(stats.files, key=lambda f: f.path) == [
+        FileStat(path="README", added=2, deleted=1),
+        FileStat(path="src/core/odd\tname.py", added=1, deleted=0),
+        FileStat(path="src/logo.bin", added=None, deleted=None),
+    ]
+    assert stats.totals() == {"files": 3, "insertions": 3, "deletions": 1, "binary": 1}
+    assert stats.by_scope(depth=1) == {
+        ".": {"files": 1, "insertions": 2, "deletions": 1},
+        "src": {"files": 2, "insertions": 1, "deletions": 0},
+    }
+    assert set(stats.by_scope(depth=2)) == {".", "src", "src/core"}
+
+    first = diff_stats(repo_dir=repo, from_ref=None, to_ref="v1.0.0")
+    assert {f.path for f in first.files} == {".gitignore", "README"}
+
+
+def test_ranges_are_cached_by_sha(tmp_path: Path, monkeypatch):
+    repo = _repo(tmp_path)
+    stats = diff_stats(repo_dir=repo, from_ref="v1.0.0", to_ref="HEAD")
+    assert not stats.cached
+
+    def no_diff(**kwargs):
+        raise AssertionError("range was already diffed")
+
+    monkeypatch.setattr(diffstats, "iter_numstat", no_diff)
+    again = diff_stats(repo_dir=repo, from_ref="v1.0.0", to_ref="HEAD")
+    assert again.cached and again.files == stats.files
+
+
+def test_plan_and_release_include_diff_stats(tmp_path: Path):
+    repo = _repo(tmp_path)
+    runner = CliRunner()
+    r = runner.invoke(cli.app, ["--repo", str(repo), "plan", "--json", "--diff-stats", "files"])
+    assert r.exit_code == 0, r.output
+    data = json.loads(r.stdout)
+    assert data["diff_stats"]["files"] == 3 and len(data["diff_stats"]["per_file"]) == 3
+    assert "### Diff Stats\n- 3 files changed, +3 -1" in data["changelog_preview"]
+
+    r = runner.invoke(cli.app, ["--repo", str(repo), "release", "--project-name", "x", "--diff-stats", "summary"])
+    assert r.exit_code == 0, r.output
+    assert json.loads(r.stdout)["diff_stats"]["cached"] is True
+    assert "- `src`: 2 files, +1 -0" in (repo / "CHANGELOG.md").read_text()
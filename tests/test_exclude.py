@@ -0,0 +1,88 @@
+import fnmatch
+import itertools
+import os
+from pathlib import Path
+
+from arm.services.exclude import ExcludeMatcher
+from arm.services.packager import PackageSpec, _iter_walk_files
+
+DEFAULTS = PackageSpec(project_name="p", version="1", repo_dir=Path("."), dist_dir=Path("dist")).exclude_globs
+
+
+def _legacy_is_excluded(rel_posix: str, globs: tuple[str, ...]) -> bool:
+    # matcher used before patterns were compiled
+    for g in globs:
+        if fnmatch.fnmatch(rel_posix, g) or fnmatch.fnmatch(rel_posix + "/", g):
+            return True
+    return False
+
+
+def _legacy_walk(root: Path, globs: tuple[str, ...]) -> list[str]:
+    out = []
+    for r, dirs, files in os.walk(root):
+        rel_root = Path(r).relative_to(root).as_posix()
+        prefix = (rel_root + "/") if rel_root != "." else ""
+        dirs[:] = sorted(d for d in dirs if not _legacy_is_excluded(prefix + d, globs))
+        out += [prefix + f for f in sorted(files) if not _legacy_is_excluded(prefix + f, globs)]
+    return out
+
+
+_NAMES = [".git", ".arm", "dist", ".venv", "__pycache__", "src", "x.pyc", "a.py", "pyc", ".gitx"]
+
+
+def test_defaults_match_legacy_decisions_for_every_path():
+    matcher = ExcludeMatcher(DEFAULTS)
+    for depth in (1, 2, 3):
+        for parts in itertools.product(_NAMES, repeat=depth):
+            rel = "/".join(parts)
+            legacy = any(_legacy_is_excluded("/".join(parts[:i]), DEFAULTS) for i in range(1, depth + 1))
+            assert matcher.excludes(rel) == legacy, rel
+            assert matcher.excludes_dir(rel) == legacy, rel
+
+
+def test_defaults_match_legacy_walk(tmp_path: Path):
+    for parts in itertools.product(_NAMES[:6], ["a.py", "x.pyc", ".git"]):
+        d = tmp_path.joinpath(*parts[:-1])
+        d.mkdir(parents=True, exist_ok=True)
+        (d / parts[-1]).write_text("x")
+    (tmp_path / "src" / "__pycache__").mkdir()
+    (tmp_path / "src" / "__pycache__" / "m.cpython.pyc").write_text("x")
+    (tmp_path / "src" / "__pycache__" / "keep.txt").write_text("x")
+    spec = PackageSpec(project_name="p", version="1", repo_dir=tmp_path, dist_dir=tmp_path / "dist")
+    assert list(_iter_walk_files(spec)) == _legacy_walk(tmp_path, DEFAULTS)
+
+
+def test_gitignore_semantics():
+    m = ExcludeMatcher(("build/", "**/tmp", "docs/**/*.png", "*.log", "!keep.log", "/top.txt", "data/*", "!data/ok"))
+    assert m.excludes("build", is_dir=True)
+    assert m.excludes("a/build/x.o")
+    assert not m.excludes("build")  # directory-only pattern, "build" is a file here
+    assert m.excludes("tmp/x") and m.excludes("a/b/tmp/x")
+    assert m.excludes("docs/img.png") and m.excludes("docs/a/b/img.png")
+    assert not m.excludes("docs/a/img.jpg")
+    assert m.excludes("x/err.log")
+    assert not m.excludes("x/keep.log")
+    assert m.excludes("top.txt") and not m.excludes("a/top.txt")
+    assert m.excludes("data/x") and not m.excludes("data/ok")
+    assert not m.excludes("src/data/x")
+
+
+def test_excluded_directory_cannot_be_reincluded():
+    m = ExcludeMatcher(("out/", "!out/keep.txt"))
+    assert m.excludes("out/keep.txt")
+
+
+def test_duplicate_patterns_keep_last_match_semantics():
+    assert ExcludeMatcher(("*.pyc", "*.pyc")).excludes("a/x.pyc")
+    m = ExcludeMatcher(("*.log", "!keep.log", "*.log"))
+    assert m.excludes("keep.log")
+    m = ExcludeMatcher(("*.log", "!keep.log", "*.log", "!keep.log"))
+    assert not m.excludes("keep.log") and m.excludes("other.log")
+
+
+def test_bracket_right_after_open_is_a_class_member():
+    m = ExcludeMatcher(("[]a]",))
+    assert m.excludes("]") and m.excludes("d/a") and not m.excludes("b")
+    m = ExcludeMatcher(("a/[!]]x", "[^]b]y"))
+    assert m.excludes("a/bx") and not m.excludes("a/]x")
+    assert m.excludes("cy") and not m.excludes("]y") and not m.excludes("by")
@@ -0,0 +1,53 @@
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from arm.adapters.git import GitError, RefUpdate, create_tag, delete_tags, push_atomic, tag_refs, update_refs
+
+
+def _git(cwd: Path, *args: str) -> str:
+    return subprocess.run(["git", *args], cwd=str(cwd), text=True, capture_output=True, check=True).stdout
+
+
+def _repo(path: Path) -> str:
+    path.mkdir(exist_ok=True)
+    _git(path, "init", "-b", "main")
+    _git(path, "config", "user.email", "test@example.com")
+    _git(path, "config", "user.name", "Tester")
+    _git(path, "commit", "--allow-empty", "-m", "feat: base")
+    return _git(path, "rev-parse", "HEAD").strip()
+
+
+def test_ref_transaction_is_all_or_nothing(tmp_path: Path):
+    head = _repo(tmp_path)
+    create_tag(repo_dir=tmp_path, tag="v1")
+    with pytest.raises(GitError):
+        create_tag(repo_dir=tmp_path, tag="v1")
+    with pytest.raises(GitError):
+        update_refs(
+            repo_dir=tmp_path,
+            updates=[RefUpdate(ref="refs/tags/v2", new=head, old=""), RefUpdate(ref="refs/tags/v1", new=head, old="")],
+        )
+    assert set(tag_refs(repo_dir=tmp_path)) == {"v1"}
+
+
+def test_delete_tags_batches_and_skips_missing(tmp_path: Path):
+    head = _repo(tmp_path)
+    update_refs(repo_dir=tmp_path, updates=[RefUpdate(ref=f"refs/tags/t{i}", new=head, old="") for i in range(100)])
+    _git(tmp_path, "tag", "-a", "annotated", "-m", "x")
+    deleted = delete_tags(repo_dir=tmp_path, tags=[*(f"t{i}" for i in range(100)), "annotated", "missing"])
+    assert len(deleted) == 101
+    assert tag_refs(repo_dir=tmp_path) == {}
+
+
+def test_push_atomic_sends_branch_and_tag_together(tmp_path: Path):
+    remote = tmp_path / "remote.git"
+    _git(tmp_path, "init", "--bare", str(remote))
+    repo = tmp_path / "repo"
+    _repo(repo)
+    _git(repo, "remote", "add", "origin", str(remote))
+    create_tag(repo_dir=repo, tag="v1")
+    push_atomic(repo_dir=repo, remote="origin", refspecs=["main", "refs/tags/v1"])
+    assert "refs/tags/v1" in _git(remote, "show-ref")
+    assert "refs/heads/main" in _git(remote, "show-ref")
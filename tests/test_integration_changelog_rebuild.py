@@ -0,0 +1,58 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+
+def _run(cwd: Path, *args: str) -> subprocess.CompletedProcess:
+    project_root = Path(__file__).resolve().parents[1]
+    src_dir = project_root / "src"
+    env = os.environ.copy()
+    current_pp = env.get("PYTHONPATH", "")
+    env["PYTHONPATH"] = f"{src_dir}{os.pathsep}{current_pp}" if current_pp else str(src_dir)
+    return subprocess.run(
+        [sys.executable, "-m", "arm.cli", *args],
+        cwd=str(cwd),
+        text=True,
+        capture_output=True,
+        env=env,
+    )
+
+
+def _git(cwd: Path, *args: str, env: dict | None = None) -> subprocess.CompletedProcess:
+    return subprocess.run(["git", *args], cwd=str(cwd), text=True, capture_output=True, check=True, env=env)
+
+
+def _commit(cwd: Path, name: str, message: str, day: str) -> None:
+    (cwd / name).write_text(message)
+    _git(cwd, "add", name)
+    env = os.environ.copy()
+    env["GIT_COMMITTER_DATE"] = f"{day}T12:00:00+00:00"
+    env["GIT_AUTHOR_DATE"] = f"{day}T12:00:00+00:00"
+    _git(cwd, "commit", "-m", message, env=env)
+
+
+def test_changelog_rebuild_covers_every_tag_range(tmp_path: Path):
+    _git(tmp_path, "init")
+    _git(tmp_path, "config", "user.email", "test@example.com")
+    _git(tmp_path, "config", "user.name", "Tester")
+
+    _commit(tmp_path, "a.txt", "feat: first", "2024-01-01")
+    _git(tmp_path, "tag", "v0.1.0")
+    _commit(tmp_path, "b.txt", "fix(core): second", "2024-02-01")
+    _commit(tmp_path, "c.txt", "chore(release): v0.1.1", "2024-02-02")
+    _git(tmp_path, "tag", "-a", "v0.1.1", "-m", "release v0.1.1")
+    _commit(tmp_path, "d.txt", "feat!: third", "2024-03-01")
+    _git(tmp_path, "tag", "v1.0.0")
+    _commit(tmp_path, "e.txt", "feat: unreleased", "2024-04-01")
+
+    r = _run(tmp_path, "--repo", str(tmp_path), "changelog", "rebuild", "--workers", "2")
+    assert r.returncode == 0, (r.stdout, r.stderr)
+    assert json.loads(r.stdout)["sections"] == 3
+
+    text = (tmp_path / "CHANGELOG.md").read_text(encoding="utf-8")
+    assert text.index("## 1.0.0 - 2024-03-01") < text.index("## 0.1.1 - 2024-02-02") < text.index("## 0.1.0 - 2024-01-01")
+    assert "**core**: second" in text
+    assert "unreleased" not in text
+    assert "v0.1.1" not in text
@@ -40,3 +40,53 @@ def test_release_dry_run_has_no_side_effects(tmp_path: Path):
 
     st = subprocess.run(["git", "status", "--porcelain"], cwd=str(tmp_path), text=True, capture_output=True)
     assert st.stdout.strip() == ""
+
+
+def test_release_trace_exports_one_event_per_stage(tmp_path: Path):
+    subprocess.run(["git", "init"], cwd=str(tmp_path), check=True)
+    subprocess.run(["git", "config", "user.email", "test@example.com"], cwd=str(tmp_path), check=True)
+    subprocess.run(["git", "config", "user.name", "Tester"], cwd=str(tmp_path), check=True)
+    (tmp_path / "file.txt").write_text("hi")
+    subprocess.run(["git", "add", "file.txt"], cwd=str(tmp_path), check=True)
+    subprocess.run(["git", "commit", "-m", "feat: init"], cwd=str(tmp_path), check=True)
+
+    trace = tmp_path.parent / f"{tmp_path.name}-trace.json"
+    p = _run(tmp_path, "--repo", str(tmp_path), "release", "--dry-run", "--trace", str(trace))
+    assert p.returncode == 0, (p.stdout, p.stderr)
+    events = json.loads(trace.read_text())["traceEvents"]
+    tasks = [e for e in events if e["cat"] == "task"]
+    assert {e["name"] for e in tasks} == {"changelog", "commit", "tag", "package", "verify", "journal", "push"}
+    events = [e for e in events if e["cat"] == "release"]
+    assert [e["name"] for e in events] == [
+        "DIFF_COLLECTED",
+        "COMMITS_VALIDATED",
+        "VERSION_BUMPED",
+        "CHANGELOG_WRITTEN",
+        "PACKAGED",
+        "COMPLETED",
+    ]
+    assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+    assert events[0]["args"]["git_calls"] >= 1
+
+
+def test_profile_writes_pstats_and_git_calls(tmp_path: Path):
+    import pstats
+
+    subprocess.run(["git", "init"], cwd=str(tmp_path), check=True, text=True, capture_output=True)
+    subprocess.run(["git", "config", "user.email", "test@example.com"], cwd=str(tmp_path), check=True)
+    subprocess.run(["git", "config", "user.name", "Tester"], cwd=str(tmp_path), check=True)
+    (tmp_path / "file.txt").write_text("hi")
+    subprocess.run(["git", "add", "file.txt"], cwd=str(tmp_path), check=True)
+    subprocess.run(["git", "commit", "-m", "feat: init"], cwd=str(tmp_path), check=True)
+
+    out = tmp_path / "prof" / "plan.pstats"
+    p = _run(tmp_path, "--repo", str(tmp_path), "--profile", str(out), "plan", "--json")
+    assert p.returncode == 0, (p.stdout, p.stderr)
+    json.loads(p.stdout)  # the summary goes to stderr only
+    assert "git:" in p.stderr and "python: top" in p.stderr
+
+    assert pstats.Stats(str(out)).total_calls > 0
+    calls = json.loads(out.with_name("plan.pstats.git.json").read_text())
+    assert any(c["argv"][1] == "log" for c in calls)
+    # no tags yet, so `git describe` fails and is recorded with its exit code
+    assert any(c["argv"][1] == "describe" and c["returncode"] != 0 and c["stderr_bytes"] for c in calls)
@@ -0,0 +1,53 @@
+import json
+import subprocess
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from arm import cli
+
+
+def _git(cwd: Path, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=str(cwd), check=True, capture_output=True)
+
+
+def _merge_heavy_repo(path: Path) -> Path:
+    _git(path, "init", "-b", "main")
+    _git(path, "config", "user.email", "test@example.com")
+    _git(path, "config", "user.name", "Tester")
+    _git(path, "commit", "--allow-empty", "-m", "feat: base")
+    _git(path, "tag", "v1.0.0")
+    for i in range(3):
+        _git(path, "checkout", "-q", "-b", f"topic{i}", "main")
+        for j in range(5):
+            _git(path, "commit", "--allow-empty", "-m", f"wip {j}")  # not conventional
+        _git(path, "checkout", "-q", "main")
+        _git(path, "merge", "--no-ff", f"topic{i}", "-m", f"Merge pull request #{i} from me/topic{i}", "-m", f"fix: topic {i}")
+    _git(path, "commit", "--allow-empty", "-m", "feat: direct")
+    return path
+
+
+def _plan(repo: Path, *args: str):
+    return CliRunner().invoke(cli.app, ["--repo", str(repo), "plan", "--json", *args])
+
+
+def test_history_modes_limit_the_commits_parsed(tmp_path: Path):
+    repo = _merge_heavy_repo(tmp_path)
+    r = _plan(repo)
+    assert r.exit_code == 2  # every wip commit fails validation
+
+    r = _plan(repo, "--history-mode", "first-parent")
+    assert r.exit_code == 0, r.output
+    data = json.loads(r.stdout)
+    assert (data["next_version"], data["bump"]) == ("1.1.0", "minor")
+    assert "topic 2" in data["changelog_preview"] and "wip" not in data["changelog_preview"]
+
+    r = _plan(repo, "--history-mode", "merges-only")
+    data = json.loads(r.stdout)
+    assert (data["next_version"], data["bump"]) == ("1.0.1", "patch")
+
+    (repo / "arm.toml").write_text('[policy]\nhistory_mode = "first-parent"\n')
+    r = CliRunner().invoke(cli.app, ["--repo", str(repo), "--config", str(repo / "arm.toml"), "validate"])
+    assert r.exit_code == 0 and "OK (4 commits)" in r.stdout
+
+    assert _plan(repo, "--history-mode", "bogus").exit_code == 2
@@ -0,0 +1,63 @@
+import json
+import os
+import subprocess
+import sys
+import zipfile
+from pathlib import Path
+
+
+def _run(cwd: Path, *args: str) -> subprocess.CompletedProcess:
+    project_root = Path(__file__).resolve().parents[1]
+    src_dir = project_root / "src"
+    env = os.environ.copy()
+    current_pp = env.get("PYTHONPATH", "")
+    env["PYTHONPATH"] = f"{src_dir}{os.pathsep}{current_pp}" if current_pp else str(src_dir)
+    return subprocess.run(
+        [sys.executable, "-m", "arm.cli", *args],
+        cwd=str(cwd),
+        text=True,
+        capture_output=True,
+        env=env,
+    )
+
+
+def _git(cwd: Path, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(["git", *args], cwd=str(cwd), text=True, capture_output=True, check=True)
+
+
+def test_package_old_tag_without_checkout(tmp_path: Path):
+    _git(tmp_path, "init")
+    _git(tmp_path, "config", "user.email", "test@example.com")
+    _git(tmp_path, "config", "user.name", "Tester")
+    (tmp_path / "file.txt").write_text("old")
+    _git(tmp_path, "add", "file.txt")
+    _git(tmp_path, "commit", "-m", "feat: old")
+    _git(tmp_path, "tag", "v0.1.0")
+    (tmp_path / "file.txt").write_text("new")
+    _git(tmp_path, "commit", "-am", "feat: new")
+
+    r = _run(tmp_path, "--repo", str(tmp_path), "package", "--ref", "v0.1.0", "--project-name", "x")
+    assert r.returncode == 0, (r.stdout, r.stderr)
+    (artifact,) = json.loads(r.stdout)["artifacts"]
+    assert Path(artifact).name == "x-0.1.0.zip"
+    with zipfile.ZipFile(artifact) as zf:
+        assert zf.read("file.txt") == b"old"
+    assert (tmp_path / "file.txt").read_text() == "new"
+    assert _git(tmp_path, "status", "--porcelain", "--untracked-files=no").stdout.strip() == ""
+
+
+def test_verify_command_reports_corrupt_artifact(tmp_path: Path):
+    _git(tmp_path, "init")
+    (tmp_path / "file.txt").write_text("data\n" * 100)
+    r = _run(tmp_path, "--repo", str(tmp_path), "package", "--version", "1.0.0", "--project-name", "x")
+    assert r.returncode == 0, (r.stdout, r.stderr)
+    (artifact,) = json.loads(r.stdout)["artifacts"]
+
+    r = _run(tmp_path, "--repo", str(tmp_path), "verify", artifact, "--deep")
+    assert r.returncode == 0, (r.stdout, r.stderr)
+    assert json.loads(r.stdout)[0]["ok"] is True
+
+    Path(artifact).write_bytes(Path(artifact).read_bytes()[:-10])
+    r = _run(tmp_path, "--repo", str(tmp_path), "verify", artifact)
+    assert r.returncode == 1
+    assert json.loads(r.stdout)[0]["problems"]
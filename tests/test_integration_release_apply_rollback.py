@@ -44,7 +44,7 @@ def test_release_apply_then_rollback_restores_state(tmp_path: Path):
     assert release_data["dry_run"] is False
     assert release_data["tag"] == "v0.2.0"
     assert (tmp_path / "CHANGELOG.md").exists()
-    assert (tmp_path / ".arm" / "last_release.json").exists()
+    assert (tmp_path / ".arm" / "journal.jsonl").exists()
     assert (tmp_path / "dist" / "x-0.2.0.zip").exists()
 
     tags = _git(tmp_path, "tag", "--list").stdout
@@ -57,8 +57,70 @@ def test_release_apply_then_rollback_restores_state(tmp_path: Path):
 
     tags_after = _git(tmp_path, "tag", "--list").stdout
     assert "v0.2.0" not in tags_after
-    assert not (tmp_path / ".arm" / "last_release.json").exists()
+    journal = _run(tmp_path, "--repo", str(tmp_path), "journal")
+    assert [r["kind"] for r in json.loads(journal.stdout)] == ["rollback", "release"]
+    again = _run(tmp_path, "--repo", str(tmp_path), "rollback")
+    assert again.returncode == 1
     assert not (tmp_path / "dist" / "x-0.2.0.zip").exists()
     # Changelog did not exist before release.
     assert not (tmp_path / "CHANGELOG.md").exists()
 
+
+
+def test_release_records_every_package_format_for_rollback(tmp_path: Path):
+    _git(tmp_path, "init")
+    _git(tmp_path, "config", "user.email", "test@example.com")
+    _git(tmp_path, "config", "user.name", "Tester")
+    (tmp_path / "file.txt").write_text("base")
+    _git(tmp_path, "add", "file.txt")
+    _git(tmp_path, "commit", "-m", "fix: baseline")
+
+    r = _run(
+        tmp_path, "--repo", str(tmp_path), "release", "--project-name", "x",
+        "--format", "zip", "--format", "tar.gz", "--format", "sha256sums",
+    )
+    assert r.returncode == 0, (r.stdout, r.stderr)
+    names = sorted(Path(a).name for a in json.loads(r.stdout)["artifacts"])
+    assert names == ["x-0.1.1.SHA256SUMS", "x-0.1.1.tar.gz", "x-0.1.1.zip"]
+
+    rr = _run(tmp_path, "--repo", str(tmp_path), "rollback")
+    assert rr.returncode == 0, (rr.stdout, rr.stderr)
+    assert not any((tmp_path / "dist").iterdir())
+
+
+def _two_releases(tmp_path: Path) -> None:
+    _git(tmp_path, "init")
+    _git(tmp_path, "config", "user.email", "test@example.com")
+    _git(tmp_path, "config", "user.name", "Tester")
+    (tmp_path / ".gitignore").write_text(".arm/\ndist/\n")
+    _git(tmp_path, "add", ".gitignore")
+    _git(tmp_path, "commit", "-m", "chore: baseline")
+    _git(tmp_path, "tag", "v0.1.0")
+    for msg in ("feat: one", "fix: two"):
+        _git(tmp_path, "commit", "--allow-empty", "-m", msg)
+        r = _run(tmp_path, "--repo", str(tmp_path), "release", "--project-name", "x")
+        assert r.returncode == 0, (r.stdout, r.stderr)
+
+
+def test_hard_rollback_of_an_older_release_is_refused(tmp_path: Path):
+    _two_releases(tmp_path)
+    head = _git(tmp_path, "rev-parse", "HEAD").stdout
+    rr = _run(tmp_path, "--repo", str(tmp_path), "rollback", "--hard", "--steps", "2")
+    assert rr.returncode == 1
+    assert "newest release" in rr.stderr
+    assert _git(tmp_path, "rev-parse", "HEAD").stdout == head
+    assert _git(tmp_path, "tag", "--list").stdout.split() == ["v0.1.0", "v0.2.0", "v0.2.1"]
+
+
+def test_failed_revert_keeps_tag_and_journal(tmp_path: Path):
+    _two_releases(tmp_path)
+    head = _git(tmp_path, "rev-parse", "HEAD").stdout
+    # 0.2.0 created CHANGELOG.md and 0.2.1 edited it, so reverting 0.2.0 conflicts
+    rr = _run(tmp_path, "--repo", str(tmp_path), "rollback", "--steps", "2")
+    assert rr.returncode == 1
+    assert "revert commit" in rr.stderr and "Traceback" not in rr.stderr
+    assert _git(tmp_path, "rev-parse", "HEAD").stdout == head
+    assert _git(tmp_path, "status", "--porcelain").stdout == ""
+    assert "v0.2.0" in _git(tmp_path, "tag", "--list").stdout.split()
+    journal = json.loads(_run(tmp_path, "--repo", str(tmp_path), "journal").stdout)
+    assert [r["kind"] for r in journal] == ["release", "release"]
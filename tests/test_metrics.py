@@ -0,0 +1,78 @@
+import json
+import subprocess
+import threading
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from arm import cli
+from arm.services.metrics import MetricsRecorder, state_path, write_textfile
+
+
+def _samples(text: str) -> dict[str, float]:
+    out = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            out[name] = float(value)
+    return out
+
+
+def test_runs_merge_counters_and_histograms_and_replace_gauges(tmp_path: Path):
+    path = tmp_path / "arm.prom"
+    for size in (100, 50):
+        m = MetricsRecorder(repo="r")
+        m.inc("arm_commits_parsed", 3)
+        m.set("arm_artifact_bytes", size, format="zip")
+        m.observe("arm_command_duration_seconds", 0.2, command="plan")
+        write_textfile(path, m)
+
+    text = path.read_text()
+    assert text.endswith("# EOF\n")
+    s = _samples(text)
+    assert s['arm_commits_parsed_total{repo="r"}'] == 6
+    assert s['arm_artifact_bytes{format="zip",repo="r"}'] == 50
+    assert s['arm_command_duration_seconds_bucket{command="plan",repo="r",le="0.1"}'] == 0
+    assert s['arm_command_duration_seconds_bucket{command="plan",repo="r",le="0.25"}'] == 2
+    assert s['arm_command_duration_seconds_bucket{command="plan",repo="r",le="+Inf"}'] == 2
+    assert s['arm_command_duration_seconds_count{command="plan",repo="r"}'] == 2
+    assert json.loads(state_path(path).read_text())["format"] == 1
+
+
+def test_concurrent_writers_do_not_lose_updates(tmp_path: Path):
+    path = tmp_path / "arm.prom"
+
+    def run():
+        for _ in range(10):
+            m = MetricsRecorder(repo="r")
+            m.inc("arm_releases", bump="patch")
+            write_textfile(path, m)
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert _samples(path.read_text())['arm_releases_total{bump="patch",repo="r"}'] == 40
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_metrics_file_option_records_command_and_git_calls(tmp_path: Path):
+    def git(*args):
+        subprocess.run(["git", *args], cwd=str(tmp_path), check=True, capture_output=True)
+
+    git("init")
+    git("config", "user.email", "test@example.com")
+    git("config", "user.name", "Tester")
+    (tmp_path / "file.txt").write_text("hi")
+    git("add", "file.txt")
+    git("commit", "-m", "feat: init")
+    out = tmp_path / "metrics" / "arm.prom"
+
+    r = CliRunner().invoke(cli.app, ["--repo", str(tmp_path), "--metrics-file", str(out), "plan", "--json"])
+    assert r.exit_code == 0, r.output
+    s = _samples(out.read_text())
+    repo = str(tmp_path)
+    assert s[f'arm_command_duration_seconds_count{{command="plan",repo="{repo}"}}'] == 1
+    assert s[f'arm_commits_parsed_total{{repo="{repo}"}}'] == 1
+    assert s[f'arm_git_calls_total{{repo="{repo}",subcommand="log"}}'] == 1
@@ -1,6 +1,10 @@
+import io
+import zipfile
+import zlib
 from pathlib import Path
 
 from arm.services.packager import PackageSpec, build_zip
+from arm.services.zip_writer import ZipWriter, make_entry
 
 
 def test_packager_excludes_git(tmp_path: Path):
@@ -10,3 +14,281 @@ def test_packager_excludes_git(tmp_path: Path):
     dist = tmp_path / "dist"
     z = build_zip(PackageSpec(project_name="p", version="1.0.0", repo_dir=tmp_path, dist_dir=dist))
     assert z.exists()
+    with zipfile.ZipFile(z) as zf:
+        assert zf.namelist() == ["a.txt"]
+        assert zf.read("a.txt") == b"yes"
+
+
+def test_parallel_build_is_byte_identical_to_sequential(tmp_path: Path):
+    src = tmp_path / "src"
+    for i in range(40):
+        d = src / f"pkg{i % 4}"
+        d.mkdir(parents=True, exist_ok=True)
+        (d / f"m{i}.py").write_text(f"value = {i}\n" * (i * 50))
+    (src / "ünïcode.txt").write_text("x")
+    (src / "empty").write_bytes(b"")
+
+    seq = build_zip(PackageSpec(project_name="p", version="1", repo_dir=src, dist_dir=tmp_path / "d1"))
+    par = build_zip(PackageSpec(project_name="p", version="1", repo_dir=src, dist_dir=tmp_path / "d2", workers=4))
+    assert seq.read_bytes() == par.read_bytes()
+    with zipfile.ZipFile(par) as zf:
+        assert zf.testzip() is None
+        assert len(zf.namelist()) == 42
+        assert zf.read("pkg1/m5.py") == (src / "pkg1" / "m5.py").read_bytes()
+        assert zf.getinfo("ünïcode.txt").external_attr >> 16 == (src / "ünïcode.txt").stat().st_mode
+
+
+def test_zip_writer_emits_zip64_end_records_for_many_entries():
+    buf = io.BytesIO()
+    w = ZipWriter(buf)
+    for i in range(70_000):
+        w.add(make_entry(f"f{i}", b"", mtime=0, mode=0o100644))
+    w.close()
+    with zipfile.ZipFile(buf) as zf:
+        assert len(zf.infolist()) == 70_000
+        assert zf.read("f69999") == b""
+
+
+def test_git_source_packages_only_tracked_files(tmp_path: Path):
+    import subprocess
+
+    def git(*args: str) -> None:
+        subprocess.run(["git", *args], cwd=str(tmp_path), check=True, capture_output=True)
+
+    git("init")
+    (tmp_path / "tracked.txt").write_text("t")
+    (tmp_path / "gone.txt").write_text("g")
+    (tmp_path / "sub dir").mkdir()
+    (tmp_path / "sub dir" / "x.py").write_text("x")
+    (tmp_path / ".gitignore").write_text("node_modules/\n")
+    git("add", ".")
+    (tmp_path / "gone.txt").unlink()
+    (tmp_path / "node_modules" / "dep").mkdir(parents=True)
+    (tmp_path / "node_modules" / "dep" / "index.js").write_text("ignored")
+    (tmp_path / "untracked.txt").write_text("u")
+
+    spec = dict(project_name="p", repo_dir=tmp_path, dist_dir=tmp_path / "dist", source="git")
+    z = build_zip(PackageSpec(version="1", **spec))
+    with zipfile.ZipFile(z) as zf:
+        assert sorted(zf.namelist()) == [".gitignore", "sub dir/x.py", "tracked.txt"]
+
+    z = build_zip(PackageSpec(version="2", include_untracked=True, **spec))
+    with zipfile.ZipFile(z) as zf:
+        assert sorted(zf.namelist()) == [".gitignore", "sub dir/x.py", "tracked.txt", "untracked.txt"]
+
+
+def test_incremental_build_reuses_unchanged_entries_and_matches_full_rebuild(tmp_path: Path):
+    from arm.services.packager import build_package
+
+    src = tmp_path / "src"
+    src.mkdir()
+    for i in range(20):
+        (src / f"f{i}.txt").write_text(f"line {i}\n" * 200)
+    dist = tmp_path / "dist"
+    base = dict(project_name="p", repo_dir=src, dist_dir=dist)
+    first = build_package(PackageSpec(version="1", incremental=True, **base))
+    assert first.reused == 0
+
+    (src / "f3.txt").write_text("changed\n")
+    (src / "f4.txt").chmod(0o755)
+    (src / "new.txt").write_text("new\n")
+    inc = build_package(PackageSpec(version="2", incremental=True, **base))
+    assert inc.reused == 19  # a mode change does not change the compressed payload
+    full = build_zip(PackageSpec(version="2", project_name="p", repo_dir=src, dist_dir=tmp_path / "full"))
+    assert inc.artifacts[0].read_bytes() == full.read_bytes()
+
+
+def test_incremental_build_ignores_artifact_that_disagrees_with_manifest(tmp_path: Path):
+    from arm.services.packager import build_package
+
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "a.txt").write_text("a" * 1000)
+    dist = tmp_path / "dist"
+    prev = build_zip(PackageSpec(project_name="p", version="1", repo_dir=src, dist_dir=dist))
+    other = tmp_path / "other"
+    other.mkdir()
+    (other / "a.txt").write_text("b" * 1000)
+    # same name, different content: the manifest no longer describes the zip
+    prev.write_bytes(build_zip(PackageSpec(project_name="q", version="1", repo_dir=other, dist_dir=tmp_path / "d")).read_bytes())
+
+    res = build_package(PackageSpec(project_name="p", version="2", repo_dir=src, dist_dir=dist, incremental=True))
+    assert res.reused == 0
+    with zipfile.ZipFile(res.artifacts[0]) as zf:
+        assert zf.read("a.txt") == b"a" * 1000
+
+
+def test_all_formats_are_fed_from_one_read_and_checksummed(tmp_path: Path):
+    import hashlib
+    import json
+    import tarfile
+
+    from arm.services.packager import build_package, manifest_path
+
+    src = tmp_path / "src"
+    (src / "pkg").mkdir(parents=True)
+    (src / "pkg" / "a.py").write_text("print('a')\n" * 100)
+    (src / "b.bin").write_bytes(bytes(range(256)) * 10)
+    formats = ("zip", "tar.gz", "tar.xz", "sha256sums")
+    spec = dict(project_name="p", version="1", repo_dir=src, formats=formats)
+    res = build_package(PackageSpec(dist_dir=tmp_path / "d1", **spec))
+    assert [a.name for a in res.artifacts] == ["p-1.zip", "p-1.tar.gz", "p-1.tar.xz", "p-1.SHA256SUMS"]
+
+    with zipfile.ZipFile(res.artifacts[0]) as zf:
+        expected = {n: zf.read(n) for n in zf.namelist()}
+    for archive in res.artifacts[1:3]:
+        with tarfile.open(archive) as tf:
+            assert {m.name: tf.extractfile(m).read() for m in tf.getmembers()} == expected
+
+    sums = res.artifacts[3].read_text().splitlines()
+    assert sums == [f"{hashlib.sha256(a.read_bytes()).hexdigest()}  {a.name}" for a in res.artifacts[:3]]
+    manifest = json.loads(manifest_path(src, res.artifacts[0]).read_text())
+    assert set(manifest["archives"]) == {"p-1.zip", "p-1.tar.gz", "p-1.tar.xz"}
+    assert {f["name"]: f["sha256"] for f in manifest["files"]}["b.bin"] == hashlib.sha256(expected["b.bin"]).hexdigest()
+
+    again = build_package(PackageSpec(dist_dir=tmp_path / "d2", **spec))
+    assert [a.read_bytes() for a in again.artifacts] == [a.read_bytes() for a in res.artifacts]
+
+
+def test_compression_policy_stores_incompressible_and_tunes_level():
+    import os
+
+    from arm.services.packager import CompressionPolicy
+    from arm.services.zip_writer import ZIP_DEFLATED, ZIP_STORED
+
+    policy = CompressionPolicy()
+    text = b"hello world\n" * 200
+    assert policy.choose("logo.PNG", text) == (ZIP_STORED, 0)
+    assert policy.choose("blob.bin", os.urandom(100_000)) == (ZIP_STORED, 0)
+    assert policy.choose("small.txt", text) == (ZIP_DEFLATED, 9)
+    assert policy.choose("big.txt", text * 100) == (ZIP_DEFLATED, 6)
+    assert CompressionPolicy.legacy().choose("logo.png", os.urandom(1000)) == (ZIP_DEFLATED, 6)
+
+
+def test_incremental_rebuild_never_deflates_unchanged_files(tmp_path: Path, monkeypatch):
+    import os
+
+    from arm.services import packager
+    from arm.services.packager import CompressionPolicy, build_package
+
+    src = tmp_path / "src"
+    src.mkdir()
+    for i in range(10):
+        (src / f"f{i}.txt").write_text(f"line {i}\n" * 2000)
+    (src / "noise.bin").write_bytes(os.urandom(4000))
+    base = dict(project_name="p", repo_dir=src, dist_dir=tmp_path / "dist", incremental=True)
+    first = build_package(PackageSpec(version="1", **base))
+
+    def no_deflate(data, level):
+        raise AssertionError("unchanged content was deflated")
+
+    monkeypatch.setattr(packager, "deflate", no_deflate)
+    again = build_package(PackageSpec(version="2", **base))
+    assert again.reused == 10
+    assert [f.method for f in again.files] == [f.method for f in first.files]
+
+    monkeypatch.undo()
+    data = b"abc" * 1000
+    method, level, payload = CompressionPolicy(levels_by_size=((1 << 20, 1),)).plan("a.txt", data)
+    assert (method, level) == (zipfile.ZIP_DEFLATED, 1)
+    assert payload is not None and zlib.decompress(payload, -15) == data
+
+
+def test_adaptive_build_stores_compressed_assets(tmp_path: Path):
+    import os
+
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "img.png").write_bytes(os.urandom(5000))
+    (src / "a.txt").write_text("abc" * 1000)
+    z = build_zip(PackageSpec(project_name="p", version="1", repo_dir=src, dist_dir=tmp_path / "dist"))
+    with zipfile.ZipFile(z) as zf:
+        assert zf.getinfo("img.png").compress_type == zipfile.ZIP_STORED
+        assert zf.getinfo("a.txt").compress_type == zipfile.ZIP_DEFLATED
+        assert zf.testzip() is None
+
+
+def test_tree_source_packages_committed_content_without_checkout(tmp_path: Path):
+    import os
+    import subprocess
+
+    def git(*args: str) -> str:
+        env = dict(os.environ, GIT_COMMITTER_DATE="2024-03-01T12:00:00+00:00")
+        return subprocess.run(["git", *args], cwd=str(tmp_path), check=True, capture_output=True, text=True, env=env).stdout
+
+    git("init")
+    git("config", "user.email", "t@example.com")
+    git("config", "user.name", "T")
+    (tmp_path / "a.txt").write_text("v1")
+    (tmp_path / "run.sh").write_text("#!/bin/sh\n")
+    (tmp_path / "run.sh").chmod(0o755)
+    os.symlink("a.txt", tmp_path / "link")
+    git("add", ".")
+    git("commit", "-m", "feat: one")
+    git("tag", "-a", "v1.0.0", "-m", "v1.0.0")
+    (tmp_path / "a.txt").write_text("v2 uncommitted")
+    (tmp_path / "untracked.txt").write_text("u")
+
+    spec = dict(project_name="p", repo_dir=tmp_path, dist_dir=tmp_path / "dist", source="tree", ref="v1.0.0")
+    z = build_zip(PackageSpec(version="1.0.0", formats=("zip",), **spec))
+    with zipfile.ZipFile(z) as zf:
+        assert sorted(zf.namelist()) == ["a.txt", "link", "run.sh"]
+        assert zf.read("a.txt") == b"v1"
+        assert zf.read("link") == b"a.txt"
+        assert zf.getinfo("run.sh").external_attr >> 16 == 0o100755
+        assert zf.getinfo("link").external_attr >> 16 == 0o120000
+    again = build_zip(PackageSpec(version="again", **spec))
+    assert again.read_bytes() == z.read_bytes()
+
+
+def test_store_hit_hardlinks_artifacts_without_rebuilding(tmp_path: Path, monkeypatch):
+    from arm.services import packager
+
+    (tmp_path / "a.txt").write_text("a\n" * 100)
+    spec = PackageSpec(
+        project_name="p",
+        version="1",
+        repo_dir=tmp_path,
+        dist_dir=tmp_path / "dist",
+        formats=("zip", "sha256sums"),
+        store_dir=tmp_path / ".arm" / "store",
+    )
+    first = packager.build_package(spec)
+    assert not first.cached
+    data = first.artifacts[0].read_bytes()
+    for a in first.artifacts:
+        a.unlink()
+
+    def no_build(*args, **kwargs):
+        raise AssertionError("store hit must not rebuild")
+
+    def no_read(self):
+        raise AssertionError("the store key must not read file contents")
+
+    monkeypatch.setattr(packager, "_build", no_build)
+    monkeypatch.setattr(packager._SourceFile, "load", no_read)
+    again = packager.build_package(spec)
+    assert again.cached and len(again.files) == 1 and again.reused == 0
+    assert again.artifacts[0].read_bytes() == data
+    stored = spec.store_dir / packager.package_key(spec) / again.artifacts[0].name
+    assert again.artifacts[0].stat().st_ino == stored.stat().st_ino
+
+    (tmp_path / "a.txt").write_text("changed\n")
+    monkeypatch.undo()
+    assert not packager.build_package(spec).cached
+
+
+def test_artifact_store_gc_evicts_least_recently_used(tmp_path: Path):
+    import os
+
+    from arm.services.artifact_store import ArtifactStore
+
+    store = ArtifactStore(tmp_path / "store")
+    for i, key in enumerate(["k1", "k2", "k3"]):
+        f = tmp_path / f"{key}.bin"
+        f.write_bytes(b"x" * 100)
+        os.utime(store.put(key, [f]), (i, i))
+    store.get("k1")
+    assert store.gc(200, keep="k3") == ["k2"]
+    assert store.gc(0, keep="k3") == ["k1"]
+    assert store.get("k3") is not None
@@ -25,3 +25,10 @@ no_bump_types = ["docs", "chore", "merge", "revert"]
     assert p.patch_types == {"fix", "perf"}
     assert "docs" in p.no_bump_types
 
+
+
+def test_load_package_section(tmp_path: Path):
+    cfg = tmp_path / "arm.toml"
+    cfg.write_text("[package]\nworkers = 8\n", encoding="utf-8")
+    assert load_config(str(cfg)).package.workers == 8
+    assert load_config(str(tmp_path / "missing.toml")).package.workers == 1
@@ -0,0 +1,73 @@
+import json
+import subprocess
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from arm import cli
+from arm.config import load_config
+
+
+def _git(cwd: Path, *args: str) -> str:
+    return subprocess.run(["git", *args], cwd=str(cwd), text=True, capture_output=True, check=True).stdout
+
+
+def _setup(tmp_path: Path) -> Path:
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _git(repo, "init", "-b", "main")
+    _git(repo, "config", "user.email", "test@example.com")
+    _git(repo, "config", "user.name", "Tester")
+    (repo / ".gitignore").write_text(".arm/\ndist/\n")
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-m", "feat: base")
+    for name in ("primary", "mirror1", "mirror2"):
+        _git(tmp_path, "init", "--bare", str(tmp_path / f"{name}.git"))
+        _git(repo, "remote", "add", name, str(tmp_path / f"{name}.git"))
+    # a mirror whose path does not exist rejects every push
+    _git(repo, "remote", "add", "broken", str(tmp_path / "missing.git"))
+    return repo
+
+
+def test_default_remote_accepts_a_list(tmp_path: Path):
+    cfg = tmp_path / "arm.toml"
+    cfg.write_text('[policy]\ndefault_remote = ["primary", "mirror1"]\npush_quorum = 1\n')
+    policy = load_config(str(cfg)).policy
+    assert policy.default_remotes == ("primary", "mirror1") and policy.default_remote == "primary"
+    assert policy.push_quorum == 1
+    assert load_config(str(tmp_path / "none.toml")).policy.default_remotes == ("origin",)
+
+
+def test_release_pushes_every_remote_and_honours_quorum(tmp_path: Path):
+    repo = _setup(tmp_path)
+    args = ["--repo", str(repo), "release", "--project-name", "x", "--push", "--no-remote-safe"]
+    remotes = ["--remote", "primary", "--remote", "mirror1", "--remote", "broken", "--remote", "mirror2"]
+
+    r = CliRunner().invoke(cli.app, [*args, *remotes, "--push-quorum", "3"])
+    assert r.exit_code == 0, r.output
+    out = json.loads(r.stdout)
+    assert [p["remote"] for p in out["push"]] == ["primary", "mirror1", "broken", "mirror2"]
+    assert [p["ok"] for p in out["push"]] == [True, True, False, True]
+    assert out["push"][2]["error"] and all(p["seconds"] >= 0 for p in out["push"])
+    assert out["push_quorum"] == {"required": 3, "succeeded": 3}
+    for name in ("primary", "mirror1", "mirror2"):
+        refs = _git(tmp_path / f"{name}.git", "show-ref")
+        assert "refs/tags/v0.2.0" in refs and "refs/heads/main" in refs
+
+    # default quorum is every remote: the release stands, but the command fails
+    _git(repo, "commit", "--allow-empty", "-m", "fix: more")
+    r = CliRunner().invoke(cli.app, [*args, *remotes])
+    assert r.exit_code == 1
+    assert json.loads(r.stdout)["push_quorum"] == {"required": 4, "succeeded": 3}
+    assert "v0.2.1" in _git(repo, "tag")
+
+
+def test_release_rolls_back_when_no_remote_accepts(tmp_path: Path):
+    repo = _setup(tmp_path)
+    r = CliRunner().invoke(
+        cli.app,
+        ["--repo", str(repo), "release", "--project-name", "x", "--push", "--no-remote-safe", "--remote", "broken"],
+    )
+    assert r.exit_code == 1
+    assert "deleted tag v0.2.0" in r.output
+    assert _git(repo, "tag") == ""
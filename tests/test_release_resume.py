@@ -0,0 +1,139 @@
+import json
+import subprocess
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from arm import cli
+
+
+def _git(cwd: Path, *args: str) -> str:
+    return subprocess.run(["git", *args], cwd=str(cwd), text=True, capture_output=True, check=True).stdout
+
+
+def test_resume_continues_after_packaging_without_rebuilding(tmp_path: Path, monkeypatch):
+    _git(tmp_path, "init")
+    _git(tmp_path, "config", "user.email", "test@example.com")
+    _git(tmp_path, "config", "user.name", "Tester")
+    (tmp_path / ".gitignore").write_text(".arm/\ndist/\n")
+    (tmp_path / "file.txt").write_text("base")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-m", "feat: base")
+    runner = CliRunner()
+    args = ["--repo", str(tmp_path), "release", "--project-name", "x"]
+
+    def killed(**kwargs):
+        raise KeyboardInterrupt  # like a preempted runner: no compensation runs
+
+    monkeypatch.setattr(cli, "append_release", killed)
+    r = runner.invoke(cli.app, args)
+    assert r.exit_code != 0
+    assert (tmp_path / ".arm" / "checkpoint.json").exists()
+    assert (tmp_path / "dist" / "x-0.2.0.zip").exists()
+
+    r = runner.invoke(cli.app, args)
+    assert r.exit_code == 1 and "--resume" in r.output
+
+    monkeypatch.undo()
+
+    def no_rebuild(spec):
+        raise AssertionError("package was already built")
+
+    monkeypatch.setattr(cli, "build_package", no_rebuild)
+    r = runner.invoke(cli.app, [*args, "--resume"])
+    assert r.exit_code == 0, r.output
+    data = json.loads(r.output)
+    assert data["resumed"] == ["changelog", "commit", "tag", "package", "verify"]
+    assert data["tag"] == "v0.2.0"
+    assert not (tmp_path / ".arm" / "checkpoint.json").exists()
+    assert not (tmp_path / ".arm" / "wal.jsonl").exists()
+    assert _git(tmp_path, "tag", "--list").split() == ["v0.2.0"]
+
+
+def test_resume_rebuilds_artifact_that_changed(tmp_path: Path, monkeypatch):
+    _git(tmp_path, "init")
+    _git(tmp_path, "config", "user.email", "test@example.com")
+    _git(tmp_path, "config", "user.name", "Tester")
+    (tmp_path / ".gitignore").write_text(".arm/\ndist/\n")
+    (tmp_path / "file.txt").write_text("base")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-m", "fix: base")
+    runner = CliRunner()
+    args = ["--repo", str(tmp_path), "release", "--project-name", "x"]
+
+    def killed(**kwargs):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(cli, "append_release", killed)
+    runner.invoke(cli.app, args)
+    monkeypatch.undo()
+    zip_path = tmp_path / "dist" / "x-0.1.1.zip"
+    zip_path.write_bytes(b"garbage")
+
+    r = runner.invoke(cli.app, [*args, "--resume"])
+    assert r.exit_code == 0, r.output
+    assert json.loads(r.output)["resumed"] == ["changelog", "commit", "tag"]
+    assert zip_path.read_bytes()[:2] == b"PK"
+
+
+def test_resume_after_crash_between_tag_and_checkpoint(tmp_path: Path, monkeypatch):
+    from arm.adapters import git as git_adapter
+
+    _git(tmp_path, "init")
+    _git(tmp_path, "config", "user.email", "test@example.com")
+    _git(tmp_path, "config", "user.name", "Tester")
+    (tmp_path / ".gitignore").write_text(".arm/\ndist/\n")
+    (tmp_path / "file.txt").write_text("base")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-m", "feat: base")
+    runner = CliRunner()
+    args = ["--repo", str(tmp_path), "release", "--project-name", "x"]
+    real = git_adapter.create_tag
+
+    def tagged_then_killed(**kwargs):
+        real(**kwargs)
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(git_adapter, "create_tag", tagged_then_killed)
+    r = runner.invoke(cli.app, args)
+    assert r.exit_code != 0
+    monkeypatch.undo()
+    release_commit = _git(tmp_path, "rev-parse", "HEAD").strip()
+    assert _git(tmp_path, "rev-parse", "v0.2.0^{commit}").strip() == release_commit
+
+    r = runner.invoke(cli.app, [*args, "--resume"])
+    assert r.exit_code == 0, r.output
+    assert "tag" not in json.loads(r.output)["resumed"]
+    assert _git(tmp_path, "rev-parse", "v0.2.0^{commit}").strip() == release_commit
+    assert _git(tmp_path, "rev-parse", "HEAD").strip() == release_commit
+    assert not (tmp_path / ".arm" / "wal.jsonl").exists()
+
+
+def test_failed_resume_keeps_wal_for_a_tag_it_did_not_create(tmp_path: Path, monkeypatch):
+    from arm.adapters import git as git_adapter
+
+    _git(tmp_path, "init")
+    _git(tmp_path, "config", "user.email", "test@example.com")
+    _git(tmp_path, "config", "user.name", "Tester")
+    (tmp_path / ".gitignore").write_text(".arm/\ndist/\n")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-m", "feat: base")
+    runner = CliRunner()
+    args = ["--repo", str(tmp_path), "release", "--project-name", "x"]
+    real = git_adapter.create_tag
+
+    def tagged_then_killed(**kwargs):
+        real(**kwargs)
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(git_adapter, "create_tag", tagged_then_killed)
+    runner.invoke(cli.app, args)
+    monkeypatch.undo()
+    # the tag no longer matches the release commit, so resume must not adopt or drop it
+    _git(tmp_path, "tag", "-f", "v0.2.0", "HEAD~1")
+
+    r = runner.invoke(cli.app, [*args, "--resume"])
+    assert r.exit_code == 1
+    assert "already exists" in r.output
+    assert (tmp_path / ".arm" / "wal.jsonl").exists()
+    assert "v0.2.0" in _git(tmp_path, "tag", "--list").split()
@@ -21,3 +21,14 @@ def test_invalid_transition_raises():
         pass
     else:
         raise AssertionError("Expected StateMachineError")
+
+
+def test_events_record_stage_timing_and_git_usage():
+    calls = iter([(5, 100), (7, 400), (7, 400)])
+    ctx = ReleaseContext(probe=lambda: next(calls))
+    ctx.transition(ReleaseState.DIFF_COLLECTED, reason="collected")
+    ctx.transition(ReleaseState.COMMITS_VALIDATED, reason="validated")
+    first, second = ctx.events
+    assert (first.git_calls, first.git_bytes) == (2, 300)
+    assert (second.git_calls, second.git_bytes) == (0, 0)
+    assert first.ended == second.started and second.duration >= 0
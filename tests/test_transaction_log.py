@@ -0,0 +1,75 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from arm.services.transaction_log import ReleaseJournal, build_transaction, read_last_release
+
+
+def _tx(repo: Path, version: str):
+    return build_transaction(
+        repo_dir=repo,
+        version=version,
+        tag=f"v{version}",
+        changelog_path=None,
+        changelog_commit_sha=None,
+        changelog_existed_before=False,
+        changelog_before=None,
+        artifacts=[],
+    )
+
+
+def test_journal_finds_releases_by_steps_and_version_skipping_rollbacks(tmp_path: Path):
+    journal = ReleaseJournal(tmp_path)
+    for v in ("0.1.0", "0.2.0", "0.3.0"):
+        journal.append_release(_tx(tmp_path, v))
+    assert read_last_release(repo_dir=tmp_path).version == "0.3.0"
+    assert journal.find_release(steps=3)[1].version == "0.1.0"
+
+    seq, tx = journal.find_release(version="0.2.0")
+    journal.append_rollback(seq, actions=["delete tag v0.2.0"])
+    assert [tx.version for _, tx in journal.live_releases()] == ["0.3.0", "0.1.0"]
+    assert journal.find_release(steps=2)[1].version == "0.1.0"
+    with pytest.raises(LookupError):
+        journal.find_release(version="0.2.0")
+    lines = (tmp_path / ".arm" / "journal.jsonl").read_text().splitlines()
+    assert [json.loads(line)["seq"] for line in lines] == [0, 1, 2, 3]
+
+
+def test_find_release_by_version_reads_one_record(tmp_path: Path, monkeypatch):
+    journal = ReleaseJournal(tmp_path)
+    for i in range(50):
+        journal.append_release(_tx(tmp_path, f"0.{i}.0"))
+    reads = []
+    real = journal.read
+    monkeypatch.setattr(journal, "read", lambda e: reads.append(e.seq) or real(e))
+    seq, tx = journal.find_release(version="0.3.0")
+    assert (seq, tx.version) == (3, "0.3.0")
+    assert journal.find_release(steps=10)[0] == 40
+    assert reads == [3, 40]
+
+
+def test_journal_recovers_from_torn_writes(tmp_path: Path):
+    journal = ReleaseJournal(tmp_path)
+    journal.append_release(_tx(tmp_path, "0.1.0"))
+    journal.append_release(_tx(tmp_path, "0.2.0"))
+    # index lost its last entry plus a partial one; the journal has a torn trailing line
+    idx = journal.index_path.read_bytes()
+    journal.index_path.write_bytes(idx[: len(idx) // 2] + b"\0\0\0")
+    with journal.path.open("ab") as fh:
+        fh.write(b'{"kind":"rel')
+
+    assert [tx.version for _, tx in journal.live_releases()] == ["0.2.0", "0.1.0"]
+    journal.append_release(_tx(tmp_path, "0.3.0"))
+    assert len(journal) == 3
+    assert journal.find_release()[1].version == "0.3.0"
+
+
+def test_legacy_last_release_file_is_imported(tmp_path: Path):
+    from dataclasses import asdict
+
+    (tmp_path / ".arm").mkdir()
+    (tmp_path / ".arm" / "last_release.json").write_text(json.dumps(asdict(_tx(tmp_path, "0.1.0"))))
+    journal = ReleaseJournal(tmp_path)
+    assert journal.find_release()[1].version == "0.1.0"
+    assert not (tmp_path / ".arm" / "last_release.json").exists()
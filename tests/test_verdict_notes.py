@@ -0,0 +1,75 @@
+import json
+import subprocess
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from arm import cli
+from arm.adapters.git import commit_log
+from arm.services import verdict_notes
+from arm.services.conventional_commits import validate_commits
+from arm.services.verdict_notes import read_verdicts, validate_with_notes
+
+
+def _git(cwd: Path, *args: str) -> str:
+    return subprocess.run(["git", *args], cwd=str(cwd), check=True, capture_output=True, text=True).stdout
+
+
+def _repo(tmp_path: Path) -> Path:
+    repo = tmp_path / "origin"
+    repo.mkdir()
+    _git(repo, "init")
+    _git(repo, "config", "user.email", "test@example.com")
+    _git(repo, "config", "user.name", "Tester")
+    _git(repo, "commit", "--allow-empty", "-m", "feat: init")
+    _git(repo, "tag", "v1.0.0")
+    _git(repo, "commit", "--allow-empty", "-m", "feat(api)!: new api")
+    _git(repo, "commit", "--allow-empty", "-m", "fix: bug", "-m", "BREAKING CHANGE: gone")
+    _git(repo, "commit", "--allow-empty", "-m", "not conventional")
+    return repo
+
+
+def _no_parsing(monkeypatch) -> None:
+    def fail(commits, **kwargs):
+        raise AssertionError(f"parsed {len(commits)} commits again")
+
+    monkeypatch.setattr(verdict_notes, "validate_commits", fail)
+
+
+def test_notes_round_trip_without_reparsing(tmp_path: Path, monkeypatch):
+    repo = _repo(tmp_path)
+    commits = commit_log(repo_dir=repo, from_ref="v1.0.0", to_ref="HEAD")
+    expected = validate_commits(commits)
+    assert validate_with_notes(commits, repo_dir=repo, ref="refs/notes/arm") == expected
+    assert len(_git(repo, "notes", "--ref=refs/notes/arm", "list").splitlines()) == 3
+
+    _no_parsing(monkeypatch)
+    assert validate_with_notes(commits, repo_dir=repo, ref="refs/notes/arm") == expected
+
+
+def test_parser_version_change_invalidates_notes(tmp_path: Path, monkeypatch):
+    repo = _repo(tmp_path)
+    commits = commit_log(repo_dir=repo, from_ref="v1.0.0", to_ref="HEAD")
+    validate_with_notes(commits, repo_dir=repo, ref="refs/notes/arm")
+    monkeypatch.setattr(verdict_notes, "PARSER_VERSION", 999)
+    assert read_verdicts(repo_dir=repo, ref="refs/notes/arm", shas=[c.sha for c in commits]) == {}
+    validate_with_notes(commits, repo_dir=repo, ref="refs/notes/arm")
+    note = json.loads(_git(repo, "notes", "--ref=refs/notes/arm", "show", commits[0].sha))
+    assert note["v"] == 999
+
+
+def test_fresh_clone_reuses_fetched_verdicts(tmp_path: Path, monkeypatch):
+    repo = _repo(tmp_path)
+    config = tmp_path / "arm.toml"
+    config.write_text("[policy]\nnotes_cache = true\n")
+    r = CliRunner().invoke(cli.app, ["--repo", str(repo), "--config", str(config), "validate"])
+    assert r.exit_code == 2  # "not conventional"
+    assert _git(repo, "rev-parse", "--verify", "refs/notes/arm").strip()
+
+    clone = tmp_path / "clone"
+    _git(tmp_path, "clone", "-q", str(repo), str(clone))
+    _git(clone, "fetch", "-q", "origin", "refs/notes/arm:refs/notes/arm")
+    _no_parsing(monkeypatch)
+    r = CliRunner().invoke(cli.app, ["--repo", str(clone), "--config", str(config), "validate"])
+    assert r.exit_code == 2
+    assert "not conventional" in r.output
@@ -0,0 +1,38 @@
+from pathlib import Path
+
+from arm.services.packager import PackageSpec, build_package
+from arm.services.verify import verify_artifact
+
+
+def _build(tmp_path: Path, formats=("zip",)):
+    src = tmp_path / "repo"
+    src.mkdir()
+    for i in range(10):
+        (src / f"f{i}.txt").write_text(f"content {i}\n" * 500)
+    spec = PackageSpec(project_name="p", version="1", repo_dir=src, dist_dir=src / "dist", formats=formats)
+    return src, build_package(spec).artifacts
+
+
+def test_verify_accepts_fresh_artifacts(tmp_path: Path):
+    repo, artifacts = _build(tmp_path, formats=("zip", "tar.gz", "sha256sums"))
+    for a in artifacts:
+        for deep in (False, True):
+            res = verify_artifact(a, repo_dir=repo, deep=deep, workers=2)
+            assert res.ok, res.problems
+    assert verify_artifact(artifacts[0], repo_dir=repo).entries == 10
+
+
+def test_verify_detects_truncation_and_corruption(tmp_path: Path):
+    repo, (zip_path,) = _build(tmp_path)
+    data = bytearray(zip_path.read_bytes())
+
+    zip_path.write_bytes(data[:-100])
+    assert not verify_artifact(zip_path, repo_dir=repo).ok
+
+    # flip a byte inside the first entry's payload: only decompression can notice
+    corrupt = bytearray(data)
+    corrupt[60] ^= 0xFF
+    zip_path.write_bytes(corrupt)
+    assert verify_artifact(zip_path, repo_dir=repo).ok
+    deep = verify_artifact(zip_path, repo_dir=repo, deep=True)
+    assert not deep.ok and deep.problems
@@ -0,0 +1,75 @@
+import subprocess
+from pathlib import Path
+
+from arm.adapters import git as git_adapter
+from arm.services.packager import PackageSpec, build_package
+from arm.services.transaction_log import read_last_release
+from arm.services.wal import ReleaseWAL, recover_release
+
+
+def _git(cwd: Path, *args: str) -> str:
+    return subprocess.run(["git", *args], cwd=str(cwd), text=True, capture_output=True, check=True).stdout
+
+
+def _repo(tmp_path: Path) -> str:
+    _git(tmp_path, "init")
+    _git(tmp_path, "config", "user.email", "test@example.com")
+    _git(tmp_path, "config", "user.name", "Tester")
+    (tmp_path / "file.txt").write_text("base")
+    _git(tmp_path, "add", "file.txt")
+    _git(tmp_path, "commit", "-m", "feat: base")
+    return _git(tmp_path, "rev-parse", "HEAD").strip()
+
+
+def _begin(tmp_path: Path, head: str) -> ReleaseWAL:
+    wal = ReleaseWAL(tmp_path)
+    wal.begin(
+        version="0.2.0",
+        tag="v0.2.0",
+        head=head,
+        changelog_path=str(tmp_path / "CHANGELOG.md"),
+        changelog_existed_before=False,
+        changelog_before=None,
+    )
+    return wal
+
+
+def test_recover_undoes_release_killed_after_commit_and_tag(tmp_path: Path):
+    head = _repo(tmp_path)
+    wal = _begin(tmp_path, head)
+    changelog = tmp_path / "CHANGELOG.md"
+    wal.intent("changelog")
+    changelog.write_text("# Changelog\n")
+    wal.done("changelog")
+    wal.intent("commit")
+    git_adapter.commit_file(repo_dir=tmp_path, path=changelog, message="chore(release): v0.2.0")
+    # killed before the done record; the tag step had started too
+    wal.intent("tag")
+    git_adapter.create_tag(repo_dir=tmp_path, tag="v0.2.0")
+    with wal.path.open("ab") as fh:
+        fh.write(b'{"op":"int')
+
+    res = recover_release(repo_dir=tmp_path)
+    assert res.outcome == "undone", res.actions
+    assert _git(tmp_path, "rev-parse", "HEAD").strip() == head
+    assert "v0.2.0" not in _git(tmp_path, "tag", "--list")
+    assert not changelog.exists()
+    assert _git(tmp_path, "status", "--porcelain", "--untracked-files=no") == ""
+    assert not wal.exists()
+    assert recover_release(repo_dir=tmp_path).outcome == "none"
+
+
+def test_recover_finishes_release_killed_after_packaging(tmp_path: Path):
+    head = _repo(tmp_path)
+    wal = _begin(tmp_path, head)
+    spec = PackageSpec(project_name="x", version="0.2.0", repo_dir=tmp_path, dist_dir=tmp_path / "dist")
+    wal.intent("package", artifacts=[str(tmp_path / "dist" / "x-0.2.0.zip")])
+    artifacts = build_package(spec).artifacts
+    wal.done("package", artifacts=[str(a) for a in artifacts])
+    wal.intent("push", command="git push --atomic origin main refs/tags/v0.2.0")
+
+    res = recover_release(repo_dir=tmp_path)
+    assert res.outcome == "finished"
+    assert res.actions == ["record release 0.2.0", "unconfirmed: git push --atomic origin main refs/tags/v0.2.0"]
+    assert read_last_release(repo_dir=tmp_path).artifacts == [str(a) for a in artifacts]
+    assert not wal.exists()
@@ -0,0 +1,73 @@
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from arm.adapters import git as git_adapter
+from arm.adapters.fswatch import RefWatcher
+from arm.config import ReleasePolicy
+from arm.services.watch import IncrementalPlanner
+
+
+def _git(cwd: Path, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=str(cwd), check=True, capture_output=True)
+
+
+def _repo(tmp_path: Path) -> Path:
+    _git(tmp_path, "init")
+    _git(tmp_path, "config", "user.email", "test@example.com")
+    _git(tmp_path, "config", "user.name", "Tester")
+    _git(tmp_path, "commit", "--allow-empty", "-m", "feat: init")
+    _git(tmp_path, "tag", "v1.0.0")
+    _git(tmp_path, "commit", "--allow-empty", "-m", "fix: one")
+    return tmp_path
+
+
+def test_planner_parses_only_new_commits(tmp_path: Path, monkeypatch):
+    repo = _repo(tmp_path)
+    planner = IncrementalPlanner(repo, policy=ReleasePolicy())
+    first = planner.refresh()
+    assert first is not None and first.event == "initial"
+    assert (first.next_version, first.bump, first.commits) == ("1.0.1", "patch", 1)
+    assert planner.refresh() is None
+
+    ranges = []
+    real = git_adapter.commit_log
+
+    def spy(*, from_ref, **kwargs):
+        ranges.append(from_ref)
+        return real(from_ref=from_ref, **kwargs)
+
+    monkeypatch.setattr(git_adapter, "commit_log", spy)
+    _git(repo, "commit", "--allow-empty", "-m", "feat: two")
+    update = planner.refresh()
+    assert update is not None and update.event == "update"
+    assert ranges == [first.head]
+    assert (update.next_version, update.bump, update.commits, update.new_commits) == ("1.1.0", "minor", 2, ["feat: two"])
+    assert "- two" in update.changelog_preview and "- one" in update.changelog_preview
+
+    _git(repo, "tag", "v1.1.0")
+    reset = planner.refresh()
+    assert reset is not None and reset.event == "reset"
+    assert (reset.current_version, reset.commits) == ("1.1.0", 0)
+
+    _git(repo, "commit", "--allow-empty", "-m", "oops not conventional")
+    bad = planner.refresh()
+    assert bad is not None and bad.errors and bad.changelog_preview == ""
+
+
+@pytest.mark.parametrize("force_poll", [False, True])
+def test_ref_watcher_wakes_on_commit_and_tag(tmp_path: Path, force_poll: bool):
+    repo = _repo(tmp_path)
+    with RefWatcher(repo, force_poll=force_poll, poll_interval=0.01) as watcher:
+        assert watcher.wait(timeout=0.1) is False
+        timer = threading.Timer(0.1, _git, (repo, "commit", "--allow-empty", "-m", "fix: two"))
+        timer.start()
+        started = time.monotonic()
+        assert watcher.wait(timeout=5) is True
+        assert time.monotonic() - started < 2
+        timer.join()
+        _git(repo, "tag", "v1.0.1")
+        assert watcher.wait(timeout=5) is True